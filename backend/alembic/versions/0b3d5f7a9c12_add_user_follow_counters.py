@@ -0,0 +1,31 @@
+"""Add denormalized follower/following counters to users
+
+Revision ID: 0b3d5f7a9c12
+Revises: f2c7e9b1a456
+Create Date: 2026-10-17 15:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '0b3d5f7a9c12'
+down_revision = 'f2c7e9b1a456'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.add_column('users', sa.Column('followers_count', sa.Integer(), nullable=False, server_default='0'))
+    op.add_column('users', sa.Column('following_count', sa.Integer(), nullable=False, server_default='0'))
+
+    # Backfill from existing follows
+    op.execute("""
+        UPDATE users SET
+            followers_count = (SELECT COUNT(*) FROM follows WHERE follows.following_id = users.id),
+            following_count = (SELECT COUNT(*) FROM follows WHERE follows.follower_id = users.id)
+    """)
+
+
+def downgrade() -> None:
+    op.drop_column('users', 'following_count')
+    op.drop_column('users', 'followers_count')
@@ -0,0 +1,52 @@
+"""Add activity events and home feed inboxes
+
+Revision ID: 1c4e6a8b0d23
+Revises: 0b3d5f7a9c12
+Create Date: 2026-10-17 16:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '1c4e6a8b0d23'
+down_revision = '0b3d5f7a9c12'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_table(
+        'activity_events',
+        sa.Column('id', sa.Integer(), primary_key=True),
+        sa.Column('actor_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), nullable=False),
+        sa.Column('verb', sa.String(length=20), nullable=False),
+        sa.Column('movie_id', sa.Integer(), nullable=True),
+        sa.Column('target_user_id', sa.Integer(), nullable=True),
+        sa.Column('review_id', sa.Integer(), nullable=True),
+        sa.Column('list_item_id', sa.Integer(), nullable=True),
+        sa.Column('list_kind', sa.String(length=50), nullable=True),
+        sa.Column('rating', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()'), nullable=False),
+    )
+    op.create_index('ix_activity_events_id', 'activity_events', ['id'])
+    op.create_index('ix_activity_events_review_id', 'activity_events', ['review_id'])
+    op.create_index('ix_activity_events_list_item_id', 'activity_events', ['list_item_id'])
+    op.create_index('ix_activity_events_actor_created_id', 'activity_events', ['actor_id', 'created_at', 'id'])
+
+    op.create_table(
+        'feed_inbox',
+        sa.Column('owner_id', sa.Integer(), sa.ForeignKey('users.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('event_id', sa.Integer(), sa.ForeignKey('activity_events.id', ondelete='CASCADE'), primary_key=True),
+        sa.Column('actor_id', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(timezone=True), nullable=False),
+    )
+    op.create_index('ix_feed_inbox_owner_created_event', 'feed_inbox', ['owner_id', 'created_at', 'event_id'])
+
+    # High-follower accounts are looked up by count on every feed read
+    op.create_index('ix_users_followers_count', 'users', ['followers_count'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_users_followers_count', table_name='users')
+    op.drop_table('feed_inbox')
+    op.drop_table('activity_events')
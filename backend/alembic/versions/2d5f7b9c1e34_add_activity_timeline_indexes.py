@@ -0,0 +1,25 @@
+"""Index list items and follows for the activity timeline
+
+Revision ID: 2d5f7b9c1e34
+Revises: 1c4e6a8b0d23
+Create Date: 2026-10-17 17:00:00
+"""
+
+from alembic import op
+
+revision = '2d5f7b9c1e34'
+down_revision = '1c4e6a8b0d23'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_list_items_user_created_id', 'list_items', ['user_id', 'created_at', 'id'])
+    op.create_index('ix_follows_follower_created_id', 'follows', ['follower_id', 'created_at', 'id'])
+    op.create_index('ix_follows_following_created_id', 'follows', ['following_id', 'created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_follows_following_created_id', table_name='follows')
+    op.drop_index('ix_follows_follower_created_id', table_name='follows')
+    op.drop_index('ix_list_items_user_created_id', table_name='list_items')
@@ -0,0 +1,23 @@
+"""Index list items by user and kind for the user activity sections
+
+Revision ID: 3e6a8c0d2f45
+Revises: 2d5f7b9c1e34
+Create Date: 2026-10-17 18:00:00
+"""
+
+from alembic import op
+
+revision = '3e6a8c0d2f45'
+down_revision = '2d5f7b9c1e34'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        'ix_list_items_user_kind_created_id', 'list_items', ['user_id', 'kind', 'created_at', 'id']
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_list_items_user_kind_created_id', table_name='list_items')
@@ -0,0 +1,32 @@
+"""Add platform_stats snapshot table
+
+Revision ID: 4f7b9d1e3a56
+Revises: 3e6a8c0d2f45
+Create Date: 2026-10-17 19:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '4f7b9d1e3a56'
+down_revision = '3e6a8c0d2f45'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    # Filled by the refresh loop on the next application start
+    op.create_table(
+        'platform_stats',
+        sa.Column('metric', sa.String(32), primary_key=True),
+        sa.Column('total', sa.BigInteger(), nullable=False, server_default='0'),
+        sa.Column('user_count', sa.Integer(), nullable=True),
+        sa.Column('distribution', sa.JSON(), nullable=True),
+        sa.Column('percentiles', sa.JSON(), nullable=True),
+        sa.Column('refreshed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('platform_stats')
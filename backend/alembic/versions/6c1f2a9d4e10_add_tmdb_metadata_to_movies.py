@@ -0,0 +1,38 @@
+"""Add TMDB metadata columns to movies
+
+Revision ID: 6c1f2a9d4e10
+Revises: 0437e29a0d58
+Create Date: 2026-10-17 09:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '6c1f2a9d4e10'
+down_revision = '0437e29a0d58'
+branch_labels = None
+depends_on = None
+
+NEW_COLUMNS = [
+    sa.Column('release_year', sa.Integer(), nullable=True),
+    sa.Column('genres', sa.JSON(), nullable=True),
+    sa.Column('runtime', sa.Integer(), nullable=True),
+    sa.Column('poster_path', sa.String(), nullable=True),
+    sa.Column('popularity', sa.Float(), nullable=True),
+    sa.Column('hydrated_at', sa.DateTime(timezone=True), nullable=True),
+]
+
+
+def upgrade() -> None:
+    # Tables created through Base.metadata.create_all may already have release_year
+    existing = {c['name'] for c in sa.inspect(op.get_bind()).get_columns('movies')}
+    for column in NEW_COLUMNS:
+        if column.name not in existing:
+            op.add_column('movies', column)
+    op.create_index('ix_movies_hydrated_at', 'movies', ['hydrated_at'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_movies_hydrated_at', table_name='movies')
+    for name in ('hydrated_at', 'popularity', 'poster_path', 'runtime', 'genres'):
+        op.drop_column('movies', name)
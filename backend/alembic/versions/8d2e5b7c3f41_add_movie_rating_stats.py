@@ -0,0 +1,41 @@
+"""Add movie_rating_stats aggregate table
+
+Revision ID: 8d2e5b7c3f41
+Revises: 6c1f2a9d4e10
+Create Date: 2026-10-17 10:00:00
+"""
+
+from alembic import op
+import sqlalchemy as sa
+
+revision = '8d2e5b7c3f41'
+down_revision = '6c1f2a9d4e10'
+branch_labels = None
+depends_on = None
+
+RATINGS = range(1, 11)
+
+
+def upgrade() -> None:
+    op.create_table(
+        'movie_rating_stats',
+        sa.Column('movie_id', sa.Integer(), primary_key=True),
+        sa.Column('review_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('rating_sum', sa.Integer(), nullable=False, server_default='0'),
+        *[sa.Column(f'rating_{i}', sa.Integer(), nullable=False, server_default='0') for i in RATINGS],
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+    )
+
+    # Backfill from existing reviews in one pass
+    histogram_columns = ", ".join(f"rating_{i}" for i in RATINGS)
+    histogram_values = ", ".join(f"SUM(CASE WHEN rating = {i} THEN 1 ELSE 0 END)" for i in RATINGS)
+    op.execute(f"""
+        INSERT INTO movie_rating_stats (movie_id, review_count, rating_sum, {histogram_columns})
+        SELECT movie_id, COUNT(*), SUM(rating), {histogram_values}
+        FROM reviews
+        GROUP BY movie_id
+    """)
+
+
+def downgrade() -> None:
+    op.drop_table('movie_rating_stats')
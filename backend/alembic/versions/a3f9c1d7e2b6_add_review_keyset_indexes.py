@@ -0,0 +1,25 @@
+"""Add keyset pagination indexes on reviews
+
+Revision ID: a3f9c1d7e2b6
+Revises: 8d2e5b7c3f41
+Create Date: 2026-10-17 11:00:00
+"""
+
+from alembic import op
+
+revision = 'a3f9c1d7e2b6'
+down_revision = '8d2e5b7c3f41'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_reviews_movie_created_id', 'reviews', ['movie_id', 'created_at', 'id'])
+    op.create_index('ix_reviews_user_created_id', 'reviews', ['user_id', 'created_at', 'id'])
+    op.create_index('ix_reviews_created_id', 'reviews', ['created_at', 'id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_reviews_created_id', table_name='reviews')
+    op.drop_index('ix_reviews_user_created_id', table_name='reviews')
+    op.drop_index('ix_reviews_movie_created_id', table_name='reviews')
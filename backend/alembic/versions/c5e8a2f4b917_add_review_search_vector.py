@@ -0,0 +1,31 @@
+"""Add full-text search vector on review comments
+
+Revision ID: c5e8a2f4b917
+Revises: a3f9c1d7e2b6
+Create Date: 2026-10-17 12:00:00
+"""
+
+from alembic import op
+
+revision = 'c5e8a2f4b917'
+down_revision = 'a3f9c1d7e2b6'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    # Generated column: kept in sync with comment by the database itself
+    op.execute(
+        "ALTER TABLE reviews ADD COLUMN IF NOT EXISTS search_vector tsvector "
+        "GENERATED ALWAYS AS (to_tsvector('english', coalesce(comment, ''))) STORED"
+    )
+    op.execute("CREATE INDEX IF NOT EXISTS ix_reviews_search_vector ON reviews USING gin (search_vector)")
+
+
+def downgrade() -> None:
+    if op.get_bind().dialect.name != 'postgresql':
+        return
+    op.execute("DROP INDEX IF EXISTS ix_reviews_search_vector")
+    op.execute("ALTER TABLE reviews DROP COLUMN IF EXISTS search_vector")
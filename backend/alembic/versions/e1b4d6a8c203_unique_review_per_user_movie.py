@@ -0,0 +1,62 @@
+"""Enforce one review per user and movie
+
+Revision ID: e1b4d6a8c203
+Revises: c5e8a2f4b917
+Create Date: 2026-10-17 13:00:00
+"""
+
+from alembic import op
+
+revision = 'e1b4d6a8c203'
+down_revision = 'c5e8a2f4b917'
+branch_labels = None
+depends_on = None
+
+RATINGS = range(1, 11)
+ARCHIVE_TABLE = 'reviews_duplicates_archive'
+# Explicit columns: on PostgreSQL reviews also has a generated search_vector
+REVIEW_COLUMNS = "id, user_id, movie_id, rating, comment, created_at, updated_at"
+
+
+def _rebuild_rating_stats() -> None:
+    """movie_rating_stats counts every review row; rebuild it from the table"""
+    histogram_columns = ", ".join(f"rating_{i}" for i in RATINGS)
+    histogram_values = ", ".join(f"SUM(CASE WHEN rating = {i} THEN 1 ELSE 0 END)" for i in RATINGS)
+    op.execute("DELETE FROM movie_rating_stats")
+    op.execute(f"""
+        INSERT INTO movie_rating_stats (movie_id, review_count, rating_sum, {histogram_columns})
+        SELECT movie_id, COUNT(*), SUM(rating), {histogram_values}
+        FROM reviews
+        GROUP BY movie_id
+    """)
+
+
+def upgrade() -> None:
+    # Keep the oldest review of any duplicate (user_id, movie_id) pair. The
+    # others are moved to an archive table so downgrade can put them back.
+    op.execute(f"""
+        CREATE TABLE {ARCHIVE_TABLE} AS
+        SELECT {REVIEW_COLUMNS} FROM reviews
+        WHERE id IN (
+            SELECT id FROM (
+                SELECT id, ROW_NUMBER() OVER (PARTITION BY user_id, movie_id ORDER BY id) AS rn
+                FROM reviews
+            ) ranked
+            WHERE rn > 1
+        )
+    """)
+    op.execute(f"DELETE FROM reviews WHERE id IN (SELECT id FROM {ARCHIVE_TABLE})")
+
+    _rebuild_rating_stats()
+
+    op.create_unique_constraint('uq_reviews_user_movie', 'reviews', ['user_id', 'movie_id'])
+
+
+def downgrade() -> None:
+    op.drop_constraint('uq_reviews_user_movie', 'reviews', type_='unique')
+
+    # Restore the archived duplicates with their original ids
+    op.execute(f"INSERT INTO reviews ({REVIEW_COLUMNS}) SELECT {REVIEW_COLUMNS} FROM {ARCHIVE_TABLE}")
+    op.drop_table(ARCHIVE_TABLE)
+
+    _rebuild_rating_stats()
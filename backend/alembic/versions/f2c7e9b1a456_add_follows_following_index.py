@@ -0,0 +1,21 @@
+"""Index follows by following_id
+
+Revision ID: f2c7e9b1a456
+Revises: e1b4d6a8c203
+Create Date: 2026-10-17 14:00:00
+"""
+
+from alembic import op
+
+revision = 'f2c7e9b1a456'
+down_revision = 'e1b4d6a8c203'
+branch_labels = None
+depends_on = None
+
+
+def upgrade() -> None:
+    op.create_index('ix_follows_following_follower', 'follows', ['following_id', 'follower_id'])
+
+
+def downgrade() -> None:
+    op.drop_index('ix_follows_following_follower', table_name='follows')
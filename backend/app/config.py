@@ -27,6 +27,109 @@ class Settings(BaseSettings):
     # ✅ TMDB API key (the missing piece)
     TMDB_API_KEY: str | None = None
 
+    # TMDB HTTP client (shared connection pool)
+    TMDB_BASE_URL: str = "https://api.themoviedb.org/3"
+    TMDB_MAX_CONNECTIONS: int = 100
+    TMDB_MAX_KEEPALIVE_CONNECTIONS: int = 20
+    TMDB_KEEPALIVE_EXPIRY: float = 30.0
+    TMDB_HTTP2: bool = True
+    TMDB_TIMEOUT: float = 10.0
+    TMDB_POPULAR_TIMEOUT: float = 5.0
+    TMDB_DETAILS_TIMEOUT: float = 8.0
+    TMDB_SEARCH_TIMEOUT: float = 5.0
+    TMDB_SINGLEFLIGHT_WAIT: float = 15.0
+
+    # TMDB record/replay for offline benchmarks ("record" | "replay")
+    TMDB_FIXTURE_MODE: str | None = None
+    TMDB_FIXTURE_DIR: str = str(BASE_DIR / "tmdb_fixtures")
+    TMDB_REPLAY_LATENCY_MS: float = 0.0
+    TMDB_REPLAY_JITTER_MS: float = 0.0
+    TMDB_REPLAY_ERROR_RATE: float = 0.0
+    TMDB_REPLAY_ERROR_STATUS: int = 503
+
+    # TMDB outbound pacing and retries
+    TMDB_RATE_LIMIT_PER_SECOND: float = 40.0
+    TMDB_RATE_LIMIT_BURST: int = 40
+    TMDB_MAX_RETRIES: int = 3
+    TMDB_RETRY_BACKOFF_BASE: float = 0.25
+    TMDB_RETRY_BACKOFF_MAX: float = 4.0
+    TMDB_RETRY_AFTER_MAX: float = 10.0
+
+    # Batch movie details
+    TMDB_BATCH_MAX_IDS: int = 50
+    TMDB_BATCH_CONCURRENCY: int = 8
+
+    # Local movie metadata mirror
+    MOVIE_HYDRATION_ENABLED: bool = True
+    MOVIE_HYDRATION_INTERVAL_SECONDS: int = 60
+    MOVIE_HYDRATION_BATCH_SIZE: int = 100
+    MOVIE_HYDRATION_STALE_HOURS: int = 24 * 7
+    MOVIE_HYDRATION_RETRY_BASE_SECONDS: int = 60  # doubled after each transient failure
+    MOVIE_HYDRATION_MAX_ATTEMPTS: int = 5
+    MOVIE_FIXTURES_PATH: str | None = None  # offline TMDB details (JSON)
+
+    # Popular / trending snapshot
+    POPULAR_SNAPSHOT_ENABLED: bool = True
+    POPULAR_SNAPSHOT_PAGES: int = 5
+    POPULAR_SNAPSHOT_INTERVAL_SECONDS: int = 600
+    POPULAR_SNAPSHOT_MAX_AGE_SECONDS: int = 6 * 3600  # fall back to live fetches after this
+    POPULAR_SNAPSHOT_CLIENT_MAX_AGE: int = 60
+    POPULAR_SNAPSHOT_PATH: str | None = None
+
+    # Recent reviews ring buffer
+    RECENT_REVIEWS_BUFFER_SIZE: int = 200
+    # "local" or "package.module:ClassName" of an InvalidationBackend (cross-worker updates)
+    RECENT_REVIEWS_INVALIDATION_BACKEND: str = "local"
+
+    # In-memory follow graph
+    SOCIAL_GRAPH_ENABLED: bool = True
+    SOCIAL_GRAPH_REBUILD_INTERVAL_SECONDS: int = 3600
+    SOCIAL_GRAPH_INVALIDATION_BACKEND: str = "local"
+
+    # Home feed (fan-out on write, fan-out on read above the follower threshold)
+    FEED_FANOUT_MAX_FOLLOWERS: int = 10000
+    FEED_FANOUT_BATCH_SIZE: int = 1000
+    FEED_INBOX_MAX_ITEMS: int = 500
+    FEED_FOLLOW_BACKFILL: int = 20
+    FEED_TRIM_INTERVAL_SECONDS: int = 3600
+
+    # Live activity stream (server-sent events)
+    ACTIVITY_STREAM_BACKEND: str = "local"  # "local" or "package.module:ClassName" (cross-worker delivery)
+    ACTIVITY_STREAM_QUEUE_SIZE: int = 100  # per connection; overflow drops the backlog and sends "resync"
+    ACTIVITY_STREAM_HEARTBEAT_SECONDS: int = 15
+    ACTIVITY_STREAM_RETRY_MS: int = 5000
+
+    # Platform statistics snapshot (comparison averages and percentiles)
+    PLATFORM_STATS_REFRESH_INTERVAL_SECONDS: int = 900
+
+    # Follow suggestions
+    SUGGESTIONS_FOF_WEIGHT: float = 1.0
+    SUGGESTIONS_TASTE_WEIGHT: float = 5.0
+    SUGGESTIONS_MAX_MOVIE_AUDIENCE: int = 5000  # ignore movies listed by more users than this
+    SUGGESTIONS_CACHE_SIZE: int = 50
+    SUGGESTIONS_CACHE_TTL_SECONDS: int = 6 * 3600
+    SUGGESTIONS_WARMUP_CACHE_TTL_SECONDS: int = 60  # while the taste index is still being built
+    SUGGESTIONS_REFRESH_INTERVAL_SECONDS: int = 60
+    SUGGESTIONS_REFRESH_BATCH: int = 500
+    SUGGESTIONS_TASTE_REBUILD_INTERVAL_SECONDS: int = 24 * 3600
+
+    # Bulk review export/import (disabled unless a token is set)
+    REVIEW_TRANSFER_TOKEN: str | None = None
+    REVIEW_TRANSFER_CHUNK_SIZE: int = 1000
+
+    # TMDB response cache (seconds / bytes)
+    TMDB_CACHE_ENABLED: bool = True
+    TMDB_CACHE_POPULAR_TTL: int = 600
+    TMDB_CACHE_DETAILS_TTL: int = 3600
+    TMDB_CACHE_SEARCH_TTL: int = 300
+    TMDB_CACHE_MAX_BYTES: int = 64 * 1024 * 1024
+    TMDB_CACHE_DISK_DIR: str | None = None
+    TMDB_CACHE_DISK_MAX_BYTES: int = 512 * 1024 * 1024
+    # Seconds past expiry an entry may be served while refreshing in the background
+    TMDB_CACHE_STALE_WHILE_REVALIDATE: int = 300
+    # Seconds past expiry an entry may be served when TMDB times out or returns 5xx
+    TMDB_CACHE_STALE_IF_ERROR: int = 86400
+
     model_config = SettingsConfigDict(
         env_file=str(ENV_PATH),
         extra="allow"
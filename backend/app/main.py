@@ -1,7 +1,19 @@
+import asyncio
+from contextlib import asynccontextmanager
+
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 
+from app.config import settings
 from app.database import Base, engine, SessionLocal
+from app.services.movie_hydration import run_hydration_loop
+from app.services.popular_snapshot import run_snapshot_loop
+from app.services.feed import run_feed_trim_loop
+from app.services.follow_suggestions import run_suggestions_loop
+from app.services.platform_stats import run_platform_stats_loop
+from app.services.recent_reviews import prime_recent_reviews
+from app.services.social_graph import run_social_graph_loop
+from app.services.tmdb_client import tmdb_client
 
 # Import routers
 from app.routers import auth, tmdb_proxy
@@ -13,9 +25,37 @@ from app.routers.migration import router as migration_router
 from app.routers.users import router as users_router
 from app.routers.movies import router as movies_router
 from app.routers.follows import router as follows_router
+from app.routers.feed import router as feed_router
+from app.routers.activity_stream import router as activity_stream_router
 from app.routers.user_activity import router as user_activity_router
 from app.routers.user_insights import router as user_insights_router
 
+# ------------------------------------------------------
+# Application lifespan (shared resources)
+# ------------------------------------------------------
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    await tmdb_client.start()
+    app.state.tmdb_client = tmdb_client
+    await asyncio.to_thread(prime_recent_reviews)
+    background_tasks = []
+    if settings.MOVIE_HYDRATION_ENABLED:
+        background_tasks.append(asyncio.create_task(run_hydration_loop()))
+    if settings.POPULAR_SNAPSHOT_ENABLED:
+        background_tasks.append(asyncio.create_task(run_snapshot_loop()))
+    if settings.SOCIAL_GRAPH_ENABLED:
+        background_tasks.append(asyncio.create_task(run_social_graph_loop()))
+    background_tasks.append(asyncio.create_task(run_feed_trim_loop()))
+    background_tasks.append(asyncio.create_task(run_suggestions_loop()))
+    background_tasks.append(asyncio.create_task(run_platform_stats_loop()))
+    try:
+        yield
+    finally:
+        for task in background_tasks:
+            task.cancel()
+        await asyncio.gather(*background_tasks, return_exceptions=True)
+        await tmdb_client.close()
+
 # ------------------------------------------------------
 # Initialize FastAPI app
 # ------------------------------------------------------
@@ -23,6 +63,7 @@ app = FastAPI(
     title="🎬 Movie Discovery API",
     version="1.0.0",
     description="Backend service for movie discovery and user reviews.",
+    lifespan=lifespan,
 )
 
 # ------------------------------------------------------
@@ -39,6 +80,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "ETag", "X-Snapshot-Version"],
 )
 
 # ------------------------------------------------------
@@ -66,6 +108,8 @@ app.include_router(lists_router, prefix="/api", tags=["Lists"])
 app.include_router(migration_router, prefix="/api", tags=["Migration"])
 app.include_router(movies_router, prefix="/api", tags=["Movies"])
 app.include_router(follows_router, prefix="/api", tags=["Follows"])
+app.include_router(feed_router, prefix="/api", tags=["Feed"])
+app.include_router(activity_stream_router, prefix="/api", tags=["Activity Stream"])
 app.include_router(user_activity_router, prefix="/api", tags=["User Activity"])
 app.include_router(user_insights_router, prefix="/api", tags=["User Insights"])
 
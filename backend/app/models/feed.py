@@ -0,0 +1,39 @@
+# app/models/feed.py
+from sqlalchemy import Column, Integer, String, DateTime, ForeignKey, Index
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class ActivityEvent(Base):
+    """One thing a user did that shows up in their followers' feeds"""
+    __tablename__ = "activity_events"
+    __table_args__ = (
+        # Fan-out-on-read for high-follower actors pages through this
+        Index("ix_activity_events_actor_created_id", "actor_id", "created_at", "id"),
+        {'extend_existing': True},
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    actor_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
+    verb = Column(String(20), nullable=False)  # review, list_add, follow
+    movie_id = Column(Integer, nullable=True)  # TMDB movie ID (review, list_add)
+    target_user_id = Column(Integer, nullable=True)  # follow
+    review_id = Column(Integer, nullable=True, index=True)
+    list_item_id = Column(Integer, nullable=True, index=True)
+    list_kind = Column(String(50), nullable=True)
+    rating = Column(Integer, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now(), nullable=False)
+
+
+class FeedInboxEntry(Base):
+    """An event delivered (fanned out on write) to one follower's home feed"""
+    __tablename__ = "feed_inbox"
+    __table_args__ = (
+        Index("ix_feed_inbox_owner_created_event", "owner_id", "created_at", "event_id"),
+        {'extend_existing': True},
+    )
+
+    owner_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), primary_key=True)
+    event_id = Column(Integer, ForeignKey("activity_events.id", ondelete="CASCADE"), primary_key=True)
+    actor_id = Column(Integer, nullable=False)  # copied from the event for unfollow cleanup
+    created_at = Column(DateTime(timezone=True), nullable=False)  # copied from the event for paging
@@ -1,5 +1,5 @@
 # app/models/follow.py
-from sqlalchemy import Column, Integer, DateTime, ForeignKey, UniqueConstraint
+from sqlalchemy import Column, Integer, DateTime, ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from app.database import Base
@@ -15,6 +15,11 @@ class Follow(Base):
     # Ensure a user can't follow themselves and can't follow the same person twice
     __table_args__ = (
         UniqueConstraint('follower_id', 'following_id', name='unique_follow'),
+        # unique_follow covers lookups by follower; this one covers "who follows X"
+        Index('ix_follows_following_follower', 'following_id', 'follower_id'),
+        # Activity timeline pages through both directions newest first
+        Index('ix_follows_follower_created_id', 'follower_id', 'created_at', 'id'),
+        Index('ix_follows_following_created_id', 'following_id', 'created_at', 'id'),
         {'extend_existing': True}
     )
 
@@ -1,11 +1,18 @@
 # app/models/list_item.py
-from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, func
+from sqlalchemy import Column, Integer, ForeignKey, String, DateTime, Index, func
 from sqlalchemy.orm import relationship
 from app.database import Base
 
 
 class ListItem(Base):
     __tablename__ = "list_items"
+    __table_args__ = (
+        # Activity timeline pages through a user's items newest first
+        Index("ix_list_items_user_created_id", "user_id", "created_at", "id"),
+        # Per-list sections of the user activity endpoint
+        Index("ix_list_items_user_kind_created_id", "user_id", "kind", "created_at", "id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False)
@@ -1,6 +1,7 @@
 # app/models/movie.py
-from sqlalchemy import Column, Integer, String
+from sqlalchemy import Column, Integer, String, Text, Float, DateTime, JSON
 from sqlalchemy.orm import relationship
+from sqlalchemy.sql import func
 from app.database import Base
 
 class Movie(Base):
@@ -10,6 +11,16 @@ class Movie(Base):
     id = Column(Integer, primary_key=True, index=True)
     tmdb_id = Column(Integer, unique=True, index=True, nullable=True)  # TMDB movie ID
     title = Column(String, nullable=False)
+    description = Column(Text, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+
+    # Metadata mirrored from TMDB (filled in by the hydration job)
+    release_year = Column(Integer, nullable=True)
+    genres = Column(JSON, nullable=True)  # list of genre names
+    runtime = Column(Integer, nullable=True)  # minutes
+    poster_path = Column(String, nullable=True)
+    popularity = Column(Float, nullable=True)
+    hydrated_at = Column(DateTime(timezone=True), nullable=True, index=True)
 
     # Relationship to ListItem (commented out to avoid circular import issues)
     # list_items = relationship("ListItem", back_populates="movie", cascade="all, delete-orphan")
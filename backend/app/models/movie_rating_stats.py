@@ -0,0 +1,30 @@
+# app/models/movie_rating_stats.py
+from sqlalchemy import Column, Integer, DateTime
+from sqlalchemy.sql import func
+from app.database import Base
+
+RATING_VALUES = range(1, 11)
+
+
+class MovieRatingAggregate(Base):
+    """Per-movie review count, rating sum and 1-10 histogram kept in step with reviews"""
+    __tablename__ = "movie_rating_stats"
+    __table_args__ = {'extend_existing': True}
+
+    movie_id = Column(Integer, primary_key=True)  # TMDB movie ID, same as Review.movie_id
+    review_count = Column(Integer, nullable=False, default=0)
+    rating_sum = Column(Integer, nullable=False, default=0)
+    rating_1 = Column(Integer, nullable=False, default=0)
+    rating_2 = Column(Integer, nullable=False, default=0)
+    rating_3 = Column(Integer, nullable=False, default=0)
+    rating_4 = Column(Integer, nullable=False, default=0)
+    rating_5 = Column(Integer, nullable=False, default=0)
+    rating_6 = Column(Integer, nullable=False, default=0)
+    rating_7 = Column(Integer, nullable=False, default=0)
+    rating_8 = Column(Integer, nullable=False, default=0)
+    rating_9 = Column(Integer, nullable=False, default=0)
+    rating_10 = Column(Integer, nullable=False, default=0)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    def distribution(self) -> dict:
+        return {str(i): getattr(self, f"rating_{i}") or 0 for i in RATING_VALUES}
@@ -0,0 +1,21 @@
+# app/models/platform_stats.py
+from sqlalchemy import Column, Integer, BigInteger, String, DateTime, JSON
+from sqlalchemy.sql import func
+from app.database import Base
+
+
+class PlatformStat(Base):
+    """
+    One platform-wide metric: a running total kept in step by the write
+    paths, plus the per-user distribution from the last periodic refresh
+    """
+    __tablename__ = "platform_stats"
+    __table_args__ = {'extend_existing': True}
+
+    metric = Column(String(32), primary_key=True)  # users, watchlist, favorites, followers, following
+    total = Column(BigInteger, nullable=False, default=0)
+    user_count = Column(Integer, nullable=True)  # users covered by the distribution
+    distribution = Column(JSON, nullable=True)  # [[per-user value, number of users], ...] ascending
+    percentiles = Column(JSON, nullable=True)  # {"p25": value, "p50": ..., "p99": ...}
+    refreshed_at = Column(DateTime(timezone=True), nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
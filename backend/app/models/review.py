@@ -1,4 +1,4 @@
-from sqlalchemy import Column, Integer, String, DateTime, Text, ForeignKey
+from sqlalchemy import DDL, Column, Integer, String, DateTime, Text, ForeignKey, Index, UniqueConstraint, event
 from sqlalchemy.sql import func
 from sqlalchemy.orm import relationship
 from app.database import Base
@@ -6,7 +6,15 @@ from app.database import Base
 
 class Review(Base):
     __tablename__ = "reviews"
-    __table_args__ = {'extend_existing': True}
+    __table_args__ = (
+        # One review per user and movie (also the ON CONFLICT target for bulk imports)
+        UniqueConstraint("user_id", "movie_id", name="uq_reviews_user_movie"),
+        # Keyset pagination indexes (newest first by created_at, id)
+        Index("ix_reviews_movie_created_id", "movie_id", "created_at", "id"),
+        Index("ix_reviews_user_created_id", "user_id", "created_at", "id"),
+        Index("ix_reviews_created_id", "created_at", "id"),
+        {'extend_existing': True},
+    )
 
     id = Column(Integer, primary_key=True, index=True)
     user_id = Column(Integer, ForeignKey("users.id", ondelete="CASCADE"), nullable=False, index=True)
@@ -19,14 +27,14 @@ class Review(Base):
     user = relationship("User")
 
 
+# Full-text search over comments (PostgreSQL only). The generated tsvector
+# column is not mapped: it is only read through app.services.review_search,
+# and other databases fall back to an in-process index.
+REVIEW_SEARCH_DDL = [
+    "ALTER TABLE reviews ADD COLUMN IF NOT EXISTS search_vector tsvector "
+    "GENERATED ALWAYS AS (to_tsvector('english', coalesce(comment, ''))) STORED",
+    "CREATE INDEX IF NOT EXISTS ix_reviews_search_vector ON reviews USING gin (search_vector)",
+]
 
-
-
-
-
-
-
-
-
-
-
+for statement in REVIEW_SEARCH_DDL:
+    event.listen(Review.__table__, "after_create", DDL(statement).execute_if(dialect="postgresql"))
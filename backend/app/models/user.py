@@ -27,6 +27,9 @@ class User(Base):
     bio = Column(Text, nullable=True)
     is_active = Column(Boolean, default=True)
     created_at = Column(DateTime(timezone=True), server_default=func.now())
+    # Denormalized from follows (see app.services.follow_counts)
+    followers_count = Column(Integer, nullable=False, default=0, server_default="0", index=True)
+    following_count = Column(Integer, nullable=False, default=0, server_default="0")
 
     # Relationships
     refresh_tokens = relationship(
@@ -58,18 +61,3 @@ class RefreshToken(Base):
     )
 
     user = relationship("User", back_populates="refresh_tokens")
-
-
-class Movie(Base):
-    __tablename__ = "movies"
-
-    id = Column(Integer, primary_key=True, index=True)
-    title = Column(String(255), nullable=False)
-    description = Column(Text, nullable=True)
-    release_year = Column(Integer, nullable=True)
-    created_at = Column(DateTime(timezone=True), server_default=func.now())
-
-    # Relationship to list items (commented out to avoid circular import issues)
-    # list_items = relationship("ListItem", back_populates="movie", cascade="all, delete-orphan")
-
-
@@ -0,0 +1,89 @@
+# app/routers/activity_stream.py
+import asyncio
+import json
+from typing import Optional
+
+from fastapi import APIRouter, Depends, HTTPException, Request
+from fastapi.responses import StreamingResponse
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import get_db
+from app.models.follow import Follow
+from app.models.user import User
+from app.services.activity_stream import VERB_UNFOLLOW, ActivitySubscription, get_activity_broker
+from app.services.feed import VERB_FOLLOW
+from app.services.social_graph import get_social_graph
+from app.utils.deps import get_current_user
+
+router = APIRouter(prefix="/activity", tags=["activity"])
+
+
+def _sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, separators=(',', ':'))}\n\n"
+
+
+async def _event_stream(request: Request, watched: set, owner_id: Optional[int]):
+    """
+    Events for the watched users. With an owner (the followed-set stream),
+    the owner's own follows and unfollows adjust what is watched instead of
+    being sent.
+    """
+    broker = get_activity_broker()
+    subscription: ActivitySubscription = broker.subscribe(watched)
+    try:
+        yield f"retry: {settings.ACTIVITY_STREAM_RETRY_MS}\n\n"
+        while not await request.is_disconnected():
+            try:
+                message = await asyncio.wait_for(
+                    subscription.queue.get(), timeout=settings.ACTIVITY_STREAM_HEARTBEAT_SECONDS
+                )
+            except asyncio.TimeoutError:
+                # Comment line keeps proxies from closing an idle connection
+                yield ": keep-alive\n\n"
+                continue
+            if owner_id is not None and message.get("actor_id") == owner_id:
+                target = message.get("target_user_id")
+                if message["type"] == VERB_FOLLOW:
+                    broker.watch(subscription, target)
+                elif message["type"] == VERB_UNFOLLOW:
+                    broker.unwatch(subscription, target)
+                continue
+            yield _sse(message["type"], message)
+    finally:
+        broker.unsubscribe(subscription)
+
+
+@router.get("/stream")
+def stream_activity(
+    request: Request,
+    user_id: Optional[int] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """
+    Server-sent events with activity deltas (review, review_update,
+    review_delete, list_add, list_remove, follow, unfollow). With user_id,
+    that user's activity; without, the activity of everyone you follow plus
+    new follows of you. A "resync" event means events were dropped and the
+    client should refetch.
+    """
+    if user_id is not None:
+        if not db.query(User.id).filter(User.id == user_id).first():
+            raise HTTPException(status_code=404, detail="User not found")
+        watched, owner_id = {user_id}, None
+    else:
+        graph = get_social_graph()
+        if graph.built:
+            following = graph.following(current_user.id)
+        else:
+            following = [fid for (fid,) in db.query(Follow.following_id).filter(Follow.follower_id == current_user.id)]
+        watched, owner_id = {current_user.id, *following}, current_user.id
+    # Don't hold a pooled connection for the life of the stream
+    db.close()
+
+    return StreamingResponse(
+        _event_stream(request, watched, owner_id),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"},
+    )
@@ -1,8 +1,23 @@
 from fastapi import APIRouter, Depends, HTTPException
+from sqlalchemy import func
 from sqlalchemy.orm import Session
 
 from app.database import SessionLocal
 from app.models import user as user_models
+from app.models.list_item import ListItem
+from app.models.review import Review
+from app.services.follow_counts import remove_user_follows
+from app.services.platform_stats import (
+    LIST_METRICS,
+    METRIC_FOLLOWERS,
+    METRIC_FOLLOWING,
+    METRIC_USERS,
+    record_stat_change,
+)
+from app.services.rating_stats import record_rating_changes
+from app.services.recent_reviews import get_recent_reviews_buffer
+from app.services.review_search import get_review_index
+from app.services.social_graph import get_social_graph
 from datetime import datetime, timedelta
 import bcrypt
 from pydantic import BaseModel
@@ -54,8 +69,30 @@ def delete_user(user_id: int, db: Session = Depends(get_db)):
     user = db.query(user_models.User).filter(user_models.User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
+    # Follows are removed here, moving the other users' counters; list items
+    # cascade with the user, so only their platform totals are moved
+    edges = remove_user_follows(db, user_id)
+    record_stat_change(db, -len(edges), METRIC_FOLLOWERS, METRIC_FOLLOWING)
+    list_counts = (
+        db.query(ListItem.kind, func.count(ListItem.id))
+        .filter(ListItem.user_id == user_id, ListItem.kind.in_(LIST_METRICS))
+        .group_by(ListItem.kind)
+        .all()
+    )
+    for kind, items in list_counts:
+        record_stat_change(db, -items, kind)
+    record_stat_change(db, -1, METRIC_USERS)
+    # Reviews cascade too; take them out of the movie rating aggregates
+    reviews = db.query(Review.id, Review.movie_id, Review.rating).filter(Review.user_id == user_id).all()
+    record_rating_changes(db, [(movie_id, rating, None) for _, movie_id, rating in reviews])
     db.delete(user)
     db.commit()
+    graph = get_social_graph()
+    for follower_id, following_id in edges:
+        graph.remove(follower_id, following_id)
+    for review_id, _, _ in reviews:
+        get_recent_reviews_buffer().remove(review_id)
+        get_review_index().remove(review_id)
     return {"message": "User deleted"}
 
 
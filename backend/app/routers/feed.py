@@ -0,0 +1,50 @@
+# app/routers/feed.py
+from datetime import datetime
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Query, Response
+from pydantic import BaseModel
+from sqlalchemy.orm import Session
+
+from app.database import get_db
+from app.models.user import User
+from app.services.feed import read_feed
+from app.utils.deps import get_current_user
+from app.utils.pagination import NEXT_CURSOR_HEADER
+
+router = APIRouter(prefix="/feed", tags=["feed"])
+
+
+class FeedUser(BaseModel):
+    id: int
+    display_name: str
+    avatar: Optional[str] = None
+
+
+class FeedItem(BaseModel):
+    id: int
+    verb: str  # review, list_add, follow
+    actor: Optional[FeedUser]
+    target_user: Optional[FeedUser] = None
+    tmdb_id: Optional[int] = None
+    movie_title: Optional[str] = None
+    poster_path: Optional[str] = None
+    list_kind: Optional[str] = None
+    rating: Optional[int] = None
+    review_id: Optional[int] = None
+    created_at: datetime
+
+
+@router.get("/", response_model=List[FeedItem])
+def get_home_feed(
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db)
+):
+    """Activity of the users you follow, newest first (pass X-Next-Cursor back as ?cursor=)"""
+    items, next_cursor = read_feed(db, current_user.id, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
@@ -1,13 +1,26 @@
 # app/routers/follows.py
-from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
-from sqlalchemy import and_, func
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy import and_, literal, select
 from typing import List, Optional
 
 from app.database import get_db
 from app.models.follow import Follow
 from app.models.user import User
-from app.schemas.follow import FollowCreate, FollowResponse, UserFollowInfo, FollowStats
+from app.services.activity_stream import VERB_UNFOLLOW, get_activity_broker
+from app.services.feed import (
+    VERB_FOLLOW,
+    backfill_inbox,
+    fan_out_event,
+    record_event,
+    remove_actor_from_inbox,
+    remove_events,
+)
+from app.services.follow_counts import apply_follow_change
+from app.services.follow_suggestions import get_suggestion_cache, note_follow_change
+from app.services.platform_stats import METRIC_FOLLOWERS, METRIC_FOLLOWING, record_stat_change
+from app.services.social_graph import followed_by_following_ids, get_social_graph, mutual_follow_ids
+from app.schemas.follow import FollowCreate, FollowResponse, UserFollowInfo, FollowStats, FollowedByInfo, FollowSuggestion
 from app.utils.deps import get_current_user
 
 router = APIRouter(prefix="/follows", tags=["follows"])
@@ -15,6 +28,7 @@ router = APIRouter(prefix="/follows", tags=["follows"])
 @router.post("/", response_model=FollowResponse)
 def follow_user(
     follow_data: FollowCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -45,8 +59,16 @@ def follow_user(
         following_id=follow_data.following_id
     )
     db.add(follow)
+    apply_follow_change(db, current_user.id, follow_data.following_id, 1)
+    record_stat_change(db, 1, METRIC_FOLLOWERS, METRIC_FOLLOWING)
+    event = record_event(db, current_user.id, VERB_FOLLOW, target_user_id=follow_data.following_id)
     db.commit()
     db.refresh(follow)
+    get_social_graph().add(current_user.id, follow_data.following_id)
+    note_follow_change(current_user.id)
+    get_activity_broker().publish(current_user.id, VERB_FOLLOW, target_user_id=follow_data.following_id)
+    background_tasks.add_task(fan_out_event, event.id)
+    background_tasks.add_task(backfill_inbox, current_user.id, follow_data.following_id)
     
     return follow
 
@@ -57,21 +79,79 @@ def unfollow_user(
     db: Session = Depends(get_db)
 ):
     """Unfollow a user"""
-    follow = db.query(Follow).filter(
+    deleted = db.query(Follow).filter(
         and_(
             Follow.follower_id == current_user.id,
             Follow.following_id == following_id
         )
-    ).first()
+    ).delete(synchronize_session=False)
     
-    if not follow:
+    if not deleted:
         raise HTTPException(status_code=404, detail="Follow relationship not found")
     
-    db.delete(follow)
+    # Only the request that actually removed the row moves the counters
+    apply_follow_change(db, current_user.id, following_id, -1)
+    record_stat_change(db, -1, METRIC_FOLLOWERS, METRIC_FOLLOWING)
+    remove_events(db, actor_id=current_user.id, verb=VERB_FOLLOW, target_user_id=following_id)
+    remove_actor_from_inbox(db, current_user.id, following_id)
     db.commit()
+    get_social_graph().remove(current_user.id, following_id)
+    note_follow_change(current_user.id)
+    get_activity_broker().publish(current_user.id, VERB_UNFOLLOW, target_user_id=following_id)
     
     return {"message": "Successfully unfollowed user"}
 
+def user_follow_info_query(db: Session, viewer_id: Optional[int]):
+    """
+    Users with their follower/following counters and whether the viewer
+    follows them (an EXISTS), as one statement. With the social graph
+    built, is_following is filled in from memory by to_follow_info instead.
+    """
+    if viewer_id is not None and not get_social_graph().built:
+        viewer_follow = aliased(Follow)
+        is_following = (
+            select(viewer_follow.id)
+            .where(viewer_follow.follower_id == viewer_id, viewer_follow.following_id == User.id)
+            .correlate(User)
+            .exists()
+        )
+    else:
+        is_following = literal(False)
+
+    return db.query(
+        User,
+        User.followers_count,
+        User.following_count,
+        is_following.label('is_following'),
+    )
+
+
+def to_follow_info(rows, viewer_id: Optional[int] = None) -> List[UserFollowInfo]:
+    graph = get_social_graph()
+    if viewer_id is not None and graph.built:
+        rows = [
+            (user_obj, followers_count, following_count, graph.is_following(viewer_id, user_obj.id))
+            for user_obj, followers_count, following_count, _ in rows
+        ]
+    return [
+        UserFollowInfo(
+            id=user_obj.id,
+            display_name=user_obj.display_name,
+            email=user_obj.email,
+            avatar=user_obj.avatar,
+            bio=user_obj.bio,
+            is_following=bool(is_following),
+            followers_count=followers_count,
+            following_count=following_count
+        )
+        for user_obj, followers_count, following_count, is_following in rows
+    ]
+
+
+def ensure_user_exists(db: Session, user_id: int):
+    if not db.query(User.id).filter(User.id == user_id).first():
+        raise HTTPException(status_code=404, detail="User not found")
+
 @router.get("/followers/{user_id}", response_model=List[UserFollowInfo])
 def get_followers(
     user_id: int,
@@ -79,47 +159,18 @@ def get_followers(
     db: Session = Depends(get_db)
 ):
     """Get followers of a user"""
-    # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Get followers with follow stats
-    followers_query = db.query(
-        User,
-        func.count(Follow.id).label('followers_count'),
-        func.count(Follow.id).label('following_count')
-    ).join(
+    viewer_id = current_user.id if current_user else None
+    rows = user_follow_info_query(db, viewer_id).join(
         Follow, User.id == Follow.follower_id
     ).filter(
         Follow.following_id == user_id
-    ).group_by(User.id)
+    ).all()
     
-    followers = []
-    for user_obj, followers_count, following_count in followers_query.all():
-        # Check if current user is following this follower
-        is_following = False
-        if current_user:
-            follow_check = db.query(Follow).filter(
-                and_(
-                    Follow.follower_id == current_user.id,
-                    Follow.following_id == user_obj.id
-                )
-            ).first()
-            is_following = follow_check is not None
-        
-        followers.append(UserFollowInfo(
-            id=user_obj.id,
-            display_name=user_obj.display_name,
-            email=user_obj.email,
-            avatar=user_obj.avatar,
-            bio=user_obj.bio,
-            is_following=is_following,
-            followers_count=followers_count,
-            following_count=following_count
-        ))
+    # Only an empty page needs the existence check
+    if not rows:
+        ensure_user_exists(db, user_id)
     
-    return followers
+    return to_follow_info(rows, viewer_id)
 
 @router.get("/following/{user_id}", response_model=List[UserFollowInfo])
 def get_following(
@@ -128,47 +179,17 @@ def get_following(
     db: Session = Depends(get_db)
 ):
     """Get users that a user is following"""
-    # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
-        raise HTTPException(status_code=404, detail="User not found")
-    
-    # Get following with follow stats
-    following_query = db.query(
-        User,
-        func.count(Follow.id).label('followers_count'),
-        func.count(Follow.id).label('following_count')
-    ).join(
+    viewer_id = current_user.id if current_user else None
+    rows = user_follow_info_query(db, viewer_id).join(
         Follow, User.id == Follow.following_id
     ).filter(
         Follow.follower_id == user_id
-    ).group_by(User.id)
+    ).all()
     
-    following = []
-    for user_obj, followers_count, following_count in following_query.all():
-        # Check if current user is following this user
-        is_following = False
-        if current_user:
-            follow_check = db.query(Follow).filter(
-                and_(
-                    Follow.follower_id == current_user.id,
-                    Follow.following_id == user_obj.id
-                )
-            ).first()
-            is_following = follow_check is not None
-        
-        following.append(UserFollowInfo(
-            id=user_obj.id,
-            display_name=user_obj.display_name,
-            email=user_obj.email,
-            avatar=user_obj.avatar,
-            bio=user_obj.bio,
-            is_following=is_following,
-            followers_count=followers_count,
-            following_count=following_count
-        ))
+    if not rows:
+        ensure_user_exists(db, user_id)
     
-    return following
+    return to_follow_info(rows, viewer_id)
 
 @router.get("/stats/{user_id}", response_model=FollowStats)
 def get_follow_stats(
@@ -177,32 +198,16 @@ def get_follow_stats(
     db: Session = Depends(get_db)
 ):
     """Get follow statistics for a user"""
-    # Check if user exists
-    user = db.query(User).filter(User.id == user_id).first()
-    if not user:
+    viewer_id = current_user.id if current_user else None
+    rows = user_follow_info_query(db, viewer_id).filter(User.id == user_id).all()
+    if not rows:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get followers count
-    followers_count = db.query(Follow).filter(Follow.following_id == user_id).count()
-    
-    # Get following count
-    following_count = db.query(Follow).filter(Follow.follower_id == user_id).count()
-    
-    # Check if current user is following this user
-    is_following = False
-    if current_user:
-        follow_check = db.query(Follow).filter(
-            and_(
-                Follow.follower_id == current_user.id,
-                Follow.following_id == user_id
-            )
-        ).first()
-        is_following = follow_check is not None
-    
+    info = to_follow_info(rows, viewer_id)[0]
     return FollowStats(
-        followers_count=followers_count,
-        following_count=following_count,
-        is_following=is_following
+        followers_count=info.followers_count,
+        following_count=info.following_count,
+        is_following=info.is_following
     )
 
 @router.get("/users", response_model=List[UserFollowInfo])
@@ -213,34 +218,79 @@ def get_all_users(
     limit: int = Query(100, ge=1, le=100)
 ):
     """Get all users with follow information"""
-    users = db.query(User).filter(User.is_active == True).offset(skip).limit(limit).all()
-    
+    viewer_id = current_user.id if current_user else None
+    rows = (
+        user_follow_info_query(db, viewer_id)
+        .filter(User.is_active == True)
+        .order_by(User.id)
+        .offset(skip)
+        .limit(limit)
+        .all()
+    )
+    return to_follow_info(rows, viewer_id)
+
+def users_by_ids(db: Session, ids: List[int], viewer_id: Optional[int]) -> List[UserFollowInfo]:
+    """UserFollowInfo for the given ids, in the same order"""
+    if not ids:
+        return []
+    by_id = {
+        info.id: info
+        for info in to_follow_info(user_follow_info_query(db, viewer_id).filter(User.id.in_(ids)).all(), viewer_id)
+    }
+    return [by_id[user_id] for user_id in ids if user_id in by_id]
+
+@router.get("/mutuals/{user_id}", response_model=List[UserFollowInfo])
+def get_mutual_follows(
+    user_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    skip: int = Query(0, ge=0),
+    limit: int = Query(100, ge=1, le=100)
+):
+    """Users who follow this user and are followed back"""
+    ids = mutual_follow_ids(db, user_id)
+    if not ids:
+        ensure_user_exists(db, user_id)
+    return users_by_ids(db, ids[skip:skip + limit], current_user.id)
+
+@router.get("/followed-by/{user_id}", response_model=FollowedByInfo)
+def get_followed_by_following(
+    user_id: int,
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: int = Query(3, ge=0, le=100)
+):
+    """People you follow who also follow this user ("Followed by A, B and N others")"""
+    ids = followed_by_following_ids(db, current_user.id, user_id)
+    if not ids:
+        ensure_user_exists(db, user_id)
+    return FollowedByInfo(count=len(ids), users=users_by_ids(db, ids[:limit], current_user.id))
+
+@router.get("/suggestions", response_model=List[FollowSuggestion])
+def get_follow_suggestions(
+    current_user: User = Depends(get_current_user),
+    db: Session = Depends(get_db),
+    limit: int = Query(20, ge=1, le=50)
+):
+    """Users to follow, ranked by friends-of-friends and shared movies"""
+    suggestions = get_suggestion_cache().get(db, current_user.id)
+    infos = {
+        info.id: info
+        for info in users_by_ids(db, [s["user_id"] for s in suggestions], current_user.id)
+    }
     result = []
-    for user in users:
-        # Get follow stats
-        followers_count = db.query(Follow).filter(Follow.following_id == user.id).count()
-        following_count = db.query(Follow).filter(Follow.follower_id == user.id).count()
-        
-        # Check if current user is following this user
-        is_following = False
-        if current_user and current_user.id != user.id:
-            follow_check = db.query(Follow).filter(
-                and_(
-                    Follow.follower_id == current_user.id,
-                    Follow.following_id == user.id
-                )
-            ).first()
-            is_following = follow_check is not None
-        
-        result.append(UserFollowInfo(
-            id=user.id,
-            display_name=user.display_name,
-            email=user.email,
-            avatar=user.avatar,
-            bio=user.bio,
-            is_following=is_following,
-            followers_count=followers_count,
-            following_count=following_count
+    for suggestion in suggestions:
+        info = infos.get(suggestion["user_id"])
+        # The cache may predate a follow made in another worker
+        if info is None or info.is_following:
+            continue
+        result.append(FollowSuggestion(
+            **info.model_dump(),
+            score=suggestion["score"],
+            mutual_follows=suggestion["mutual_follows"],
+            taste_similarity=suggestion["taste_similarity"]
         ))
-    
+        if len(result) == limit:
+            break
     return result
+
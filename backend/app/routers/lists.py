@@ -1,9 +1,13 @@
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, field_validator
 
 from app.database import SessionLocal
 from app.models.list_item import ListItem
+from app.services.activity_stream import VERB_LIST_REMOVE, get_activity_broker
+from app.services.feed import VERB_LIST_ADD, fan_out_event, record_event, remove_events
+from app.services.follow_suggestions import note_taste_change
+from app.services.platform_stats import record_stat_change
 
 
 router = APIRouter(prefix="/lists", tags=["lists"])
@@ -34,7 +38,7 @@ class ListItemBody(BaseModel):
 
 
 @router.post("/")
-def add_item(body: ListItemBody, db: Session = Depends(get_db)):
+def add_item(body: ListItemBody, background_tasks: BackgroundTasks, db: Session = Depends(get_db)):
     # Check if movie exists in our database, if not create it
     from app.models.movie import Movie
     movie = db.query(Movie).filter(Movie.tmdb_id == body.movie_id).first()
@@ -59,8 +63,16 @@ def add_item(body: ListItemBody, db: Session = Depends(get_db)):
 
     item = ListItem(user_id=body.user_id, movie_id=movie.id, kind=body.kind)
     db.add(item)
+    db.flush()
+    event = record_event(
+        db, body.user_id, VERB_LIST_ADD, movie_id=body.movie_id, list_item_id=item.id, list_kind=body.kind
+    )
+    record_stat_change(db, 1, body.kind)  # watchlist/favorites totals; other kinds have no row
     db.commit()
     db.refresh(item)
+    note_taste_change(body.user_id, body.movie_id)
+    get_activity_broker().publish(body.user_id, VERB_LIST_ADD, tmdb_id=body.movie_id, list_kind=body.kind)
+    background_tasks.add_task(fan_out_event, event.id)
     return {"id": item.id}
 
 
@@ -86,8 +98,12 @@ def remove_item(user_id: int, movie_id: int, kind: str, db: Session = Depends(ge
     )
     if not item:
         raise HTTPException(status_code=404, detail="Item not found")
+    remove_events(db, list_item_id=item.id)
     db.delete(item)
+    record_stat_change(db, -1, kind)
     db.commit()
+    note_taste_change(user_id)
+    get_activity_broker().publish(user_id, VERB_LIST_REMOVE, tmdb_id=movie_id, list_kind=kind)
     return {"message": "Removed"}
 
 
@@ -104,7 +120,20 @@ def list_items(user_id: int, kind: str, db: Session = Depends(get_db)):
         .order_by(ListItem.created_at.desc())
         .all()
     )
-    return [{"movie_id": movie.tmdb_id, "id": item.id, "created_at": item.created_at} for item, movie in items]
+    return [
+        {
+            "movie_id": movie.tmdb_id,
+            "id": item.id,
+            "created_at": item.created_at,
+            "title": movie.title,
+            "release_year": movie.release_year,
+            "genres": movie.genres or [],
+            "runtime": movie.runtime,
+            "poster_path": movie.poster_path,
+            "hydrated": movie.hydrated_at is not None,
+        }
+        for item, movie in items
+    ]
 
 
 
@@ -7,7 +7,9 @@ from app.database import SessionLocal
 from app.models.list_item import ListItem
 
 
-from app.models.review import Review
+from app.services.recent_reviews import get_recent_reviews_buffer
+from app.services.review_search import get_review_index
+from app.services.review_transfer import MAX_COMMENT_LENGTH, import_chunk
 
 router = APIRouter(prefix="/api/migrate", tags=["migration"])
 
@@ -53,26 +55,30 @@ def migrate_local_data(payload: LocalData, db: Session = Depends(get_db)):
     for mid in payload.watched:
         upsert_item(payload.user_id, mid, "watched")
 
-    # Reviews: keep first if duplicates by movie
-    existing_by_movie = {
-        r.movie_id: r
-        for r in db.query(Review).filter(Review.user_id == payload.user_id).all()
+    # Reviews: keep first if duplicates by movie (one bulk INSERT ... ON CONFLICT DO NOTHING).
+    # Comments are truncated rather than rejected, as local data always was accepted whole.
+    result = import_chunk(
+        db,
+        [
+            (i, {
+                "user_id": payload.user_id,
+                "tmdb_id": r.movieId,
+                "rating": int(r.rating),
+                "comment": r.text[:MAX_COMMENT_LENGTH],
+            })
+            for i, r in enumerate(payload.reviews)
+        ],
+    )
+    if result["inserted"]:
+        get_recent_reviews_buffer().invalidate()
+        get_review_index().invalidate()
+    return {
+        "status": "ok",
+        "reviews": {
+            "inserted": result["inserted"],
+            "skipped": result["skipped"],
+            "failed": result["failed"],
+            # Position of each rejected review in payload.reviews
+            "errors": [{"index": e["line"], "error": e["error"]} for e in result["errors"]],
+        },
     }
-    for r in payload.reviews:
-        if r.movieId in existing_by_movie:
-            continue
-        db.add(
-            Review(
-                user_id=payload.user_id,
-                movie_id=r.movieId,
-                rating=int(r.rating),
-                comment=r.text,
-            )
-        )
-
-    db.commit()
-    return {"status": "ok"}
-
-
-
-
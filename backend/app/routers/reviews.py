@@ -1,14 +1,28 @@
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import hmac
+
+from fastapi import APIRouter, BackgroundTasks, Depends, Header, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
-from sqlalchemy import func, and_, desc
+from sqlalchemy import func, and_
 from pydantic import BaseModel, conint, Field
-from typing import Optional, List
+from typing import Literal, Optional, List
 from datetime import datetime
 
+from app.config import settings
 from app.database import get_db
 from app.models.review import Review
+from app.models.movie_rating_stats import MovieRatingAggregate
 from app.models.user import User
+from app.services.activity_stream import VERB_REVIEW_DELETE, VERB_REVIEW_UPDATE, get_activity_broker
+from app.services.feed import VERB_REVIEW, fan_out_event, record_event, remove_events, update_events
+from app.services.follow_suggestions import note_taste_change
+from app.services.rating_stats import record_rating_change
+from app.services.recent_reviews import get_recent_reviews_buffer, prime_recent_reviews, review_record
+from app.services.review_search import get_review_index, search_reviews
+from app.services.review_transfer import import_chunk, iter_export, iter_upload_records, merge_results
 from app.utils.deps import get_current_user
+from app.utils.pagination import NEXT_CURSOR_HEADER, apply_keyset, encode_cursor, split_page
 
 router = APIRouter(prefix="/reviews", tags=["reviews"])
 
@@ -36,6 +50,10 @@ class ReviewResponse(BaseModel):
     updated_at: Optional[datetime]
 
 
+class ReviewSearchResult(ReviewResponse):
+    rank: float
+
+
 class MovieRatingStats(BaseModel):
     tmdb_id: int
     total_reviews: int
@@ -46,6 +64,7 @@ class MovieRatingStats(BaseModel):
 @router.post("/", response_model=ReviewResponse)
 def create_review(
     body: ReviewCreate,
+    background_tasks: BackgroundTasks,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
@@ -73,8 +92,18 @@ def create_review(
         comment=body.comment,
     )
     db.add(review)
+    db.flush()
+    record_rating_change(db, body.tmdb_id, new_rating=body.rating)
+    event = record_event(db, current_user.id, VERB_REVIEW, movie_id=body.tmdb_id, review_id=review.id, rating=body.rating)
     db.commit()
     db.refresh(review)
+    get_recent_reviews_buffer().upsert(review_record(review, current_user))
+    get_review_index().add(review.id, review.movie_id, review.comment)
+    note_taste_change(current_user.id, review.movie_id)
+    get_activity_broker().publish(
+        current_user.id, VERB_REVIEW, review_id=review.id, tmdb_id=review.movie_id, rating=review.rating
+    )
+    background_tasks.add_task(fan_out_event, event.id)
     
     return ReviewResponse(
         id=review.id,
@@ -108,12 +137,19 @@ def update_review(
     
     # Update fields
     if body.rating is not None:
+        record_rating_change(db, review.movie_id, old_rating=review.rating, new_rating=body.rating)
+        update_events(db, {"rating": body.rating}, review_id=review.id)
         review.rating = body.rating
     if body.comment is not None:
         review.comment = body.comment
     
     db.commit()
     db.refresh(review)
+    get_recent_reviews_buffer().upsert(review_record(review, current_user))
+    get_review_index().add(review.id, review.movie_id, review.comment)
+    get_activity_broker().publish(
+        current_user.id, VERB_REVIEW_UPDATE, review_id=review.id, tmdb_id=review.movie_id, rating=review.rating
+    )
     
     return ReviewResponse(
         id=review.id,
@@ -131,21 +167,29 @@ def update_review(
 @router.get("/movie/{tmdb_id}", response_model=List[ReviewResponse])
 def get_movie_reviews(
     tmdb_id: int,
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all reviews for a specific movie"""
+    """Get all reviews for a specific movie (pass X-Next-Cursor back as ?cursor= for the next page)"""
     
-    reviews = (
+    query = apply_keyset(
         db.query(Review, User)
         .join(User, Review.user_id == User.id)
-        .filter(Review.movie_id == tmdb_id)
-        .order_by(desc(Review.created_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
+        .filter(Review.movie_id == tmdb_id),
+        Review.created_at,
+        Review.id,
+        cursor,
     )
+    if skip and not cursor:
+        query = query.offset(skip)
+    reviews, next_cursor = split_page(
+        query.limit(limit + 1).all(), limit, lambda row: (row[0].created_at, row[0].id)
+    )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return [
         ReviewResponse(
@@ -163,13 +207,35 @@ def get_movie_reviews(
     ]
 
 
+@router.get("/search", response_model=List[ReviewSearchResult])
+def search_review_comments(
+    response: Response,
+    q: str = Query(..., min_length=1, max_length=200),
+    tmdb_id: Optional[int] = None,
+    sort: Literal["relevance", "recent"] = "relevance",
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
+    db: Session = Depends(get_db)
+):
+    """Full-text search over review comments, optionally within one movie (X-Next-Cursor pages)"""
+    
+    rows, next_cursor = search_reviews(db, q, movie_id=tmdb_id, sort=sort, limit=limit, cursor=cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    
+    return [
+        ReviewSearchResult(**review_record(review, user), rank=rank)
+        for review, user, rank in rows
+    ]
+
+
 @router.get("/movie/{tmdb_id}/stats", response_model=MovieRatingStats)
 def get_movie_rating_stats(tmdb_id: int, db: Session = Depends(get_db)):
-    """Get rating statistics for a movie"""
+    """Get rating statistics for a movie (reads the maintained aggregate row)"""
     
-    reviews = db.query(Review).filter(Review.movie_id == tmdb_id).all()
+    stats = db.get(MovieRatingAggregate, tmdb_id)
     
-    if not reviews:
+    if not stats or not stats.review_count:
         return MovieRatingStats(
             tmdb_id=tmdb_id,
             total_reviews=0,
@@ -177,45 +243,42 @@ def get_movie_rating_stats(tmdb_id: int, db: Session = Depends(get_db)):
             rating_distribution={}
         )
     
-    # Calculate statistics
-    total_reviews = len(reviews)
-    average_rating = sum(r.rating for r in reviews) / total_reviews
-    
-    # Rating distribution (1-10)
-    rating_distribution = {}
-    for i in range(1, 11):
-        count = sum(1 for r in reviews if r.rating == i)
-        rating_distribution[str(i)] = count
-    
     return MovieRatingStats(
         tmdb_id=tmdb_id,
-        total_reviews=total_reviews,
-        average_rating=round(average_rating, 1),
-        rating_distribution=rating_distribution
+        total_reviews=stats.review_count,
+        average_rating=round(stats.rating_sum / stats.review_count, 1),
+        rating_distribution=stats.distribution()
     )
 
 
 @router.get("/user/{user_id}", response_model=List[ReviewResponse])
 def get_user_reviews(
     user_id: int,
-    skip: int = 0,
-    limit: int = 50,
+    response: Response,
+    skip: int = Query(0, ge=0),
+    limit: int = Query(50, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get all reviews by a specific user"""
+    """Get all reviews by a specific user (pass X-Next-Cursor back as ?cursor= for the next page)"""
     
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    reviews = (
-        db.query(Review)
-        .filter(Review.user_id == user_id)
-        .order_by(desc(Review.created_at))
-        .offset(skip)
-        .limit(limit)
-        .all()
+    query = apply_keyset(
+        db.query(Review).filter(Review.user_id == user_id),
+        Review.created_at,
+        Review.id,
+        cursor,
+    )
+    if skip and not cursor:
+        query = query.offset(skip)
+    reviews, next_cursor = split_page(
+        query.limit(limit + 1).all(), limit, lambda review: (review.created_at, review.id)
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return [
         ReviewResponse(
@@ -282,25 +345,53 @@ def delete_review(
     if review.user_id != current_user.id:
         raise HTTPException(status_code=403, detail="You can only delete your own reviews")
     
+    tmdb_id = review.movie_id
+    record_rating_change(db, tmdb_id, old_rating=review.rating)
+    remove_events(db, review_id=review.id)
     db.delete(review)
     db.commit()
+    get_recent_reviews_buffer().remove(review_id)
+    get_review_index().remove(review_id)
+    note_taste_change(current_user.id)
+    get_activity_broker().publish(current_user.id, VERB_REVIEW_DELETE, review_id=review_id, tmdb_id=tmdb_id)
     return {"message": "Review deleted successfully"}
 
 
 @router.get("/recent", response_model=List[ReviewResponse])
 def get_recent_reviews(
-    limit: int = 20,
+    response: Response,
+    background_tasks: BackgroundTasks,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     db: Session = Depends(get_db)
 ):
-    """Get recent reviews across all movies"""
+    """Get recent reviews across all movies (pass X-Next-Cursor back as ?cursor= for the next page)"""
     
-    reviews = (
-        db.query(Review, User)
-        .join(User, Review.user_id == User.id)
-        .order_by(desc(Review.created_at))
-        .limit(limit)
-        .all()
+    # First page comes from the in-memory ring buffer when it holds enough rows
+    if not cursor:
+        buffer = get_recent_reviews_buffer()
+        records = buffer.latest(limit)
+        if records is None and limit < buffer.size:
+            # Not primed yet, or deletes left too few rows: refill after
+            # responding and answer this request from the database
+            background_tasks.add_task(prime_recent_reviews)
+        if records is not None:
+            if len(records) > limit:
+                records = records[:limit]
+                response.headers[NEXT_CURSOR_HEADER] = encode_cursor(records[-1]["created_at"], records[-1]["id"])
+            return records
+    
+    query = apply_keyset(
+        db.query(Review, User).join(User, Review.user_id == User.id),
+        Review.created_at,
+        Review.id,
+        cursor,
+    )
+    reviews, next_cursor = split_page(
+        query.limit(limit + 1).all(), limit, lambda row: (row[0].created_at, row[0].id)
     )
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return [
         ReviewResponse(
@@ -316,3 +407,64 @@ def get_recent_reviews(
         )
         for review, user in reviews
     ]
+
+
+# -------------------------
+# Bulk export / import
+# -------------------------
+def require_transfer_token(x_transfer_token: Optional[str] = Header(None)):
+    """Bulk endpoints are off unless REVIEW_TRANSFER_TOKEN is configured and sent"""
+    if not settings.REVIEW_TRANSFER_TOKEN:
+        raise HTTPException(status_code=403, detail="Review transfer is disabled")
+    if not x_transfer_token or not hmac.compare_digest(x_transfer_token, settings.REVIEW_TRANSFER_TOKEN):
+        raise HTTPException(status_code=401, detail="Invalid transfer token")
+
+
+@router.get("/export", dependencies=[Depends(require_transfer_token)])
+def export_reviews(
+    format: Literal["jsonl", "csv"] = "jsonl",
+    tmdb_id: Optional[int] = None,
+    user_id: Optional[int] = None,
+):
+    """Stream every review (optionally one movie's or one user's) as JSONL or CSV"""
+    
+    media_type = "text/csv" if format == "csv" else "application/x-ndjson"
+    return StreamingResponse(
+        iter_export(format, movie_id=tmdb_id, user_id=user_id),
+        media_type=media_type,
+        headers={"Content-Disposition": f'attachment; filename="reviews.{format}"'},
+    )
+
+
+@router.post("/import", dependencies=[Depends(require_transfer_token)])
+async def import_reviews(
+    request: Request,
+    format: Literal["jsonl", "csv"] = "jsonl",
+    on_conflict: Literal["skip", "update"] = "skip",
+    db: Session = Depends(get_db)
+):
+    """
+    Import a streamed JSONL/CSV body (user_id, tmdb_id, rating, comment,
+    created_at) in chunks. Existing (user, movie) reviews are skipped or
+    updated; invalid rows are reported by line and do not stop the import.
+    """
+    
+    totals = {"inserted": 0, "updated": 0, "skipped": 0, "failed": 0, "errors": []}
+    chunk = []
+    
+    async def flush():
+        merge_results(totals, await asyncio.to_thread(import_chunk, db, chunk, on_conflict))
+        chunk.clear()
+    
+    async for record in iter_upload_records(request.stream(), format):
+        chunk.append(record)
+        if len(chunk) >= settings.REVIEW_TRANSFER_CHUNK_SIZE:
+            await flush()
+    if chunk:
+        await flush()
+    
+    if totals["inserted"] or totals["updated"]:
+        get_recent_reviews_buffer().invalidate()
+        get_review_index().invalidate()
+    return totals
+
@@ -1,11 +1,38 @@
 # app/routers/tmdb_proxy.py
-from fastapi import APIRouter, HTTPException
+import asyncio
+import json
+import random
+import time
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+
+from typing import List, Optional
+
+from fastapi import APIRouter, Header, HTTPException, Response
+from fastapi.responses import StreamingResponse
+from pydantic import BaseModel, Field
 from app.config import settings
+from app.services.popular_snapshot import get_popular_snapshot
+from app.services.tmdb_cache import get_tmdb_cache, make_cache_key
+from app.services.tmdb_client import get_tmdb_client
+from app.services.singleflight import SingleFlight
+from app.services.rate_limiter import (
+    PRIORITY_HIGH,
+    PRIORITY_LOW,
+    PRIORITY_NORMAL,
+    get_tmdb_rate_limiter,
+)
 import httpx
 
 router = APIRouter(tags=["TMDB Proxy"])
 
-TMDB_BASE = "https://api.themoviedb.org/3"
+# Coalesces concurrent identical upstream fetches
+tmdb_flights = SingleFlight()
+
+# Strong references to in-progress stale-while-revalidate refreshes
+_background_refreshes = set()
+
+tmdb_retry_stats = {"retries": 0, "throttled": 0}
 
 def get_tmdb_key():
     """
@@ -16,45 +43,294 @@ def get_tmdb_key():
         raise HTTPException(status_code=500, detail="TMDB API key not configured")
     return key
 
-async def fetch_tmdb(path: str, params: dict = None):
+RETRYABLE_STATUS = {429, 500, 502, 503, 504}
+
+def _retry_after_seconds(resp: httpx.Response):
     """
-    Fetch data from TMDB API using httpx.AsyncClient
+    Parse a Retry-After header (delta-seconds or HTTP date)
+    """
+    value = resp.headers.get("Retry-After")
+    if not value:
+        return None
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        when = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    return max(0.0, (when - datetime.now(timezone.utc)).total_seconds())
+
+def _backoff_delay(attempt: int) -> float:
+    """
+    Full-jitter exponential backoff
+    """
+    ceiling = min(settings.TMDB_RETRY_BACKOFF_MAX, settings.TMDB_RETRY_BACKOFF_BASE * (2 ** attempt))
+    return random.uniform(0, ceiling)
+
+async def _fetch_upstream(path: str, params: dict, timeout: float = None, priority: int = PRIORITY_NORMAL):
+    """
+    Perform the actual TMDB GET and translate failures into HTTPExceptions.
+    Calls are paced by the shared rate limiter and retried with backoff
+    on 429/5xx/transport errors (TMDB GETs are idempotent).
     """
-    params = params or {}
     params["api_key"] = get_tmdb_key()
-    url = f"{TMDB_BASE}{path}"
+    limiter = get_tmdb_rate_limiter()
 
-    try:
-        async with httpx.AsyncClient(timeout=10.0) as client:
-            resp = await client.get(url, params=params)
+    attempt = 0
+    while True:
+        await limiter.acquire(priority)
+        try:
+            resp = await get_tmdb_client().get(path, params=params, timeout=timeout)
+        except httpx.RequestError as e:
+            if attempt < settings.TMDB_MAX_RETRIES:
+                tmdb_retry_stats["retries"] += 1
+                await asyncio.sleep(_backoff_delay(attempt))
+                attempt += 1
+                continue
+            raise HTTPException(status_code=500, detail=f"TMDB request failed: {str(e)}")
+
+        if resp.status_code in RETRYABLE_STATUS:
+            delay = _retry_after_seconds(resp)
+            if resp.status_code == 429:
+                tmdb_retry_stats["throttled"] += 1
+                if delay is not None:
+                    limiter.pause(delay)
+            # Retry unless attempts are exhausted or upstream asks us to wait too long
+            if attempt < settings.TMDB_MAX_RETRIES and (delay is None or delay <= settings.TMDB_RETRY_AFTER_MAX):
+                tmdb_retry_stats["retries"] += 1
+                await asyncio.sleep(delay if delay is not None else _backoff_delay(attempt))
+                attempt += 1
+                continue
+
+        try:
             resp.raise_for_status()
-            return resp.json()
-    except httpx.RequestError as e:
-        raise HTTPException(status_code=500, detail=f"TMDB request failed: {str(e)}")
-    except httpx.HTTPStatusError as e:
-        raise HTTPException(status_code=e.response.status_code, detail=f"TMDB error: {e.response.text}")
+        except httpx.HTTPStatusError as e:
+            raise HTTPException(status_code=e.response.status_code, detail=f"TMDB error: {e.response.text}")
+        return resp.json()
+
+def _can_serve_stale_on_error(entry) -> bool:
+    if entry is None:
+        return False
+    return entry.age_past_expiry(time.time()) < settings.TMDB_CACHE_STALE_IF_ERROR
+
+def _refresh_in_background(key: str, load):
+    """
+    Revalidate a stale cache entry without blocking the caller
+    """
+    async def refresh():
+        try:
+            await tmdb_flights.do(key, load, timeout=settings.TMDB_SINGLEFLIGHT_WAIT)
+        except (HTTPException, asyncio.TimeoutError):
+            # The stale copy keeps being served; the next request retries
+            pass
+
+    task = asyncio.create_task(refresh())
+    _background_refreshes.add(task)
+    task.add_done_callback(_background_refreshes.discard)
+
+async def fetch_tmdb(
+    path: str,
+    params: dict = None,
+    timeout: float = None,
+    ttl: int = None,
+    priority: int = PRIORITY_NORMAL,
+):
+    """
+    Fetch data from TMDB API through the shared pooled client.
+    When a ttl is given the response is served from / stored in the cache,
+    expired entries are served while revalidating in the background, and
+    the last good copy is used when TMDB times out or fails with 5xx.
+    Concurrent identical requests share a single upstream call.
+    """
+    params = params or {}
+    cache = get_tmdb_cache() if ttl and settings.TMDB_CACHE_ENABLED else None
+    cache_key = make_cache_key(path, params)
+
+    async def load(priority: int = priority):
+        data = await _fetch_upstream(path, params, timeout, priority)
+        if cache is not None:
+            await cache.set(cache_key, data, ttl)
+        return data
+
+    entry = await cache.lookup(cache_key) if cache is not None else None
+    if entry is not None:
+        now = time.time()
+        if entry.is_fresh(now):
+            return entry.value
+        if entry.age_past_expiry(now) < settings.TMDB_CACHE_STALE_WHILE_REVALIDATE:
+            _refresh_in_background(cache_key, lambda: load(PRIORITY_LOW))
+            return entry.value
+
+    try:
+        return await tmdb_flights.do(cache_key, load, timeout=settings.TMDB_SINGLEFLIGHT_WAIT)
+    except asyncio.TimeoutError:
+        if _can_serve_stale_on_error(entry):
+            return entry.value
+        raise HTTPException(status_code=504, detail="TMDB request timed out")
+    except HTTPException as e:
+        if e.status_code >= 500 and _can_serve_stale_on_error(entry):
+            return entry.value
+        raise
 
 # -------------------------
 # Routes
 # -------------------------
 
+def _snapshot_response(list_name: str, page: int, if_none_match: Optional[str]):
+    """
+    Serve a page from the precomputed snapshot, or None if it is not covered
+    """
+    snapshot = get_popular_snapshot()
+    snapshot_page = snapshot.get(list_name, page)
+    if snapshot_page is None or snapshot.is_stale():
+        return None
+    headers = {
+        "ETag": snapshot_page.etag,
+        "Cache-Control": f"public, max-age={settings.POPULAR_SNAPSHOT_CLIENT_MAX_AGE}",
+        "X-Snapshot-Version": str(snapshot.version),
+    }
+    if if_none_match and snapshot_page.etag in [tag.strip() for tag in if_none_match.split(",")]:
+        return Response(status_code=304, headers=headers)
+    return Response(content=snapshot_page.body, media_type="application/json", headers=headers)
+
 @router.get("/tmdb/movie/popular")
-async def tmdb_popular(page: int = 1):
+async def tmdb_popular(page: int = 1, if_none_match: Optional[str] = Header(None)):
+    """
+    Get popular movies from TMDB (served from the snapshot when available)
+    """
+    snapshot_response = _snapshot_response("popular", page, if_none_match)
+    if snapshot_response is not None:
+        return snapshot_response
+    return await fetch_tmdb(
+        "/movie/popular",
+        {"page": page},
+        timeout=settings.TMDB_POPULAR_TIMEOUT,
+        ttl=settings.TMDB_CACHE_POPULAR_TTL,
+    )
+
+@router.get("/tmdb/trending")
+async def tmdb_trending(page: int = 1, if_none_match: Optional[str] = Header(None)):
     """
-    Get popular movies from TMDB
+    Get this week's trending movies from TMDB (served from the snapshot when available)
     """
-    return await fetch_tmdb("/movie/popular", {"page": page})
+    snapshot_response = _snapshot_response("trending", page, if_none_match)
+    if snapshot_response is not None:
+        return snapshot_response
+    return await fetch_tmdb(
+        "/trending/movie/week",
+        {"page": page},
+        timeout=settings.TMDB_POPULAR_TIMEOUT,
+        ttl=settings.TMDB_CACHE_POPULAR_TTL,
+    )
+
+MOVIE_DETAILS_PARAMS = {"append_to_response": "videos,credits,recommendations"}
+
+async def fetch_movie_details(movie_id: int, priority: int = PRIORITY_HIGH):
+    """
+    Fetch (cached) details for one movie; shared by the single and batch routes
+    """
+    return await fetch_tmdb(
+        f"/movie/{movie_id}",
+        dict(MOVIE_DETAILS_PARAMS),
+        timeout=settings.TMDB_DETAILS_TIMEOUT,
+        ttl=settings.TMDB_CACHE_DETAILS_TTL,
+        priority=priority,
+    )
 
 @router.get("/tmdb/movie/{movie_id}")
 async def tmdb_movie_details(movie_id: int):
     """
     Get details for a specific movie
     """
-    return await fetch_tmdb(f"/movie/{movie_id}", {"append_to_response": "videos,credits,recommendations"})
+    return await fetch_movie_details(movie_id)
+
+class MovieBatchRequest(BaseModel):
+    ids: List[int] = Field(..., min_length=1, max_length=settings.TMDB_BATCH_MAX_IDS)
+
+async def _cached_movie_details(movie_id: int):
+    if not settings.TMDB_CACHE_ENABLED:
+        return None
+    return await get_tmdb_cache().get(make_cache_key(f"/movie/{movie_id}", MOVIE_DETAILS_PARAMS))
+
+async def _fetch_batch_item(movie_id: int, semaphore: asyncio.Semaphore):
+    """
+    Fetch one batch member, returning (id, data, error) instead of raising
+    """
+    async with semaphore:
+        try:
+            return movie_id, await fetch_movie_details(movie_id, PRIORITY_NORMAL), None
+        except HTTPException as e:
+            return movie_id, None, {"status_code": e.status_code, "detail": e.detail}
+
+@router.post("/tmdb/movies/batch")
+async def tmdb_movies_batch(body: MovieBatchRequest, stream: bool = False):
+    """
+    Get details for many movies in one round trip.
+    Cached movies are answered immediately; the rest are fetched from TMDB
+    with bounded concurrency. With ?stream=true results are sent as NDJSON
+    lines in completion order.
+    """
+    ids = list(dict.fromkeys(body.ids))
+    cached = {}
+    missing = []
+    for movie_id in ids:
+        data = await _cached_movie_details(movie_id)
+        if data is not None:
+            cached[movie_id] = data
+        else:
+            missing.append(movie_id)
+
+    semaphore = asyncio.Semaphore(settings.TMDB_BATCH_CONCURRENCY)
+
+    if stream:
+        async def lines():
+            for movie_id, data in cached.items():
+                yield json.dumps({"id": movie_id, "data": data}) + "\n"
+            for next_done in asyncio.as_completed([_fetch_batch_item(m, semaphore) for m in missing]):
+                movie_id, data, error = await next_done
+                line = {"id": movie_id, "data": data} if error is None else {"id": movie_id, "error": error}
+                yield json.dumps(line) + "\n"
+
+        return StreamingResponse(lines(), media_type="application/x-ndjson")
+
+    fetched = await asyncio.gather(*[_fetch_batch_item(m, semaphore) for m in missing])
+    results = dict(cached)
+    errors = {}
+    for movie_id, data, error in fetched:
+        if error is None:
+            results[movie_id] = data
+        else:
+            errors[movie_id] = error
+
+    return {
+        "results": {str(m): results[m] for m in ids if m in results},
+        "errors": {str(m): e for m, e in errors.items()},
+    }
 
 @router.get("/tmdb/search")
 async def tmdb_search(query: str, page: int = 1):
     """
     Search movies by query
     """
-    return await fetch_tmdb("/search/movie", {"query": query, "page": page, "include_adult": "false"})
+    return await fetch_tmdb(
+        "/search/movie",
+        {"query": query, "page": page, "include_adult": "false"},
+        timeout=settings.TMDB_SEARCH_TIMEOUT,
+        ttl=settings.TMDB_CACHE_SEARCH_TTL,
+    )
+
+@router.get("/tmdb/metrics")
+def tmdb_metrics():
+    """
+    Connection pool, cache, coalescing and rate limiter metrics for the TMDB proxy
+    """
+    return {
+        "pool": get_tmdb_client().metrics(),
+        "cache": get_tmdb_cache().metrics(),
+        "singleflight": tmdb_flights.metrics(),
+        "rate_limiter": get_tmdb_rate_limiter().metrics(),
+        "retries": dict(tmdb_retry_stats),
+        "snapshot": get_popular_snapshot().metrics(),
+    }
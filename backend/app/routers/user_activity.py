@@ -1,67 +1,141 @@
 # app/routers/user_activity.py
-from fastapi import APIRouter, Depends, HTTPException
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc
-from typing import List, Dict, Any
+from sqlalchemy import func
+from typing import List, Dict, Any, Optional
 
 from app.database import get_db
 from app.models.user import User
 from app.models.list_item import ListItem
 from app.models.movie import Movie
 from app.models.follow import Follow
+from app.services.activity_timeline import read_timeline
 from app.utils.deps import get_current_user
+from app.utils.pagination import NEXT_CURSOR_HEADER, apply_keyset, split_page
 
 router = APIRouter(prefix="/user-activity", tags=["user-activity"])
 
+MOVIE_SECTIONS = ("watchlist", "favorites", "watched")
+FOLLOW_SECTIONS = ("followers", "following")
+DEFAULT_SECTIONS = ("watchlist", "favorites", "followers", "following")
+
+
+def parse_include(include: Optional[str]) -> List[str]:
+    if not include:
+        return list(DEFAULT_SECTIONS)
+    sections = [part.strip() for part in include.split(",") if part.strip()]
+    unknown = [part for part in sections if part not in MOVIE_SECTIONS + FOLLOW_SECTIONS]
+    if unknown:
+        raise HTTPException(status_code=400, detail=f"Unknown section(s): {', '.join(unknown)}")
+    return list(dict.fromkeys(sections))
+
+
+def movie_section(db: Session, user_id: int, kind: str, limit: int, cursor: Optional[str]):
+    rows = apply_keyset(
+        db.query(ListItem.id, ListItem.created_at, Movie.tmdb_id, Movie.title, Movie.poster_path, Movie.release_year)
+        .join(Movie, ListItem.movie_id == Movie.id)
+        .filter(ListItem.user_id == user_id, ListItem.kind == kind),
+        ListItem.created_at,
+        ListItem.id,
+        cursor,
+    ).limit(limit + 1).all()
+    rows, next_cursor = split_page(rows, limit, lambda row: (row.created_at, row.id))
+    items = [
+        {
+            "movie_id": row.tmdb_id,
+            "title": row.title,
+            "poster_path": row.poster_path,
+            "release_year": row.release_year,
+            "added_at": row.created_at
+        }
+        for row in rows
+    ]
+    return items, next_cursor
+
+
+def follow_section(db: Session, user_id: int, section: str, limit: int, cursor: Optional[str]):
+    if section == "followers":
+        mine, theirs = Follow.following_id, Follow.follower_id
+    else:
+        mine, theirs = Follow.follower_id, Follow.following_id
+    rows = apply_keyset(
+        db.query(Follow.id, Follow.created_at, User.id.label("user_id"), User.display_name, User.avatar)
+        .join(User, theirs == User.id)
+        .filter(mine == user_id),
+        Follow.created_at,
+        Follow.id,
+        cursor,
+    ).limit(limit + 1).all()
+    rows, next_cursor = split_page(rows, limit, lambda row: (row.created_at, row.id))
+    items = [
+        {
+            "user_id": row.user_id,
+            "display_name": row.display_name,
+            "avatar": row.avatar,
+            "followed_at": row.created_at
+        }
+        for row in rows
+    ]
+    return items, next_cursor
+
+
 @router.get("/{user_id}")
 def get_user_activity(
     user_id: int,
+    include: Optional[str] = Query(None, description="Comma-separated sections: watchlist, favorites, watched, followers, following"),
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = Query(None, description="next_cursors value for the single included section"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get comprehensive user activity including movies and follows"""
+    """
+    Get user activity: the newest `limit` items of each included section,
+    plus totals. To page a section, request it alone with its next cursor.
+    """
     
     # Check if user exists
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get user's movie lists
-    watchlist_items = (
-        db.query(ListItem, Movie)
-        .join(Movie, ListItem.movie_id == Movie.id)
-        .filter(ListItem.user_id == user_id, ListItem.kind == "watchlist")
-        .order_by(desc(ListItem.created_at))
-        .all()
-    )
-    
-    favorites_items = (
-        db.query(ListItem, Movie)
-        .join(Movie, ListItem.movie_id == Movie.id)
-        .filter(ListItem.user_id == user_id, ListItem.kind == "favorites")
-        .order_by(desc(ListItem.created_at))
-        .all()
-    )
+    sections = parse_include(include)
+    if cursor and len(sections) != 1:
+        raise HTTPException(status_code=400, detail="cursor requires exactly one section in include")
     
-    # Get follow activity
-    followers = (
-        db.query(Follow, User)
-        .join(User, Follow.follower_id == User.id)
-        .filter(Follow.following_id == user_id)
-        .order_by(desc(Follow.created_at))
-        .all()
-    )
-    
-    following = (
-        db.query(Follow, User)
-        .join(User, Follow.following_id == User.id)
-        .filter(Follow.follower_id == user_id)
-        .order_by(desc(Follow.created_at))
+    # Totals come from one grouped COUNT and the denormalized follow counters
+    list_totals = dict(
+        db.query(ListItem.kind, func.count(ListItem.id))
+        .filter(ListItem.user_id == user_id)
+        .group_by(ListItem.kind)
         .all()
     )
+    total_watchlist = list_totals.get("watchlist", 0)
+    total_favorites = list_totals.get("favorites", 0)
+    total_followers = user.followers_count or 0
+    total_following = user.following_count or 0
+    
+    movie_activity: Dict[str, Any] = {
+        "total_watchlist": total_watchlist,
+        "total_favorites": total_favorites,
+        "total_watched": list_totals.get("watched", 0)
+    }
+    follow_activity: Dict[str, Any] = {
+        "total_followers": total_followers,
+        "total_following": total_following
+    }
+    next_cursors: Dict[str, str] = {}
+    for section in sections:
+        if section in MOVIE_SECTIONS:
+            items, next_cursor = movie_section(db, user_id, section, limit, cursor)
+            movie_activity[section] = items
+        else:
+            items, next_cursor = follow_section(db, user_id, section, limit, cursor)
+            follow_activity[section] = items
+        if next_cursor:
+            next_cursors[section] = next_cursor
     
     # Format the response
-    activity = {
+    return {
         "user": {
             "id": user.id,
             "display_name": user.display_name,
@@ -71,150 +145,35 @@ def get_user_activity(
             "created_at": user.created_at,
             "is_active": user.is_active
         },
-        "movie_activity": {
-            "watchlist": [
-                {
-                    "movie_id": movie.tmdb_id,
-                    "title": movie.title,
-                    "added_at": item.created_at
-                }
-                for item, movie in watchlist_items
-            ],
-            "favorites": [
-                {
-                    "movie_id": movie.tmdb_id,
-                    "title": movie.title,
-                    "added_at": item.created_at
-                }
-                for item, movie in favorites_items
-            ],
-            "total_watchlist": len(watchlist_items),
-            "total_favorites": len(favorites_items)
-        },
-        "follow_activity": {
-            "followers": [
-                {
-                    "user_id": follower.id,
-                    "display_name": follower.display_name,
-                    "email": follower.email,
-                    "followed_at": follow.created_at
-                }
-                for follow, follower in followers
-            ],
-            "following": [
-                {
-                    "user_id": following_user.id,
-                    "display_name": following_user.display_name,
-                    "email": following_user.email,
-                    "followed_at": follow.created_at
-                }
-                for follow, following_user in following
-            ],
-            "total_followers": len(followers),
-            "total_following": len(following)
-        },
+        "movie_activity": movie_activity,
+        "follow_activity": follow_activity,
+        "next_cursors": next_cursors,
         "summary": {
-            "total_movies": len(watchlist_items) + len(favorites_items),
-            "total_connections": len(followers) + len(following),
+            "total_movies": total_watchlist + total_favorites,
+            "total_connections": total_followers + total_following,
             "account_age_days": 0  # Simplified for now
         }
     }
-    
-    return activity
 
 @router.get("/{user_id}/recent")
 def get_recent_user_activity(
     user_id: int,
-    limit: int = 20,
+    response: Response,
+    limit: int = Query(20, ge=1, le=100),
+    cursor: Optional[str] = None,
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get recent user activity in chronological order"""
+    """Get recent user activity, newest first (pass X-Next-Cursor back as ?cursor=)"""
     
     # Check if user exists
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    recent_activities = []
-    
-    # Get recent watchlist additions
-    watchlist_items = (
-        db.query(ListItem, Movie)
-        .join(Movie, ListItem.movie_id == Movie.id)
-        .filter(ListItem.user_id == user_id, ListItem.kind == "watchlist")
-        .order_by(desc(ListItem.created_at))
-        .limit(limit)
-        .all()
-    )
-    
-    for item, movie in watchlist_items:
-        recent_activities.append({
-            "type": "watchlist",
-            "action": "added to watchlist",
-            "movie_id": movie.tmdb_id,
-            "movie_title": movie.title,
-            "timestamp": item.created_at
-        })
-    
-    # Get recent favorites
-    favorites_items = (
-        db.query(ListItem, Movie)
-        .join(Movie, ListItem.movie_id == Movie.id)
-        .filter(ListItem.user_id == user_id, ListItem.kind == "favorites")
-        .order_by(desc(ListItem.created_at))
-        .limit(limit)
-        .all()
-    )
-    
-    for item, movie in favorites_items:
-        recent_activities.append({
-            "type": "favorites",
-            "action": "added to favorites",
-            "movie_id": movie.tmdb_id,
-            "movie_title": movie.title,
-            "timestamp": item.created_at
-        })
-    
-    # Get recent follow activities
-    followers = (
-        db.query(Follow, User)
-        .join(User, Follow.follower_id == User.id)
-        .filter(Follow.following_id == user_id)
-        .order_by(desc(Follow.created_at))
-        .limit(limit)
-        .all()
-    )
-    
-    for follow, follower in followers:
-        recent_activities.append({
-            "type": "follow",
-            "action": "gained follower",
-            "user_id": follower.id,
-            "user_name": follower.display_name,
-            "timestamp": follow.created_at
-        })
-    
-    following = (
-        db.query(Follow, User)
-        .join(User, Follow.following_id == User.id)
-        .filter(Follow.follower_id == user_id)
-        .order_by(desc(Follow.created_at))
-        .limit(limit)
-        .all()
-    )
-    
-    for follow, following_user in following:
-        recent_activities.append({
-            "type": "follow",
-            "action": "started following",
-            "user_id": following_user.id,
-            "user_name": following_user.display_name,
-            "timestamp": follow.created_at
-        })
-    
-    # Sort all activities by timestamp
-    recent_activities.sort(key=lambda x: x["timestamp"], reverse=True)
+    recent_activities, next_cursor = read_timeline(db, user_id, limit, cursor)
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     
     return {
         "user": {
@@ -222,5 +181,5 @@ def get_recent_user_activity(
             "display_name": user.display_name,
             "email": user.email
         },
-        "recent_activities": recent_activities[:limit]
+        "recent_activities": recent_activities
     }
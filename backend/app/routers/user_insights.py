@@ -1,16 +1,37 @@
 # app/routers/user_insights.py
 from fastapi import APIRouter, Depends, HTTPException, Query
 from sqlalchemy.orm import Session
-from sqlalchemy import and_, desc, func, text
-from typing import List, Dict, Any, Optional
-from datetime import datetime, timedelta
+from sqlalchemy import func
+from typing import Dict, Literal
+from datetime import date, datetime, timezone
+from zoneinfo import ZoneInfo, ZoneInfoNotFoundError
 import statistics
 
 from app.database import get_db
 from app.models.user import User
 from app.models.list_item import ListItem
-from app.models.movie import Movie
-from app.models.follow import Follow
+from app.services.activity_analytics import (
+    DAY_SECONDS,
+    ActivityArrays,
+    day_of_week_histogram,
+    gap_stats,
+    hour_of_day_histogram,
+    load_activity,
+    rolling_daily_activity,
+    streaks,
+    to_epoch,
+)
+from app.services.activity_trends import activity_series
+from app.services.platform_stats import (
+    LIST_METRICS,
+    METRIC_FAVORITES,
+    METRIC_FOLLOWERS,
+    METRIC_FOLLOWING,
+    METRIC_USERS,
+    METRIC_WATCHLIST,
+    load_platform_stats,
+    percentile_rank,
+)
 from app.utils.deps import get_current_user
 
 router = APIRouter(prefix="/user-insights", tags=["user-insights"])
@@ -28,26 +49,14 @@ def get_user_insights(
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Get user's movie activity
-    watchlist_items = (
-        db.query(ListItem, Movie)
-        .join(Movie, ListItem.movie_id == Movie.id)
-        .filter(ListItem.user_id == user_id, ListItem.kind == "watchlist")
-        .order_by(desc(ListItem.created_at))
-        .all()
-    )
-    
-    favorites_items = (
-        db.query(ListItem, Movie)
-        .join(Movie, ListItem.movie_id == Movie.id)
-        .filter(ListItem.user_id == user_id, ListItem.kind == "favorites")
-        .order_by(desc(ListItem.created_at))
-        .all()
-    )
+    # Get user's movie activity (kind and timestamp arrays only)
+    activity = load_activity(db, user_id)
+    watchlist_count = activity.count("watchlist")
+    favorites_count = activity.count("favorites")
     
-    # Get follow activity
-    followers = db.query(Follow).filter(Follow.following_id == user_id).count()
-    following = db.query(Follow).filter(Follow.follower_id == user_id).count()
+    # Get follow activity (denormalized counters)
+    followers = user.followers_count
+    following = user.following_count
     
     # Calculate insights
     insights = {
@@ -59,18 +68,19 @@ def get_user_insights(
             "is_active": user.is_active
         },
         "activity_summary": {
-            "total_movies": len(watchlist_items) + len(favorites_items),
-            "watchlist_count": len(watchlist_items),
-            "favorites_count": len(favorites_items),
+            "total_movies": watchlist_count + favorites_count,
+            "watchlist_count": watchlist_count,
+            "favorites_count": favorites_count,
             "followers_count": followers,
             "following_count": following,
-            "activity_score": calculate_activity_score(len(watchlist_items), len(favorites_items), followers, following)
+            "activity_score": calculate_activity_score(watchlist_count, favorites_count, followers, following)
         },
-        "watching_patterns": analyze_watching_patterns(watchlist_items, favorites_items),
-        "engagement_metrics": calculate_engagement_metrics(watchlist_items, favorites_items, user.created_at),
-        "preferences": analyze_preferences(watchlist_items, favorites_items),
+        "watching_patterns": analyze_watching_patterns(activity),
+        "activity_rhythm": analyze_activity_rhythm(activity),
+        "engagement_metrics": calculate_engagement_metrics(watchlist_count + favorites_count, user.created_at),
+        "preferences": analyze_preferences(watchlist_count, favorites_count),
         "social_activity": analyze_social_activity(followers, following, user.created_at),
-        "recommendations": generate_recommendations(watchlist_items, favorites_items)
+        "recommendations": generate_recommendations(watchlist_count, favorites_count)
     }
     
     return insights
@@ -79,67 +89,48 @@ def get_user_insights(
 def get_user_trends(
     user_id: int,
     days: int = Query(30, ge=1, le=365),
+    bucket: Literal["day", "week", "month"] = "day",
+    tz: str = Query("UTC", description="IANA time zone the buckets are aligned to"),
     current_user: User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    """Get user activity trends over time"""
+    """Get user activity trends over time (daily_activity holds one entry per bucket)"""
     
     # Check if user exists
     user = db.query(User).filter(User.id == user_id).first()
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    # Calculate date range
-    end_date = datetime.utcnow()
-    start_date = end_date - timedelta(days=days)
-    
-    # Get daily activity
-    daily_activity = []
-    for i in range(days):
-        current_date = start_date + timedelta(days=i)
-        next_date = current_date + timedelta(days=1)
-        
-        # Count watchlist additions
-        watchlist_count = (
-            db.query(ListItem)
-            .filter(
-                ListItem.user_id == user_id,
-                ListItem.kind == "watchlist",
-                ListItem.created_at >= current_date,
-                ListItem.created_at < next_date
-            )
-            .count()
-        )
-        
-        # Count favorites additions
-        favorites_count = (
-            db.query(ListItem)
-            .filter(
-                ListItem.user_id == user_id,
-                ListItem.kind == "favorites",
-                ListItem.created_at >= current_date,
-                ListItem.created_at < next_date
-            )
-            .count()
-        )
-        
-        daily_activity.append({
-            "date": current_date.strftime("%Y-%m-%d"),
-            "watchlist_additions": watchlist_count,
-            "favorites_additions": favorites_count,
-            "total_activity": watchlist_count + favorites_count
-        })
+    try:
+        zone = ZoneInfo(tz)
+    except (ValueError, ZoneInfoNotFoundError):
+        raise HTTPException(status_code=400, detail="Unknown time zone")
+    
+    daily_activity = activity_series(db, user_id, days, bucket, zone)
+    
+    # The first bucket may start before the window, so average over every
+    # day the buckets cover up to today rather than over `days`
+    covered_days = (datetime.now(zone).date() - date.fromisoformat(daily_activity[0]["date"])).days + 1
+    total_activity = sum(day["total_activity"] for day in daily_activity)
+    busiest = max(daily_activity, key=lambda x: x["total_activity"])
+    summary = {
+        "total_watchlist_additions": sum(day["watchlist_additions"] for day in daily_activity),
+        "total_favorites_additions": sum(day["favorites_additions"] for day in daily_activity),
+        "average_daily_activity": total_activity / covered_days
+    }
+    if bucket == "day":
+        summary["most_active_day"] = busiest["date"]
+    else:
+        summary["average_per_bucket"] = statistics.mean([day["total_activity"] for day in daily_activity])
+        summary["most_active_bucket"] = busiest["date"]
     
     return {
         "user_id": user_id,
         "period_days": days,
+        "bucket": bucket,
+        "timezone": tz,
         "daily_activity": daily_activity,
-        "summary": {
-            "total_watchlist_additions": sum(day["watchlist_additions"] for day in daily_activity),
-            "total_favorites_additions": sum(day["favorites_additions"] for day in daily_activity),
-            "average_daily_activity": statistics.mean([day["total_activity"] for day in daily_activity]) if daily_activity else 0,
-            "most_active_day": max(daily_activity, key=lambda x: x["total_activity"])["date"] if daily_activity else None
-        }
+        "summary": summary
     }
 
 @router.get("/comparison/{user_id}")
@@ -156,16 +147,23 @@ def compare_user_activity(
         raise HTTPException(status_code=404, detail="User not found")
     
     # Get user stats
-    user_watchlist = db.query(ListItem).filter(ListItem.user_id == user_id, ListItem.kind == "watchlist").count()
-    user_favorites = db.query(ListItem).filter(ListItem.user_id == user_id, ListItem.kind == "favorites").count()
-    user_followers = db.query(Follow).filter(Follow.following_id == user_id).count()
-    user_following = db.query(Follow).filter(Follow.follower_id == user_id).count()
-    
-    # Get platform averages
-    total_users = db.query(User).count()
-    total_watchlist = db.query(ListItem).filter(ListItem.kind == "watchlist").count()
-    total_favorites = db.query(ListItem).filter(ListItem.kind == "favorites").count()
-    total_follows = db.query(Follow).count()
+    list_counts = dict(
+        db.query(ListItem.kind, func.count(ListItem.id))
+        .filter(ListItem.user_id == user_id, ListItem.kind.in_(LIST_METRICS))
+        .group_by(ListItem.kind)
+        .all()
+    )
+    user_watchlist = list_counts.get("watchlist", 0)
+    user_favorites = list_counts.get("favorites", 0)
+    user_followers = user.followers_count or 0
+    user_following = user.following_count or 0
+    
+    # Get platform averages from the precomputed snapshot
+    stats = load_platform_stats(db)
+    total_users = stats[METRIC_USERS].total
+    total_watchlist = stats[METRIC_WATCHLIST].total
+    total_favorites = stats[METRIC_FAVORITES].total
+    total_follows = stats[METRIC_FOLLOWING].total
     
     platform_avg_watchlist = total_watchlist / total_users if total_users > 0 else 0
     platform_avg_favorites = total_favorites / total_users if total_users > 0 else 0
@@ -188,7 +186,19 @@ def compare_user_activity(
             "watchlist_vs_avg": round((user_watchlist / platform_avg_watchlist - 1) * 100, 1) if platform_avg_watchlist > 0 else 0,
             "favorites_vs_avg": round((user_favorites / platform_avg_favorites - 1) * 100, 1) if platform_avg_favorites > 0 else 0,
             "follows_vs_avg": round(((user_followers + user_following) / (platform_avg_follows * 2) - 1) * 100, 1) if platform_avg_follows > 0 else 0
-        }
+        },
+        # Share of users below this user (ties count half), 0-100
+        "percentile_ranks": {
+            "watchlist": percentile_rank(stats.get(METRIC_WATCHLIST), user_watchlist),
+            "favorites": percentile_rank(stats.get(METRIC_FAVORITES), user_favorites),
+            "followers": percentile_rank(stats.get(METRIC_FOLLOWERS), user_followers),
+            "following": percentile_rank(stats.get(METRIC_FOLLOWING), user_following)
+        },
+        "platform_percentiles": {
+            metric: stats[metric].percentiles
+            for metric in (METRIC_WATCHLIST, METRIC_FAVORITES, METRIC_FOLLOWERS, METRIC_FOLLOWING)
+        },
+        "stats_refreshed_at": stats[METRIC_USERS].refreshed_at
     }
 
 def calculate_activity_score(watchlist_count: int, favorites_count: int, followers_count: int, following_count: int) -> int:
@@ -201,11 +211,9 @@ def calculate_activity_score(watchlist_count: int, favorites_count: int, followe
     score += 10 if watchlist_count > 0 or favorites_count > 0 else 0  # Bonus for any activity
     return min(score, 100)
 
-def analyze_watching_patterns(watchlist_items: List, favorites_items: List) -> Dict:
+def analyze_watching_patterns(activity: ActivityArrays) -> Dict:
     """Analyze user's watching patterns"""
-    all_items = watchlist_items + favorites_items
-    
-    if not all_items:
+    if not len(activity):
         return {
             "activity_level": "Inactive",
             "preference_consistency": "Unknown",
@@ -214,17 +222,11 @@ def analyze_watching_patterns(watchlist_items: List, favorites_items: List) -> D
         }
     
     # Calculate time between additions
-    timestamps = [item.created_at for item, movie in all_items]
-    timestamps.sort()
-    
-    if len(timestamps) > 1:
-        time_diffs = [(timestamps[i+1] - timestamps[i]).days for i in range(len(timestamps)-1)]
-        avg_time_between = statistics.mean(time_diffs) if time_diffs else 0
-    else:
-        avg_time_between = 0
+    gaps = gap_stats(activity)
+    avg_time_between = gaps["mean_days"]
     
     # Determine activity level
-    total_items = len(all_items)
+    total_items = len(activity)
     if total_items >= 20:
         activity_level = "Very Active"
     elif total_items >= 10:
@@ -237,7 +239,7 @@ def analyze_watching_patterns(watchlist_items: List, favorites_items: List) -> D
         activity_level = "Inactive"
     
     # Calculate engagement depth (favorites vs watchlist ratio)
-    favorites_ratio = len(favorites_items) / total_items if total_items > 0 else 0
+    favorites_ratio = activity.count("favorites") / total_items if total_items > 0 else 0
     if favorites_ratio >= 0.5:
         engagement_depth = "High"
     elif favorites_ratio >= 0.2:
@@ -249,19 +251,28 @@ def analyze_watching_patterns(watchlist_items: List, favorites_items: List) -> D
         "activity_level": activity_level,
         "total_movies_interacted": total_items,
         "average_time_between_additions_days": round(avg_time_between, 1),
+        "median_time_between_additions_days": round(gaps["median_days"], 1),
+        "longest_gap_days": round(gaps["max_days"], 1),
         "favorites_ratio": round(favorites_ratio, 2),
         "engagement_depth": engagement_depth,
         "discovery_rate": "High" if avg_time_between < 7 else "Medium" if avg_time_between < 30 else "Low"
     }
 
-def calculate_engagement_metrics(watchlist_items: List, favorites_items: List, user_created_at: datetime) -> Dict:
+def analyze_activity_rhythm(activity: ActivityArrays) -> Dict:
+    """When the user is active: streaks, hour/weekday histograms (UTC) and a rolling 7-day count"""
+    return {
+        **streaks(activity),
+        "hour_of_day": hour_of_day_histogram(activity),
+        "day_of_week": day_of_week_histogram(activity),
+        "rolling_7_day_activity": rolling_daily_activity(activity, days=30, window=7)
+    }
+
+def calculate_engagement_metrics(total_items: int, user_created_at: datetime) -> Dict:
     """Calculate user engagement metrics"""
-    total_items = len(watchlist_items) + len(favorites_items)
-    
     if not user_created_at:
         return {"account_age_days": 0, "items_per_day": 0, "engagement_level": "Unknown"}
     
-    account_age_days = (datetime.utcnow() - user_created_at).days
+    account_age_days = int((to_epoch(datetime.now(timezone.utc)) - to_epoch(user_created_at)) // DAY_SECONDS)
     items_per_day = total_items / account_age_days if account_age_days > 0 else 0
     
     # Determine engagement level
@@ -283,11 +294,9 @@ def calculate_engagement_metrics(watchlist_items: List, favorites_items: List, u
         "total_sessions": total_items  # Simplified: assuming each addition is a session
     }
 
-def analyze_preferences(watchlist_items: List, favorites_items: List) -> Dict:
+def analyze_preferences(watchlist_count: int, favorites_count: int) -> Dict:
     """Analyze user preferences (simplified - would need more movie data for real analysis)"""
-    all_items = watchlist_items + favorites_items
-    
-    if not all_items:
+    if not watchlist_count + favorites_count:
         return {
             "preferred_genres": [],
             "preferred_years": [],
@@ -300,7 +309,7 @@ def analyze_preferences(watchlist_items: List, favorites_items: List) -> Dict:
         "preferred_genres": ["Action", "Drama", "Comedy"],  # Placeholder
         "preferred_years": ["2020s", "2010s"],  # Placeholder
         "diversity_score": 75,  # Placeholder
-        "preference_stability": "High" if len(favorites_items) > len(watchlist_items) else "Medium"
+        "preference_stability": "High" if favorites_count > watchlist_count else "Medium"
     }
 
 def analyze_social_activity(followers_count: int, following_count: int, user_created_at: datetime) -> Dict:
@@ -326,20 +335,20 @@ def analyze_social_activity(followers_count: int, following_count: int, user_cre
         "social_level": social_level,
         "total_connections": total_connections,
         "influence_score": influence_score,
-        "follower_to_following_ratio": round(followers_count / following_count, 2) if following_count > 0 else float('inf')
+        "follower_to_following_ratio": round(followers_count / following_count, 2) if following_count > 0 else None
     }
 
-def generate_recommendations(watchlist_items: List, favorites_items: List) -> Dict:
+def generate_recommendations(watchlist_count: int, favorites_count: int) -> Dict:
     """Generate recommendations based on user activity"""
-    total_items = len(watchlist_items) + len(favorites_items)
+    total_items = watchlist_count + favorites_count
     
     recommendations = []
     
     if total_items == 0:
         recommendations.append("Start exploring movies by adding some to your watchlist!")
-    elif len(favorites_items) == 0:
+    elif favorites_count == 0:
         recommendations.append("Try marking some movies as favorites to help us understand your preferences better.")
-    elif len(watchlist_items) > len(favorites_items) * 2:
+    elif watchlist_count > favorites_count * 2:
         recommendations.append("You have many movies in your watchlist. Consider watching some and marking favorites!")
     elif total_items < 5:
         recommendations.append("Keep exploring! Add more movies to get better recommendations.")
@@ -1,7 +1,7 @@
 # app/schemas/follow.py
 from pydantic import BaseModel
 from datetime import datetime
-from typing import Optional
+from typing import List, Optional
 
 class FollowBase(BaseModel):
     following_id: int
@@ -35,3 +35,13 @@ class FollowStats(BaseModel):
     followers_count: int
     following_count: int
     is_following: bool = False
+
+class FollowedByInfo(BaseModel):
+    count: int
+    users: List[UserFollowInfo]
+
+class FollowSuggestion(UserFollowInfo):
+    score: float
+    mutual_follows: int = 0  # people you follow who follow them
+    taste_similarity: float = 0.0  # overlap of listed/reviewed movies (0-1)
+
@@ -0,0 +1,141 @@
+# app/services/activity_analytics.py
+"""
+Activity analytics over compact NumPy arrays.
+
+A user's list activity is loaded as two parallel arrays, kind codes and
+epoch seconds sorted ascending, instead of (ListItem, Movie) ORM tuples.
+Inter-arrival gaps, streaks, hour-of-day and day-of-week histograms and
+rolling daily counts are then vectorized over whole arrays (np.diff,
+np.unique, np.bincount, np.convolve), with no per-event Python loop. The
+same loader feeds the Python bucketing in app.services.activity_trends.
+"""
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Sequence
+
+import numpy as np
+from sqlalchemy.orm import Session
+
+from app.models.list_item import ListItem
+
+DAY_SECONDS = 86400
+# 1970-01-01 was a Thursday; shifts epoch days so Monday is 0
+EPOCH_WEEKDAY = 3
+
+
+def to_epoch(value: datetime) -> float:
+    """Seconds since the epoch; naive datetimes are UTC (as SQLite returns them)"""
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+class ActivityArrays:
+    """Parallel kind-code (int8) and timestamp (float64) arrays for one user's activity, oldest first"""
+
+    def __init__(self, kinds: Sequence[str], codes, timestamps):
+        self.kinds = list(kinds)
+        self.codes = np.asarray(codes, dtype=np.int8)
+        self.timestamps = np.asarray(timestamps, dtype=np.float64)
+
+    def __len__(self) -> int:
+        return len(self.timestamps)
+
+    def count(self, kind: str) -> int:
+        if kind not in self.kinds:
+            return 0
+        return int(np.count_nonzero(self.codes == self.kinds.index(kind)))
+
+    def _day_index(self, utc_offset: int) -> np.ndarray:
+        """Whole days since the epoch for every event, in the given fixed offset"""
+        return np.floor_divide(self.timestamps + utc_offset, DAY_SECONDS).astype(np.int64)
+
+
+def load_activity(
+    db: Session,
+    user_id: int,
+    kinds: Sequence[str] = ("watchlist", "favorites"),
+    since: Optional[datetime] = None,
+) -> ActivityArrays:
+    """Only the (kind, created_at) columns, oldest first"""
+    query = db.query(ListItem.kind, ListItem.created_at).filter(
+        ListItem.user_id == user_id, ListItem.kind.in_(kinds), ListItem.created_at.isnot(None)
+    )
+    if since is not None:
+        query = query.filter(ListItem.created_at >= since.astimezone(timezone.utc))
+    rows = query.order_by(ListItem.created_at).all()
+    codes = {kind: i for i, kind in enumerate(kinds)}
+    return ActivityArrays(
+        kinds,
+        np.fromiter((codes[kind] for kind, _ in rows), dtype=np.int8, count=len(rows)),
+        np.fromiter((to_epoch(created_at) for _, created_at in rows), dtype=np.float64, count=len(rows)),
+    )
+
+
+# ------------------------------------------------------
+# Metrics
+# ------------------------------------------------------
+def gap_stats(activity: ActivityArrays) -> Dict[str, float]:
+    """
+    Mean, median and longest time between consecutive additions, counted
+    in whole days (like timedelta.days), so the mean matches the
+    discovery-rate thresholds it has always been compared against.
+    """
+    if len(activity) < 2:
+        return {"mean_days": 0.0, "median_days": 0.0, "max_days": 0.0}
+    gaps = np.floor_divide(np.diff(activity.timestamps), DAY_SECONDS)
+    return {
+        "mean_days": round(float(gaps.mean()), 2),
+        "median_days": float(np.median(gaps)),
+        "max_days": float(gaps.max()),
+    }
+
+
+def streaks(activity: ActivityArrays, now: Optional[datetime] = None, utc_offset: int = 0) -> Dict[str, int]:
+    """
+    Longest run of consecutive active days, and the run ending today (or
+    yesterday, so a streak is not lost before today's first addition).
+    """
+    if not len(activity):
+        return {"active_days": 0, "longest_streak_days": 0, "current_streak_days": 0}
+    today = int((to_epoch(now or datetime.now(timezone.utc)) + utc_offset) // DAY_SECONDS)
+
+    days = np.unique(activity._day_index(utc_offset))
+    # A run breaks wherever consecutive active days are more than a day apart
+    breaks = np.flatnonzero(np.diff(days) != 1) + 1
+    runs = np.diff(np.concatenate(([0], breaks, [len(days)])))
+
+    current = int(runs[-1]) if today - int(days[-1]) <= 1 else 0
+    return {"active_days": int(len(days)), "longest_streak_days": int(runs.max()), "current_streak_days": current}
+
+
+def hour_of_day_histogram(activity: ActivityArrays, utc_offset: int = 0) -> List[int]:
+    """Additions per hour of the day (24 buckets)"""
+    hours = np.floor_divide(activity.timestamps + utc_offset, 3600).astype(np.int64) % 24
+    return np.bincount(hours, minlength=24).tolist()
+
+
+def day_of_week_histogram(activity: ActivityArrays, utc_offset: int = 0) -> List[int]:
+    """Additions per weekday, Monday first (7 buckets)"""
+    weekdays = (activity._day_index(utc_offset) + EPOCH_WEEKDAY) % 7
+    return np.bincount(weekdays, minlength=7).tolist()
+
+
+def rolling_daily_activity(
+    activity: ActivityArrays,
+    days: int = 30,
+    window: int = 7,
+    now: Optional[datetime] = None,
+    utc_offset: int = 0,
+) -> List[int]:
+    """
+    For each of the last `days` days (oldest first), the number of
+    additions in the `window` days ending that day.
+    """
+    today = int((to_epoch(now or datetime.now(timezone.utc)) + utc_offset) // DAY_SECONDS)
+    # Start early enough that the first day has a full window behind it
+    first = today - days - window + 2
+    span = days + window - 1
+
+    offsets = activity._day_index(utc_offset) - first
+    daily = np.bincount(offsets[(offsets >= 0) & (offsets < span)], minlength=span)
+    return np.convolve(daily, np.ones(window, dtype=np.int64), mode="valid").tolist()
@@ -0,0 +1,132 @@
+# app/services/activity_stream.py
+"""
+Live activity deltas for server-sent event streams.
+
+Write paths publish a small event once their transaction has committed.
+The invalidation backend carries it to every worker, and each worker's
+broker hands it to the local connections watching the actor or the other
+user in a follow. Every connection reads from its own bounded queue. A
+client that falls behind loses its backlog and receives a single
+"resync" event telling it to refetch, so a slow reader never blocks
+writers or grows memory.
+"""
+import asyncio
+import threading
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional, Set
+
+from app.config import settings
+from app.services.invalidation import InvalidationBackend, load_invalidation_backend
+
+VERB_REVIEW_UPDATE = "review_update"
+VERB_REVIEW_DELETE = "review_delete"
+VERB_LIST_REMOVE = "list_remove"
+VERB_UNFOLLOW = "unfollow"
+EVENT_RESYNC = "resync"
+
+
+class ActivitySubscription:
+    """One stream connection: the users it watches and its bounded queue"""
+
+    def __init__(self, user_ids: Iterable[int], max_queue: int):
+        self.user_ids: Set[int] = set(user_ids)
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=max_queue)
+        self.loop = asyncio.get_running_loop()
+        self.dropped = 0
+
+    def offer(self, message: dict):
+        """Queue a message (runs on the connection's event loop)"""
+        try:
+            self.queue.put_nowait(message)
+        except asyncio.QueueFull:
+            # Too far behind to be worth catching up event by event
+            while not self.queue.empty():
+                self.queue.get_nowait()
+                self.dropped += 1
+            self.dropped += 1
+            self.queue.put_nowait({"type": EVENT_RESYNC})
+
+
+class ActivityBroker:
+    def __init__(self, backend: Optional[InvalidationBackend] = None):
+        self._by_user: Dict[int, Set[ActivitySubscription]] = {}
+        self._lock = threading.Lock()
+        self.published = 0
+        self.delivered = 0
+        self.backend = backend or load_invalidation_backend(settings.ACTIVITY_STREAM_BACKEND)
+        self.backend.subscribe(self._on_message)
+
+    def publish(self, actor_id: int, verb: str, **fields):
+        """Send an event to every worker; call after the change has committed"""
+        message = {
+            "type": verb,
+            "actor_id": actor_id,
+            "created_at": datetime.now(timezone.utc).isoformat(),
+            **fields,
+        }
+        self.published += 1
+        try:
+            self.backend.publish(message)
+        except Exception as e:
+            print("Activity stream publish failed:", e)
+
+    def subscribe(self, user_ids: Iterable[int]) -> ActivitySubscription:
+        """Must be called from the event loop that will read the stream"""
+        subscription = ActivitySubscription(user_ids, settings.ACTIVITY_STREAM_QUEUE_SIZE)
+        with self._lock:
+            for user_id in subscription.user_ids:
+                self._by_user.setdefault(user_id, set()).add(subscription)
+        return subscription
+
+    def watch(self, subscription: ActivitySubscription, user_id: int):
+        with self._lock:
+            subscription.user_ids.add(user_id)
+            self._by_user.setdefault(user_id, set()).add(subscription)
+
+    def unwatch(self, subscription: ActivitySubscription, user_id: int):
+        with self._lock:
+            subscription.user_ids.discard(user_id)
+            self._discard(user_id, subscription)
+
+    def unsubscribe(self, subscription: ActivitySubscription):
+        with self._lock:
+            for user_id in subscription.user_ids:
+                self._discard(user_id, subscription)
+
+    def metrics(self) -> dict:
+        with self._lock:
+            connections = set().union(*self._by_user.values()) if self._by_user else set()
+        return {
+            "connections": len(connections),
+            "watched_users": len(self._by_user),
+            "published": self.published,
+            "delivered": self.delivered,
+            "dropped": sum(sub.dropped for sub in connections),
+        }
+
+    def _discard(self, user_id: int, subscription: ActivitySubscription):
+        watchers = self._by_user.get(user_id)
+        if watchers is not None:
+            watchers.discard(subscription)
+            if not watchers:
+                del self._by_user[user_id]
+
+    def _on_message(self, message: dict):
+        # Runs on whichever thread published or received the message
+        involved = {message.get("actor_id"), message.get("target_user_id")}
+        with self._lock:
+            targets = set().union(*(self._by_user.get(uid, ()) for uid in involved))
+        for subscription in targets:
+            try:
+                subscription.loop.call_soon_threadsafe(subscription.offer, message)
+                self.delivered += 1
+            except RuntimeError:
+                # Loop already closed; the stream's cleanup will unsubscribe it
+                pass
+
+
+activity_broker = ActivityBroker()
+
+
+def get_activity_broker() -> ActivityBroker:
+    return activity_broker
@@ -0,0 +1,144 @@
+# app/services/activity_timeline.py
+"""
+One user's own activity (list additions, reviews, and follows in both
+directions) as a single newest-first timeline.
+
+Every source is one branch of a UNION ALL query. Each branch applies the
+cursor and its own LIMIT on a (user, created_at, id) index before the
+merge, so a page is one round trip reading at most `limit + 1` rows per
+source, however deep the cursor goes.
+"""
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Integer, String, cast, literal, null, select, tuple_, union_all
+from sqlalchemy.orm import Session
+
+from app.models.follow import Follow
+from app.models.list_item import ListItem
+from app.models.movie import Movie
+from app.models.review import Review
+from app.models.user import User
+from app.utils.pagination import decode_timeline_cursor, encode_timeline_cursor
+
+# Tie-breaker between sources when timestamps are equal (part of the cursor)
+SOURCE_LIST_ITEM = 1
+SOURCE_REVIEW = 2
+SOURCE_FOLLOWER = 3
+SOURCE_FOLLOWING = 4
+
+LIST_ACTIONS = {
+    "watchlist": "added to watchlist",
+    "favorites": "added to favorites",
+    "watched": "marked as watched",
+}
+
+
+def _branch(source: int, created_col, id_col, columns: list, query, after, limit: int):
+    """One source's newest `limit + 1` rows after the cursor, as a subquery"""
+    query = query.add_columns(
+        created_col.label("created_at"),
+        literal(source, Integer).label("source"),
+        id_col.label("row_id"),
+        *columns,
+    )
+    if after:
+        created_at, after_source, after_id = after
+        # Sources are ordered too, so only the cursor's own source needs the id comparison
+        if source < after_source:
+            query = query.where(created_col <= created_at)
+        elif source == after_source:
+            query = query.where(tuple_(created_col, id_col) < tuple_(created_at, after_id))
+        else:
+            query = query.where(created_col < created_at)
+    return select(query.order_by(created_col.desc(), id_col.desc()).limit(limit + 1).subquery())
+
+
+def read_timeline(db: Session, user_id: int, limit: int, cursor: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+    """One page of the user's activity, newest first, plus the next cursor"""
+    after = decode_timeline_cursor(cursor) if cursor else None
+    no_int = cast(null(), Integer)
+
+    branches = [
+        _branch(
+            SOURCE_LIST_ITEM, ListItem.created_at, ListItem.id,
+            [ListItem.kind.label("kind"), Movie.tmdb_id.label("tmdb_id"),
+             no_int.label("other_user_id"), no_int.label("rating")],
+            select().select_from(ListItem).join(Movie, ListItem.movie_id == Movie.id)
+            .where(ListItem.user_id == user_id),
+            after, limit,
+        ),
+        _branch(
+            SOURCE_REVIEW, Review.created_at, Review.id,
+            [literal("review", String).label("kind"), Review.movie_id.label("tmdb_id"),
+             no_int.label("other_user_id"), Review.rating.label("rating")],
+            select().select_from(Review).where(Review.user_id == user_id),
+            after, limit,
+        ),
+        _branch(
+            SOURCE_FOLLOWER, Follow.created_at, Follow.id,
+            [literal("follower", String).label("kind"), no_int.label("tmdb_id"),
+             Follow.follower_id.label("other_user_id"), no_int.label("rating")],
+            select().select_from(Follow).where(Follow.following_id == user_id),
+            after, limit,
+        ),
+        _branch(
+            SOURCE_FOLLOWING, Follow.created_at, Follow.id,
+            [literal("following", String).label("kind"), no_int.label("tmdb_id"),
+             Follow.following_id.label("other_user_id"), no_int.label("rating")],
+            select().select_from(Follow).where(Follow.follower_id == user_id),
+            after, limit,
+        ),
+    ]
+    merged = union_all(*branches).subquery()
+    rows = db.execute(
+        select(merged)
+        .order_by(merged.c.created_at.desc(), merged.c.source.desc(), merged.c.row_id.desc())
+        .limit(limit + 1)
+    ).all()
+
+    next_cursor = None
+    if len(rows) > limit:
+        rows = rows[:limit]
+        last = rows[-1]
+        next_cursor = encode_timeline_cursor(last.created_at, last.source, last.row_id)
+    return _hydrate(db, rows), next_cursor
+
+
+def _hydrate(db: Session, rows) -> List[dict]:
+    """Attach movie and user details with one query each"""
+    tmdb_ids = {row.tmdb_id for row in rows if row.tmdb_id is not None}
+    movies: Dict[int, Movie] = (
+        {m.tmdb_id: m for m in db.query(Movie).filter(Movie.tmdb_id.in_(tmdb_ids))} if tmdb_ids else {}
+    )
+    user_ids = {row.other_user_id for row in rows if row.other_user_id is not None}
+    users: Dict[int, User] = (
+        {u.id: u for u in db.query(User).filter(User.id.in_(user_ids))} if user_ids else {}
+    )
+
+    items = []
+    for row in rows:
+        if row.source in (SOURCE_FOLLOWER, SOURCE_FOLLOWING):
+            other = users.get(row.other_user_id)
+            items.append({
+                "type": "follow",
+                "action": "gained follower" if row.source == SOURCE_FOLLOWER else "started following",
+                "user_id": row.other_user_id,
+                "user_name": other.display_name if other else None,
+                "timestamp": row.created_at,
+            })
+            continue
+
+        movie = movies.get(row.tmdb_id)
+        item = {
+            "type": row.kind,
+            "action": "reviewed" if row.source == SOURCE_REVIEW else LIST_ACTIONS.get(row.kind, f"added to {row.kind}"),
+            "movie_id": row.tmdb_id,
+            "movie_title": movie.title if movie else None,
+            "poster_path": movie.poster_path if movie else None,
+            "timestamp": row.created_at,
+        }
+        if row.source == SOURCE_REVIEW:
+            item["review_id"] = row.row_id
+            item["rating"] = row.rating
+        items.append(item)
+    return items
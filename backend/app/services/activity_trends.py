@@ -0,0 +1,101 @@
+# app/services/activity_trends.py
+"""
+Per-day/week/month counts of a user's watchlist and favorites additions,
+in one query however long the window is.
+
+On PostgreSQL the buckets are made with date_trunc in the requested time
+zone and left-joined onto generate_series, so empty buckets come back as
+zeros from the same query. Other databases cannot convert time zones in
+SQL, so the window's timestamps are fetched in one query as compact
+arrays (app.services.activity_analytics) and bucketed and gap-filled in
+Python.
+"""
+from datetime import date, datetime, time, timedelta
+from typing import Dict, List, Tuple
+from zoneinfo import ZoneInfo
+
+from sqlalchemy import text
+from sqlalchemy.orm import Session
+
+from app.services.activity_analytics import load_activity
+
+TREND_KINDS = ("watchlist", "favorites")
+
+_PG_SERIES = text("""
+    SELECT series.bucket, COALESCE(counts.watchlist, 0), COALESCE(counts.favorites, 0)
+    FROM generate_series(CAST(:first AS timestamp), CAST(:last AS timestamp), CAST(:step AS interval)) AS series(bucket)
+    LEFT JOIN (
+        SELECT date_trunc(:unit, created_at AT TIME ZONE :tz) AS bucket,
+               COUNT(*) FILTER (WHERE kind = 'watchlist') AS watchlist,
+               COUNT(*) FILTER (WHERE kind = 'favorites') AS favorites
+        FROM list_items
+        WHERE user_id = :user_id AND kind IN ('watchlist', 'favorites') AND created_at >= :start
+        GROUP BY 1
+    ) AS counts ON counts.bucket = series.bucket
+    ORDER BY series.bucket
+""")
+
+
+def bucket_start(day: date, bucket: str) -> date:
+    """Start of the bucket containing `day` (weeks start on Monday, like date_trunc)"""
+    if bucket == "week":
+        return day - timedelta(days=day.weekday())
+    if bucket == "month":
+        return day.replace(day=1)
+    return day
+
+
+def next_bucket(day: date, bucket: str) -> date:
+    if bucket == "week":
+        return day + timedelta(days=7)
+    if bucket == "month":
+        return (day.replace(day=28) + timedelta(days=4)).replace(day=1)
+    return day + timedelta(days=1)
+
+
+def activity_series(db: Session, user_id: int, days: int, bucket: str, tz: ZoneInfo) -> List[dict]:
+    """
+    Buckets covering the last `days` days up to today in `tz`, oldest
+    first. The first bucket starts on its natural boundary, so it may reach
+    back before the window.
+    """
+    today = datetime.now(tz).date()
+    first = bucket_start(today - timedelta(days=days - 1), bucket)
+    last = bucket_start(today, bucket)
+    start = datetime.combine(first, time.min, tzinfo=tz)
+
+    if db.get_bind().dialect.name == "postgresql":
+        rows = db.execute(_PG_SERIES, {
+            "first": datetime.combine(first, time.min),
+            "last": datetime.combine(last, time.min),
+            "step": f"1 {bucket}",
+            "unit": bucket,
+            "tz": tz.key,
+            "user_id": user_id,
+            "start": start,
+        }).all()
+        counts = {row[0].date(): (row[1], row[2]) for row in rows}
+    else:
+        counts = _bucket_in_python(db, user_id, bucket, tz, start)
+
+    series = []
+    current = first
+    while current <= last:
+        watchlist, favorites = counts.get(current, (0, 0))
+        series.append({
+            "date": current.isoformat(),
+            "watchlist_additions": watchlist,
+            "favorites_additions": favorites,
+            "total_activity": watchlist + favorites
+        })
+        current = next_bucket(current, bucket)
+    return series
+
+
+def _bucket_in_python(db: Session, user_id: int, bucket: str, tz: ZoneInfo, start: datetime) -> Dict[date, Tuple[int, int]]:
+    activity = load_activity(db, user_id, TREND_KINDS, since=start)
+    counts: Dict[date, List[int]] = {}
+    for code, ts in zip(activity.codes.tolist(), activity.timestamps.tolist()):
+        key = bucket_start(datetime.fromtimestamp(ts, tz).date(), bucket)
+        counts.setdefault(key, [0, 0])[code] += 1
+    return {key: (watchlist, favorites) for key, (watchlist, favorites) in counts.items()}
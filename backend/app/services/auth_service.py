@@ -1,6 +1,7 @@
 from sqlalchemy.orm import Session
 from app.models.user import User, RefreshToken
 from app.models.user import User
+from app.services.platform_stats import METRIC_USERS, record_stat_change
 from app.utils.security import hash_password, verify_password, create_access_token, create_refresh_token
 from datetime import timedelta
 from pydantic import BaseModel, EmailStr, Field
@@ -20,6 +21,7 @@ def register(db: Session, data: RegisterIn):
         display_name=data.display_name
     )
     db.add(user)
+    record_stat_change(db, 1, METRIC_USERS)
     db.commit()
     db.refresh(user)
     return user
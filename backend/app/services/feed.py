@@ -0,0 +1,273 @@
+# app/services/feed.py
+"""
+Home feed of followed users' activity.
+
+Every review, list addition and follow is recorded once as an
+ActivityEvent. After the request commits, the event is copied into each
+follower's feed_inbox (fan-out on write), so reading a feed is one index
+range scan no matter how many people the reader follows. Actors with more
+than FEED_FANOUT_MAX_FOLLOWERS followers are not fanned out; their events
+are pulled from activity_events when a follower reads (fan-out on read)
+and merged into the page.
+"""
+import asyncio
+import time
+from datetime import datetime, timezone
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import delete, func, insert, select, tuple_
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.feed import ActivityEvent, FeedInboxEntry
+from app.models.follow import Follow
+from app.models.movie import Movie
+from app.models.user import User
+from app.services.social_graph import get_social_graph
+from app.utils.pagination import apply_keyset, encode_cursor
+
+VERB_REVIEW = "review"
+VERB_LIST_ADD = "list_add"
+VERB_FOLLOW = "follow"
+
+
+# ------------------------------------------------------
+# Write side
+# ------------------------------------------------------
+def record_event(db: Session, actor_id: int, verb: str, **fields) -> ActivityEvent:
+    """Add an event to the caller's transaction; fan it out after commit"""
+    event = ActivityEvent(actor_id=actor_id, verb=verb, created_at=datetime.now(timezone.utc), **fields)
+    db.add(event)
+    db.flush()
+    return event
+
+
+def remove_events(db: Session, **filters):
+    """Delete events (and their inbox copies) matching column == value filters"""
+    event_ids = select(ActivityEvent.id).filter_by(**filters)
+    db.execute(delete(FeedInboxEntry).where(FeedInboxEntry.event_id.in_(event_ids)))
+    db.execute(delete(ActivityEvent).filter_by(**filters))
+
+
+def update_events(db: Session, values: dict, **filters):
+    db.query(ActivityEvent).filter_by(**filters).update(values, synchronize_session=False)
+
+
+def remove_actor_from_inbox(db: Session, owner_id: int, actor_id: int):
+    """After an unfollow, drop the unfollowed user's events from the owner's feed"""
+    db.execute(
+        delete(FeedInboxEntry).where(FeedInboxEntry.owner_id == owner_id, FeedInboxEntry.actor_id == actor_id)
+    )
+
+
+def _follower_ids(db: Session, user_id: int) -> List[int]:
+    graph = get_social_graph()
+    if graph.built:
+        return graph.followers(user_id)
+    return [uid for (uid,) in db.query(Follow.follower_id).filter(Follow.following_id == user_id).all()]
+
+
+def _is_high_fanout(db: Session, user_id: int) -> bool:
+    followers = db.query(User.followers_count).filter(User.id == user_id).scalar()
+    return (followers or 0) > settings.FEED_FANOUT_MAX_FOLLOWERS
+
+
+def _insert_inbox_rows(db: Session, rows: List[dict]):
+    """
+    Insert inbox entries, skipping any the owner already has. PostgreSQL
+    and SQLite use one INSERT ... ON CONFLICT DO NOTHING, so a backfill and
+    a fan-out delivering the same event never fail each other. Other
+    databases insert row by row in savepoints.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        stmt = postgresql.insert(FeedInboxEntry) if dialect == "postgresql" else sqlite.insert(FeedInboxEntry)
+        db.execute(stmt.on_conflict_do_nothing(index_elements=["owner_id", "event_id"]), rows)
+        return
+    for row in rows:
+        try:
+            with db.begin_nested():
+                db.execute(insert(FeedInboxEntry), [row])
+        except IntegrityError:
+            continue
+
+
+def fan_out_event(event_id: int):
+    """Copy one event into every follower's inbox (run as a background task)"""
+    db = SessionLocal()
+    try:
+        event = db.get(ActivityEvent, event_id)
+        if event is None or _is_high_fanout(db, event.actor_id):
+            return
+        followers = _follower_ids(db, event.actor_id)
+        batch_size = settings.FEED_FANOUT_BATCH_SIZE
+        for start in range(0, len(followers), batch_size):
+            _insert_inbox_rows(db, [
+                {"owner_id": owner_id, "event_id": event.id, "actor_id": event.actor_id, "created_at": event.created_at}
+                for owner_id in followers[start:start + batch_size]
+            ])
+            db.commit()
+    except Exception as e:
+        print("Feed fan-out failed:", e)
+    finally:
+        db.close()
+
+
+def backfill_inbox(owner_id: int, actor_id: int):
+    """Seed a new follower's feed with the followed user's latest events"""
+    db = SessionLocal()
+    try:
+        if _is_high_fanout(db, actor_id):
+            return
+        latest = (
+            db.query(ActivityEvent.id, ActivityEvent.created_at)
+            .filter(ActivityEvent.actor_id == actor_id)
+            .order_by(ActivityEvent.created_at.desc(), ActivityEvent.id.desc())
+            .limit(settings.FEED_FOLLOW_BACKFILL)
+            .all()
+        )
+        if latest:
+            _insert_inbox_rows(db, [
+                {"owner_id": owner_id, "event_id": event_id, "actor_id": actor_id, "created_at": created_at}
+                for event_id, created_at in latest
+            ])
+            db.commit()
+    except Exception as e:
+        print("Feed backfill failed:", e)
+    finally:
+        db.close()
+
+
+def trim_inboxes(db: Session) -> int:
+    """Keep only the newest FEED_INBOX_MAX_ITEMS entries per inbox"""
+    ranked = select(
+        FeedInboxEntry.owner_id,
+        FeedInboxEntry.event_id,
+        func.row_number().over(
+            partition_by=FeedInboxEntry.owner_id,
+            order_by=(FeedInboxEntry.created_at.desc(), FeedInboxEntry.event_id.desc()),
+        ).label("rn"),
+    ).subquery()
+    overflow = select(ranked.c.owner_id, ranked.c.event_id).where(ranked.c.rn > settings.FEED_INBOX_MAX_ITEMS)
+    result = db.execute(
+        delete(FeedInboxEntry).where(tuple_(FeedInboxEntry.owner_id, FeedInboxEntry.event_id).in_(overflow))
+    )
+    db.commit()
+    return result.rowcount
+
+
+async def run_feed_trim_loop():
+    """Bound inbox sizes on a schedule (started on app startup)"""
+    while True:
+        await asyncio.sleep(settings.FEED_TRIM_INTERVAL_SECONDS)
+        db = SessionLocal()
+        try:
+            await asyncio.to_thread(trim_inboxes, db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print("Feed inbox trim failed:", e)
+        finally:
+            db.close()
+
+
+# ------------------------------------------------------
+# Read side
+# ------------------------------------------------------
+_high_fanout_cache: Tuple[float, List[int]] = (0.0, [])
+
+
+def high_fanout_user_ids(db: Session) -> List[int]:
+    """Users above the fan-out threshold (a short list, cached for a minute)"""
+    global _high_fanout_cache
+    loaded_at, ids = _high_fanout_cache
+    if not loaded_at or time.monotonic() - loaded_at > 60:
+        ids = [
+            uid for (uid,) in db.query(User.id).filter(User.followers_count > settings.FEED_FANOUT_MAX_FOLLOWERS)
+        ]
+        _high_fanout_cache = (time.monotonic(), ids)
+    return ids
+
+
+def _followed_high_fanout(db: Session, owner_id: int) -> List[int]:
+    candidates = high_fanout_user_ids(db)
+    if not candidates:
+        return []
+    graph = get_social_graph()
+    if graph.built:
+        return [uid for uid in candidates if graph.is_following(owner_id, uid)]
+    return [
+        uid for (uid,) in db.query(Follow.following_id).filter(
+            Follow.follower_id == owner_id, Follow.following_id.in_(candidates)
+        )
+    ]
+
+
+def read_feed(db: Session, owner_id: int, limit: int, cursor: Optional[str]) -> Tuple[List[dict], Optional[str]]:
+    """One page of the owner's feed, newest first, plus the next cursor"""
+    inbox = apply_keyset(
+        db.query(ActivityEvent)
+        .join(FeedInboxEntry, FeedInboxEntry.event_id == ActivityEvent.id)
+        .filter(FeedInboxEntry.owner_id == owner_id),
+        FeedInboxEntry.created_at,
+        FeedInboxEntry.event_id,
+        cursor,
+    )
+    events = inbox.limit(limit + 1).all()
+
+    pulled_actors = _followed_high_fanout(db, owner_id)
+    if pulled_actors:
+        pulled = apply_keyset(
+            db.query(ActivityEvent).filter(ActivityEvent.actor_id.in_(pulled_actors)),
+            ActivityEvent.created_at,
+            ActivityEvent.id,
+            cursor,
+        )
+        by_id = {event.id: event for event in events}
+        by_id.update({event.id: event for event in pulled.limit(limit + 1).all()})
+        events = sorted(by_id.values(), key=lambda e: (e.created_at, e.id), reverse=True)
+
+    next_cursor = None
+    if len(events) > limit:
+        events = events[:limit]
+        next_cursor = encode_cursor(events[-1].created_at, events[-1].id)
+    return _hydrate(db, events), next_cursor
+
+
+def _hydrate(db: Session, events: List[ActivityEvent]) -> List[dict]:
+    """Attach actor, target user and movie details with one query each"""
+    if not events:
+        return []
+    user_ids = {e.actor_id for e in events} | {e.target_user_id for e in events if e.target_user_id}
+    users: Dict[int, User] = {u.id: u for u in db.query(User).filter(User.id.in_(user_ids))}
+    tmdb_ids = {e.movie_id for e in events if e.movie_id}
+    movies: Dict[int, Movie] = (
+        {m.tmdb_id: m for m in db.query(Movie).filter(Movie.tmdb_id.in_(tmdb_ids))} if tmdb_ids else {}
+    )
+
+    def user_summary(user_id: Optional[int]) -> Optional[dict]:
+        user = users.get(user_id)
+        if user is None:
+            return None
+        return {"id": user.id, "display_name": user.display_name, "avatar": user.avatar}
+
+    items = []
+    for event in events:
+        movie = movies.get(event.movie_id)
+        items.append({
+            "id": event.id,
+            "verb": event.verb,
+            "actor": user_summary(event.actor_id),
+            "target_user": user_summary(event.target_user_id),
+            "tmdb_id": event.movie_id,
+            "movie_title": movie.title if movie else None,
+            "poster_path": movie.poster_path if movie else None,
+            "list_kind": event.list_kind,
+            "rating": event.rating,
+            "review_id": event.review_id,
+            "created_at": event.created_at,
+        })
+    return items
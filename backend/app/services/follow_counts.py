@@ -0,0 +1,82 @@
+# app/services/follow_counts.py
+from typing import List, Optional, Tuple
+
+from sqlalchemy import func, or_, select
+from sqlalchemy.orm import Session
+
+from app.models.follow import Follow
+from app.models.user import User
+
+
+def apply_follow_change(db: Session, follower_id: int, following_id: int, delta: int):
+    """
+    Move the denormalized counters for one follow (+1) or unfollow (-1).
+    Column += delta updates, committed by the caller together with the
+    follows row, so concurrent follows never lose a count.
+    """
+    db.query(User).filter(User.id == follower_id).update(
+        {User.following_count: User.following_count + delta}, synchronize_session=False
+    )
+    db.query(User).filter(User.id == following_id).update(
+        {User.followers_count: User.followers_count + delta}, synchronize_session=False
+    )
+
+
+def remove_user_follows(db: Session, user_id: int) -> List[Tuple[int, int]]:
+    """
+    Delete every follow to or from a user that is about to be deleted (the
+    foreign keys do not cascade), moving the other side's counters. The
+    caller commits. Returns the removed (follower_id, following_id) pairs.
+    """
+    involved = or_(Follow.follower_id == user_id, Follow.following_id == user_id)
+    edges = db.query(Follow.follower_id, Follow.following_id).filter(involved).all()
+    followed = [following_id for follower_id, following_id in edges if follower_id == user_id]
+    followers = [follower_id for follower_id, following_id in edges if following_id == user_id]
+    if followed:
+        db.query(User).filter(User.id.in_(followed)).update(
+            {User.followers_count: User.followers_count - 1}, synchronize_session=False
+        )
+    if followers:
+        db.query(User).filter(User.id.in_(followers)).update(
+            {User.following_count: User.following_count - 1}, synchronize_session=False
+        )
+    db.query(Follow).filter(involved).delete(synchronize_session=False)
+    return [tuple(edge) for edge in edges]
+
+
+def reconcile_follow_counts(db: Session, user_id: Optional[int] = None) -> int:
+    """
+    Recount followers/following from the follows table and fix any users
+    whose counters drifted (all users, or just one). Returns rows repaired.
+    """
+    followers = (
+        select(func.count(Follow.id)).where(Follow.following_id == User.id).correlate(User).scalar_subquery()
+    )
+    following = (
+        select(func.count(Follow.id)).where(Follow.follower_id == User.id).correlate(User).scalar_subquery()
+    )
+    query = db.query(User).filter(
+        or_(User.followers_count != followers, User.following_count != following)
+    )
+    if user_id is not None:
+        query = query.filter(User.id == user_id)
+    repaired = query.update(
+        {User.followers_count: followers, User.following_count: following},
+        synchronize_session=False,
+    )
+    db.commit()
+    return repaired
+
+
+if __name__ == "__main__":
+    # Drift repair: python -m app.services.follow_counts [user_id]
+    import sys
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        count = reconcile_follow_counts(db, int(sys.argv[1]) if len(sys.argv) > 1 else None)
+        print(f"Repaired follow counts for {count} users")
+    finally:
+        db.close()
@@ -0,0 +1,246 @@
+# app/services/follow_suggestions.py
+"""
+"Who to follow" suggestions.
+
+Candidates are ranked by how many of the people you follow already follow
+them (friends-of-friends, from the social graph) plus how much your
+watchlist/favorites/watched lists and reviews overlap with theirs (Jaccard
+over TMDB ids, from an in-memory taste index). Results are cached per
+user with a TTL (a short one until the taste index is built). Follows
+and list/review changes only mark the affected users dirty, and a
+background pass recomputes just those users, so there is never a full
+recompute.
+"""
+import asyncio
+import threading
+import time
+from collections import Counter
+from itertools import chain
+from typing import Dict, List, Optional, Set, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.follow import Follow
+from app.models.list_item import ListItem
+from app.models.movie import Movie
+from app.models.review import Review
+from app.models.user import User
+from app.services.social_graph import get_social_graph
+
+
+class TasteIndex:
+    """user -> set of TMDB ids they listed or reviewed, and the inverse"""
+
+    def __init__(self):
+        self._movies_by_user: Dict[int, Set[int]] = {}
+        self._users_by_movie: Dict[int, Set[int]] = {}
+        self._lock = threading.Lock()
+        self.built = False
+
+    def build(self, db: Session):
+        movies_by_user: Dict[int, Set[int]] = {}
+        users_by_movie: Dict[int, Set[int]] = {}
+        listed = db.query(ListItem.user_id, Movie.tmdb_id).join(Movie, ListItem.movie_id == Movie.id)
+        reviewed = db.query(Review.user_id, Review.movie_id)
+        for user_id, tmdb_id in chain(
+            listed.execution_options(stream_results=True, yield_per=10000),
+            reviewed.execution_options(stream_results=True, yield_per=10000),
+        ):
+            if tmdb_id is None:
+                continue
+            movies_by_user.setdefault(user_id, set()).add(tmdb_id)
+            users_by_movie.setdefault(tmdb_id, set()).add(user_id)
+        with self._lock:
+            self._movies_by_user = movies_by_user
+            self._users_by_movie = users_by_movie
+            self.built = True
+
+    def add(self, user_id: int, tmdb_id: int):
+        with self._lock:
+            if self.built:
+                self._movies_by_user.setdefault(user_id, set()).add(tmdb_id)
+                self._users_by_movie.setdefault(tmdb_id, set()).add(user_id)
+
+    def movies(self, user_id: int) -> Set[int]:
+        return self._movies_by_user.get(user_id, set())
+
+    def overlap(self, user_id: int) -> Dict[int, float]:
+        """Jaccard similarity with every user sharing at least one movie"""
+        with self._lock:
+            mine = self._movies_by_user.get(user_id)
+            if not mine:
+                return {}
+            audience_cap = settings.SUGGESTIONS_MAX_MOVIE_AUDIENCE
+            shared = Counter(chain.from_iterable(
+                users
+                for users in (self._users_by_movie.get(tmdb_id, ()) for tmdb_id in mine)
+                # Blockbusters everyone lists say little about taste
+                if len(users) <= audience_cap
+            ))
+            shared.pop(user_id, None)
+            return {
+                other: count / (len(mine) + len(self._movies_by_user[other]) - count)
+                for other, count in shared.items()
+            }
+
+
+taste_index = TasteIndex()
+
+
+def get_taste_index() -> TasteIndex:
+    return taste_index
+
+
+# ------------------------------------------------------
+# Scoring
+# ------------------------------------------------------
+def _friends_of_friends(db: Session, user_id: int) -> Tuple[Counter, Set[int]]:
+    """(candidate -> number of people you follow who follow them, ids you follow)"""
+    graph = get_social_graph()
+    if graph.built:
+        following = graph.following(user_id)
+        counts = Counter(chain.from_iterable(graph.following(f) for f in following))
+        return counts, set(following)
+
+    second = aliased(Follow)
+    rows = (
+        db.query(second.following_id, func.count(second.id))
+        .join(Follow, second.follower_id == Follow.following_id)
+        .filter(Follow.follower_id == user_id)
+        .group_by(second.following_id)
+        .all()
+    )
+    following = {fid for (fid,) in db.query(Follow.following_id).filter(Follow.follower_id == user_id)}
+    return Counter(dict(rows)), following
+
+
+def compute_suggestions(db: Session, user_id: int, limit: int) -> List[dict]:
+    fof, following = _friends_of_friends(db, user_id)
+    taste = get_taste_index().overlap(user_id)
+
+    fof_weight = settings.SUGGESTIONS_FOF_WEIGHT
+    taste_weight = settings.SUGGESTIONS_TASTE_WEIGHT
+    scores: Dict[int, float] = {}
+    for candidate, count in fof.items():
+        scores[candidate] = fof_weight * count
+    for candidate, similarity in taste.items():
+        scores[candidate] = scores.get(candidate, 0.0) + taste_weight * similarity
+    for excluded in following | {user_id}:
+        scores.pop(excluded, None)
+
+    # Deactivated accounts are dropped a page at a time, so this is
+    # usually a single query over `limit` ids
+    candidates = sorted(scores.items(), key=lambda item: (-item[1], item[0]))
+    ranked: List[Tuple[int, float]] = []
+    for start in range(0, len(candidates), limit):
+        page = candidates[start:start + limit]
+        active = {
+            uid for (uid,) in db.query(User.id).filter(
+                User.id.in_([candidate for candidate, _ in page]), User.is_active == True
+            )
+        }
+        ranked.extend(item for item in page if item[0] in active)
+        if len(ranked) >= limit:
+            break
+    ranked = ranked[:limit]
+    return [
+        {
+            "user_id": candidate,
+            "score": round(score, 4),
+            "mutual_follows": fof.get(candidate, 0),
+            "taste_similarity": round(taste.get(candidate, 0.0), 4),
+        }
+        for candidate, score in ranked
+    ]
+
+
+# ------------------------------------------------------
+# Per-user cache with incremental refresh
+# ------------------------------------------------------
+class SuggestionCache:
+    def __init__(self):
+        # user -> (expires at, suggestions)
+        self._entries: Dict[int, Tuple[float, List[dict]]] = {}
+        self._dirty: Set[int] = set()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, db: Session, user_id: int) -> List[dict]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(user_id)
+            fresh = entry is not None and user_id not in self._dirty and now < entry[0]
+            if fresh:
+                self.hits += 1
+                return entry[1]
+            self.misses += 1
+        return self._refresh(db, user_id)
+
+    def mark_dirty(self, *user_ids: int):
+        """Only users that have asked for suggestions are worth recomputing"""
+        with self._lock:
+            self._dirty.update(uid for uid in user_ids if uid in self._entries)
+
+    def refresh_dirty(self, db: Session, max_users: int) -> int:
+        with self._lock:
+            batch = [self._dirty.pop() for _ in range(min(max_users, len(self._dirty)))]
+        for user_id in batch:
+            self._refresh(db, user_id)
+        return len(batch)
+
+    def _refresh(self, db: Session, user_id: int) -> List[dict]:
+        # Without the taste index only friends-of-friends count, so don't keep that for long
+        ttl = (
+            settings.SUGGESTIONS_CACHE_TTL_SECONDS if get_taste_index().built
+            else settings.SUGGESTIONS_WARMUP_CACHE_TTL_SECONDS
+        )
+        suggestions = compute_suggestions(db, user_id, settings.SUGGESTIONS_CACHE_SIZE)
+        with self._lock:
+            self._entries[user_id] = (time.monotonic() + ttl, suggestions)
+            self._dirty.discard(user_id)
+        return suggestions
+
+    def metrics(self) -> dict:
+        return {"users": len(self._entries), "dirty": len(self._dirty), "hits": self.hits, "misses": self.misses}
+
+
+suggestion_cache = SuggestionCache()
+
+
+def get_suggestion_cache() -> SuggestionCache:
+    return suggestion_cache
+
+
+def note_follow_change(follower_id: int):
+    """The follower's friends-of-friends changed, and so did their followers'"""
+    get_suggestion_cache().mark_dirty(follower_id, *get_social_graph().followers(follower_id))
+
+
+def note_taste_change(user_id: int, tmdb_id: Optional[int] = None):
+    if tmdb_id is not None:
+        get_taste_index().add(user_id, tmdb_id)
+    get_suggestion_cache().mark_dirty(user_id)
+
+
+async def run_suggestions_loop():
+    """Build the taste index, then keep recomputing dirty users (started on app startup)"""
+    rebuild_at = 0.0
+    while True:
+        db = SessionLocal()
+        try:
+            if time.monotonic() >= rebuild_at:
+                # Periodic rebuild also drops list removals, which are not applied incrementally
+                await asyncio.to_thread(get_taste_index().build, db)
+                rebuild_at = time.monotonic() + settings.SUGGESTIONS_TASTE_REBUILD_INTERVAL_SECONDS
+            await asyncio.to_thread(get_suggestion_cache().refresh_dirty, db, settings.SUGGESTIONS_REFRESH_BATCH)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print("Follow suggestions refresh failed:", e)
+        finally:
+            db.close()
+        await asyncio.sleep(settings.SUGGESTIONS_REFRESH_INTERVAL_SECONDS)
@@ -0,0 +1,49 @@
+# app/services/invalidation.py
+"""
+Pluggable fan-out of change messages to every worker process, used by the
+in-memory indexes (recent reviews buffer, social graph) to stay in step.
+"""
+import importlib
+from abc import ABC, abstractmethod
+from typing import Callable, List
+
+
+class InvalidationBackend(ABC):
+    """
+    Carries index changes between workers. A backend delivers every
+    published message to every subscribed handler, including the ones in
+    the publishing process.
+    """
+
+    @abstractmethod
+    def publish(self, message: dict):
+        ...
+
+    @abstractmethod
+    def subscribe(self, handler: Callable[[dict], None]):
+        ...
+
+    def close(self):
+        pass
+
+
+class LocalInvalidationBackend(InvalidationBackend):
+    """In-process delivery; enough for a single worker and for development"""
+
+    def __init__(self):
+        self._handlers: List[Callable[[dict], None]] = []
+
+    def publish(self, message: dict):
+        for handler in list(self._handlers):
+            handler(message)
+
+    def subscribe(self, handler: Callable[[dict], None]):
+        self._handlers.append(handler)
+
+
+def load_invalidation_backend(spec: str) -> InvalidationBackend:
+    """'local' or a 'package.module:ClassName' path to an InvalidationBackend"""
+    if not spec or spec == "local":
+        return LocalInvalidationBackend()
+    module_name, _, class_name = spec.partition(":")
+    return getattr(importlib.import_module(module_name), class_name)()
@@ -0,0 +1,186 @@
+# app/services/movie_hydration.py
+import asyncio
+import json
+import time
+from datetime import datetime, timedelta, timezone
+from typing import Collection, Dict, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import or_
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.movie import Movie
+from app.services.rate_limiter import PRIORITY_LOW
+
+# Movies whose last fetch failed transiently: id -> (attempts, monotonic time of the next try)
+_retries: Dict[int, Tuple[int, float]] = {}
+
+
+def movie_fields_from_tmdb(details: dict) -> dict:
+    """Map a TMDB /movie/{id} payload onto Movie columns"""
+    release_date = details.get("release_date") or ""
+    release_year = int(release_date[:4]) if release_date[:4].isdigit() else None
+    return {
+        "title": details.get("title") or details.get("original_title"),
+        "release_year": release_year,
+        "genres": [g["name"] for g in details.get("genres") or [] if g.get("name")],
+        "runtime": details.get("runtime"),
+        "poster_path": details.get("poster_path"),
+        "popularity": details.get("popularity"),
+    }
+
+
+def load_fixtures(path: str) -> Dict[int, dict]:
+    """Load offline TMDB details keyed by tmdb_id from a JSON file"""
+    with open(path, "r", encoding="utf-8") as f:
+        raw = json.load(f)
+    if isinstance(raw, list):
+        return {int(item["id"]): item for item in raw}
+    return {int(k): v for k, v in raw.items()}
+
+
+def select_movies_to_hydrate(
+    db: Session, limit: int, stale_after: timedelta, exclude: Collection[int] = ()
+) -> List[Tuple[int, int, Optional[str]]]:
+    """(id, tmdb_id, title) of never-hydrated rows first, then the rows with the oldest metadata"""
+    cutoff = datetime.now(timezone.utc) - stale_after
+    query = db.query(Movie.id, Movie.tmdb_id, Movie.title).filter(
+        Movie.tmdb_id.isnot(None),
+        or_(Movie.hydrated_at.is_(None), Movie.hydrated_at < cutoff),
+    )
+    if exclude:
+        query = query.filter(Movie.id.notin_(exclude))
+    return [tuple(row) for row in query.order_by(Movie.hydrated_at.isnot(None), Movie.hydrated_at).limit(limit)]
+
+
+# Each worker-thread call opens its own session; a Session is not thread-safe
+def _select_batch(limit: int, stale_after: timedelta, exclude: Collection[int]):
+    db = SessionLocal()
+    try:
+        return select_movies_to_hydrate(db, limit, stale_after, exclude)
+    finally:
+        db.close()
+
+
+def _write_updates(updates: List[dict]):
+    db = SessionLocal()
+    try:
+        db.bulk_update_mappings(Movie, updates)
+        db.commit()
+    finally:
+        db.close()
+
+
+def _note_failure(movie_id: int, now: datetime, updates: List[dict]):
+    """
+    Back off exponentially before retrying a transient failure. After
+    MOVIE_HYDRATION_MAX_ATTEMPTS the attempt is recorded as hydrated_at,
+    which moves the row to the back of the queue until it goes stale.
+    """
+    attempts = _retries.get(movie_id, (0, 0.0))[0] + 1
+    if attempts >= settings.MOVIE_HYDRATION_MAX_ATTEMPTS:
+        _retries.pop(movie_id, None)
+        updates.append({"id": movie_id, "hydrated_at": now})
+        return
+    delay = settings.MOVIE_HYDRATION_RETRY_BASE_SECONDS * 2 ** (attempts - 1)
+    _retries[movie_id] = (attempts, time.monotonic() + delay)
+
+
+async def _fetch_details(tmdb_ids: List[int], fixtures: Optional[Dict[int, dict]]) -> Dict[int, Optional[dict]]:
+    """
+    Details keyed by tmdb_id. A value of None means the movie is
+    permanently unavailable (missing fixture, TMDB 404); ids that failed
+    transiently are left out so they are retried on the next run.
+    """
+    if fixtures is not None:
+        return {tid: fixtures.get(tid) for tid in tmdb_ids}
+
+    # Imported lazily: the proxy router pulls in the HTTP stack
+    from app.routers.tmdb_proxy import fetch_movie_details
+
+    semaphore = asyncio.Semaphore(settings.TMDB_BATCH_CONCURRENCY)
+
+    async def fetch_one(tid: int):
+        async with semaphore:
+            try:
+                return tid, await fetch_movie_details(tid, PRIORITY_LOW)
+            except HTTPException as e:
+                return tid, None if e.status_code == 404 else e
+
+    fetched = await asyncio.gather(*[fetch_one(tid) for tid in tmdb_ids])
+    return {tid: details for tid, details in fetched if not isinstance(details, Exception)}
+
+
+async def hydrate_movies(
+    limit: Optional[int] = None,
+    stale_after: Optional[timedelta] = None,
+    fixtures: Optional[Dict[int, dict]] = None,
+) -> int:
+    """
+    Fill in TMDB metadata for placeholder or stale Movie rows.
+    Returns the number of rows updated (written in one batch). Rows still
+    backing off after a transient failure are skipped.
+    """
+    limit = limit or settings.MOVIE_HYDRATION_BATCH_SIZE
+    stale_after = stale_after or timedelta(hours=settings.MOVIE_HYDRATION_STALE_HOURS)
+
+    waiting = [movie_id for movie_id, (_, retry_at) in _retries.items() if retry_at > time.monotonic()]
+    movies = await asyncio.to_thread(_select_batch, limit, stale_after, waiting)
+    if not movies:
+        return 0
+
+    details_by_id = await _fetch_details([tmdb_id for _, tmdb_id, _ in movies], fixtures)
+    now = datetime.now(timezone.utc)
+    updates = []
+    for movie_id, tmdb_id, title in movies:
+        if tmdb_id not in details_by_id:
+            _note_failure(movie_id, now, updates)
+            continue
+        _retries.pop(movie_id, None)
+        details = details_by_id[tmdb_id]
+        if details is None:
+            # Nothing to mirror; only record the attempt so the row is not retried until stale
+            updates.append({"id": movie_id, "hydrated_at": now})
+            continue
+        fields = movie_fields_from_tmdb(details)
+        if not fields["title"]:
+            fields["title"] = title
+        updates.append({"id": movie_id, "hydrated_at": now, **fields})
+
+    if updates:
+        await asyncio.to_thread(_write_updates, updates)
+    return len(updates)
+
+
+async def run_hydration_loop():
+    """Periodically hydrate movies in the background (started on app startup)"""
+    fixtures = load_fixtures(settings.MOVIE_FIXTURES_PATH) if settings.MOVIE_FIXTURES_PATH else None
+    while True:
+        try:
+            # Keep draining full batches before sleeping
+            while await hydrate_movies(fixtures=fixtures) >= settings.MOVIE_HYDRATION_BATCH_SIZE:
+                pass
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print("Movie hydration failed:", e)
+        await asyncio.sleep(settings.MOVIE_HYDRATION_INTERVAL_SECONDS)
+
+
+if __name__ == "__main__":
+    # One-off run: python -m app.services.movie_hydration [fixtures.json]
+    import sys
+
+    async def main():
+        fixtures = load_fixtures(sys.argv[1]) if len(sys.argv) > 1 else None
+        total = 0
+        while True:
+            updated = await hydrate_movies(fixtures=fixtures)
+            total += updated
+            if updated < settings.MOVIE_HYDRATION_BATCH_SIZE:
+                break
+        print(f"Hydrated {total} movies")
+
+    asyncio.run(main())
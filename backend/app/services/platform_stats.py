@@ -0,0 +1,138 @@
+# app/services/platform_stats.py
+"""
+Platform-wide totals and per-user distributions for comparisons.
+
+Totals live in platform_stats and are moved by the write paths with
+`total = total + delta` in the caller's transaction, so reads never count
+tables. A periodic refresh recomputes everything from grouped counts. That
+corrects any drift, such as rows removed by cascades, and rebuilds the
+per-user histograms that users are ranked against. Histograms have one
+entry per distinct value, so they stay small however many users there
+are.
+"""
+import asyncio
+import bisect
+from datetime import datetime, timezone
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.list_item import ListItem
+from app.models.platform_stats import PlatformStat
+from app.models.user import User
+
+METRIC_USERS = "users"
+METRIC_WATCHLIST = "watchlist"
+METRIC_FAVORITES = "favorites"
+METRIC_FOLLOWERS = "followers"
+METRIC_FOLLOWING = "following"
+LIST_METRICS = (METRIC_WATCHLIST, METRIC_FAVORITES)
+PERCENTILES = (25, 50, 75, 90, 99)
+
+
+def record_stat_change(db: Session, delta: int, *metrics: str):
+    """
+    Move the running totals; the caller commits with the change itself.
+    Rows appear on the first refresh, so until then this is a no-op.
+    """
+    if not delta or not metrics:
+        return
+    db.query(PlatformStat).filter(PlatformStat.metric.in_(metrics)).update(
+        {PlatformStat.total: PlatformStat.total + delta}, synchronize_session=False
+    )
+
+
+# ------------------------------------------------------
+# Distributions
+# ------------------------------------------------------
+def _percentiles(histogram: List[Tuple[int, int]], users: int) -> Dict[str, int]:
+    """Nearest-rank percentiles of a sorted [(value, users)] histogram"""
+    if not users:
+        return {f"p{p}": 0 for p in PERCENTILES}
+    cumulative, result = 0, {}
+    points = iter(PERCENTILES)
+    p = next(points)
+    for value, count in histogram:
+        cumulative += count
+        while p is not None and cumulative >= users * p / 100:
+            result[f"p{p}"] = value
+            p = next(points, None)
+        if p is None:
+            break
+    return result
+
+
+def percentile_rank(stat: Optional[PlatformStat], value: int) -> Optional[float]:
+    """Share of users below `value`, counting ties as half (0-100)"""
+    if stat is None or not stat.distribution or not stat.user_count:
+        return None
+    values = [v for v, _ in stat.distribution]
+    position = bisect.bisect_left(values, value)
+    below = sum(count for _, count in stat.distribution[:position])
+    equal = stat.distribution[position][1] if position < len(values) and values[position] == value else 0
+    return round(100 * (below + equal / 2) / stat.user_count, 1)
+
+
+def _histogram(rows: Iterable[Tuple[int, int]], users: int) -> List[Tuple[int, int]]:
+    """Complete a histogram of non-zero values with the users that have none"""
+    counts = {int(value or 0): int(count) for value, count in rows}
+    zeros = users - sum(count for value, count in counts.items() if value)
+    counts[0] = max(zeros, 0)
+    return sorted((value, count) for value, count in counts.items() if count)
+
+
+def refresh_platform_stats(db: Session):
+    """Recompute every total and histogram from grouped counts (a handful of queries)"""
+    users = db.query(func.count(User.id)).scalar() or 0
+    histograms: Dict[str, List[Tuple[int, int]]] = {}
+
+    for kind in LIST_METRICS:
+        per_user = (
+            db.query(func.count(ListItem.id).label("n"))
+            .filter(ListItem.kind == kind)
+            .group_by(ListItem.user_id)
+            .subquery()
+        )
+        histograms[kind] = _histogram(db.query(per_user.c.n, func.count()).group_by(per_user.c.n).all(), users)
+    for metric, column in ((METRIC_FOLLOWERS, User.followers_count), (METRIC_FOLLOWING, User.following_count)):
+        histograms[metric] = _histogram(db.query(column, func.count()).group_by(column).all(), users)
+
+    now = datetime.now(timezone.utc)
+    db.merge(PlatformStat(metric=METRIC_USERS, total=users, user_count=users, refreshed_at=now))
+    for metric, histogram in histograms.items():
+        db.merge(PlatformStat(
+            metric=metric,
+            total=sum(value * count for value, count in histogram),
+            user_count=users,
+            distribution=[list(entry) for entry in histogram],
+            percentiles=_percentiles(histogram, users),
+            refreshed_at=now,
+        ))
+    db.commit()
+
+
+def load_platform_stats(db: Session) -> Dict[str, PlatformStat]:
+    """The snapshot rows by metric, refreshing first if there are none yet"""
+    stats = {stat.metric: stat for stat in db.query(PlatformStat).all()}
+    if METRIC_USERS not in stats:
+        refresh_platform_stats(db)
+        stats = {stat.metric: stat for stat in db.query(PlatformStat).all()}
+    return stats
+
+
+async def run_platform_stats_loop():
+    """Refresh the snapshot on startup and then on a schedule"""
+    while True:
+        db = SessionLocal()
+        try:
+            await asyncio.to_thread(refresh_platform_stats, db)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print("Platform stats refresh failed:", e)
+        finally:
+            db.close()
+        await asyncio.sleep(settings.PLATFORM_STATS_REFRESH_INTERVAL_SECONDS)
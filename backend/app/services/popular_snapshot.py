@@ -0,0 +1,150 @@
+# app/services/popular_snapshot.py
+import asyncio
+import hashlib
+import json
+import os
+import time
+from pathlib import Path
+from typing import Dict, Optional, Tuple
+
+from fastapi import HTTPException
+
+from app.config import settings
+from app.services.rate_limiter import PRIORITY_LOW
+
+# Snapshot lists and the TMDB path each one is built from
+SNAPSHOT_SOURCES = {
+    "popular": "/movie/popular",
+    "trending": "/trending/movie/week",
+}
+
+
+class SnapshotPage:
+    __slots__ = ("body", "etag")
+
+    def __init__(self, body: bytes):
+        self.body = body
+        self.etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+
+
+class PopularSnapshot:
+    """
+    Versioned, pre-serialized copy of the first K pages of the popular and
+    trending lists. Pages are stored as ready-to-send JSON bytes with an
+    ETag, so serving them is a dictionary lookup. A refresh builds a new
+    page map and swaps it in whole, and optionally persists it to disk so
+    restarts serve immediately.
+    """
+
+    def __init__(self, path: Optional[str] = None):
+        path = path if path is not None else settings.POPULAR_SNAPSHOT_PATH
+        self.path = Path(path) if path else None
+        self.version = 0
+        self.built_at: Optional[float] = None
+        self._pages: Dict[Tuple[str, int], SnapshotPage] = {}
+
+    def get(self, list_name: str, page: int) -> Optional[SnapshotPage]:
+        return self._pages.get((list_name, page))
+
+    def is_stale(self) -> bool:
+        if self.built_at is None:
+            return True
+        return time.time() - self.built_at > settings.POPULAR_SNAPSHOT_MAX_AGE_SECONDS
+
+    def swap(self, pages: Dict[Tuple[str, int], bytes], version: int, built_at: float):
+        self._pages = {key: SnapshotPage(body) for key, body in pages.items()}
+        self.version = version
+        self.built_at = built_at
+
+    async def refresh(self) -> int:
+        """Pull the first K pages of every list from TMDB and swap them in"""
+        # Imported lazily: the proxy router pulls in the HTTP stack
+        from app.routers.tmdb_proxy import fetch_tmdb
+
+        semaphore = asyncio.Semaphore(settings.TMDB_BATCH_CONCURRENCY)
+
+        async def fetch_page(list_name: str, page: int):
+            async with semaphore:
+                data = await fetch_tmdb(
+                    SNAPSHOT_SOURCES[list_name],
+                    {"page": page},
+                    timeout=settings.TMDB_POPULAR_TIMEOUT,
+                    priority=PRIORITY_LOW,
+                )
+            return (list_name, page), json.dumps(data, separators=(",", ":")).encode("utf-8")
+
+        fetched = await asyncio.gather(*[
+            fetch_page(list_name, page)
+            for list_name in SNAPSHOT_SOURCES
+            for page in range(1, settings.POPULAR_SNAPSHOT_PAGES + 1)
+        ])
+        self.swap(dict(fetched), self.version + 1, time.time())
+        if self.path:
+            await asyncio.to_thread(self.save)
+        return self.version
+
+    def save(self):
+        """Persist the snapshot as one JSON file (atomic replace)"""
+        record = {
+            "version": self.version,
+            "built_at": self.built_at,
+            "pages": [
+                {"list": list_name, "page": page, "body": snapshot_page.body.decode("utf-8")}
+                for (list_name, page), snapshot_page in self._pages.items()
+            ],
+        }
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = self.path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(record, f, separators=(",", ":"))
+        os.replace(tmp_path, self.path)
+
+    def load(self) -> bool:
+        """Load a previously saved snapshot; returns False if none is usable"""
+        if not self.path or not self.path.exists():
+            return False
+        try:
+            with open(self.path, "r", encoding="utf-8") as f:
+                record = json.load(f)
+            pages = {
+                (item["list"], int(item["page"])): item["body"].encode("utf-8")
+                for item in record["pages"]
+            }
+        except (OSError, ValueError, KeyError):
+            return False
+        self.swap(pages, int(record["version"]), float(record["built_at"]))
+        return True
+
+    def metrics(self) -> dict:
+        return {
+            "version": self.version,
+            "built_at": self.built_at,
+            "pages": len(self._pages),
+            "stale": self.is_stale(),
+        }
+
+
+popular_snapshot = PopularSnapshot()
+
+
+def get_popular_snapshot() -> PopularSnapshot:
+    return popular_snapshot
+
+
+async def run_snapshot_loop():
+    """Refresh the snapshot on a schedule (started on app startup)"""
+    snapshot = get_popular_snapshot()
+    if snapshot.load() and not snapshot.is_stale():
+        # A recent snapshot survived the restart; refresh on its normal schedule
+        elapsed = time.time() - snapshot.built_at
+        await asyncio.sleep(max(0.0, settings.POPULAR_SNAPSHOT_INTERVAL_SECONDS - elapsed))
+    while True:
+        try:
+            await snapshot.refresh()
+        except asyncio.CancelledError:
+            raise
+        except HTTPException as e:
+            print("Popular snapshot refresh failed:", e.detail)
+        except Exception as e:
+            print("Popular snapshot refresh failed:", e)
+        await asyncio.sleep(settings.POPULAR_SNAPSHOT_INTERVAL_SECONDS)
@@ -0,0 +1,130 @@
+# app/services/rate_limiter.py
+import asyncio
+import heapq
+import itertools
+import time
+from typing import List, Optional, Tuple
+
+from app.config import settings
+
+# Priority lanes (lower value is served first)
+PRIORITY_HIGH = 0    # user-facing detail pages
+PRIORITY_NORMAL = 1  # lists and search
+PRIORITY_LOW = 2     # background refresh / prefetch
+
+
+class TokenBucketLimiter:
+    """
+    Async token-bucket limiter shared by all outbound TMDB calls.
+
+    Callers queue by priority and are released one token at a time by a
+    single dispatcher task, so a burst of background work cannot starve
+    user-facing requests. `pause()` empties the bucket for a while, which
+    is how a Retry-After from upstream is honoured.
+    """
+
+    def __init__(self, rate: Optional[float] = None, burst: Optional[int] = None):
+        self.rate = rate or settings.TMDB_RATE_LIMIT_PER_SECOND
+        self.burst = burst or settings.TMDB_RATE_LIMIT_BURST
+        self._tokens = float(self.burst)
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0
+        self._waiters: List[Tuple[int, int, asyncio.Future]] = []
+        self._seq = itertools.count()
+        self._dispatcher: Optional[asyncio.Task] = None
+
+        # Metrics
+        self.acquired = 0
+        self.peak_queue_depth = 0
+        self.total_wait = 0.0
+        self.max_wait = 0.0
+        self.pauses = 0
+
+    @property
+    def queue_depth(self) -> int:
+        return sum(1 for _, _, fut in self._waiters if not fut.done())
+
+    async def acquire(self, priority: int = PRIORITY_NORMAL):
+        """Wait until a token is available for this priority lane"""
+        start = time.monotonic()
+        if not self._waiters and self._take_token():
+            self._record_wait(start)
+            return
+
+        fut = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._waiters, (priority, next(self._seq), fut))
+        self.peak_queue_depth = max(self.peak_queue_depth, len(self._waiters))
+        self._ensure_dispatcher()
+        await fut
+        self._record_wait(start)
+
+    def pause(self, seconds: float):
+        """Stop releasing tokens for `seconds` (e.g. upstream Retry-After)"""
+        self.pauses += 1
+        self._tokens = 0.0
+        self._blocked_until = max(self._blocked_until, time.monotonic() + seconds)
+
+    def metrics(self) -> dict:
+        return {
+            "rate_per_second": self.rate,
+            "burst": self.burst,
+            "tokens": round(self._tokens, 2),
+            "queue_depth": self.queue_depth,
+            "peak_queue_depth": self.peak_queue_depth,
+            "acquired": self.acquired,
+            "average_wait_ms": round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0,
+            "max_wait_ms": round(self.max_wait * 1000, 2),
+            "pauses": self.pauses,
+            "paused_for_s": round(max(0.0, self._blocked_until - time.monotonic()), 2),
+        }
+
+    def _refill(self):
+        now = time.monotonic()
+        if now < self._blocked_until:
+            self._last_refill = now
+            return
+        elapsed = now - max(self._last_refill, self._blocked_until)
+        self._tokens = min(float(self.burst), self._tokens + elapsed * self.rate)
+        self._last_refill = now
+
+    def _take_token(self) -> bool:
+        self._refill()
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return True
+        return False
+
+    def _record_wait(self, start: float):
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self.max_wait = max(self.max_wait, waited)
+
+    def _ensure_dispatcher(self):
+        if self._dispatcher is None or self._dispatcher.done():
+            self._dispatcher = asyncio.create_task(self._dispatch())
+
+    async def _dispatch(self):
+        while self._waiters:
+            # Drop callers that were cancelled while queued
+            while self._waiters and self._waiters[0][2].done():
+                heapq.heappop(self._waiters)
+            if not self._waiters:
+                break
+            if self._take_token():
+                _, _, fut = heapq.heappop(self._waiters)
+                fut.set_result(None)
+                continue
+            now = time.monotonic()
+            if now < self._blocked_until:
+                delay = self._blocked_until - now
+            else:
+                delay = (1 - self._tokens) / self.rate
+            await asyncio.sleep(delay)
+
+
+tmdb_rate_limiter = TokenBucketLimiter()
+
+
+def get_tmdb_rate_limiter() -> TokenBucketLimiter:
+    return tmdb_rate_limiter
@@ -0,0 +1,146 @@
+# app/services/rating_stats.py
+from typing import Dict, Iterable, Optional, Tuple
+
+from sqlalchemy import case, func
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.models.movie_rating_stats import MovieRatingAggregate, RATING_VALUES
+from app.models.review import Review
+
+
+def _ensure_row(db: Session, movie_id: int):
+    exists = db.query(MovieRatingAggregate.movie_id).filter(MovieRatingAggregate.movie_id == movie_id).first()
+    if exists:
+        return
+    try:
+        with db.begin_nested():
+            db.add(MovieRatingAggregate(
+                movie_id=movie_id,
+                review_count=0,
+                rating_sum=0,
+                **{f"rating_{i}": 0 for i in RATING_VALUES},
+            ))
+    except IntegrityError:
+        # Another transaction created the row first; the UPDATE below still applies
+        pass
+
+
+def _rating_deltas(deltas: dict, old_rating: Optional[int], new_rating: Optional[int]):
+    def bump(column, amount):
+        deltas[column] = deltas.get(column, 0) + amount
+
+    if new_rating is not None:
+        bump(f"rating_{new_rating}", 1)
+        bump("rating_sum", new_rating)
+    if old_rating is not None:
+        bump(f"rating_{old_rating}", -1)
+        bump("rating_sum", -old_rating)
+    if old_rating is None:
+        bump("review_count", 1)
+    elif new_rating is None:
+        bump("review_count", -1)
+
+
+def _apply_deltas(db: Session, movie_id: int, deltas: dict):
+    values = {
+        getattr(MovieRatingAggregate, column): getattr(MovieRatingAggregate, column) + amount
+        for column, amount in deltas.items()
+        if amount
+    }
+    if not values:
+        return
+    db.query(MovieRatingAggregate).filter(MovieRatingAggregate.movie_id == movie_id).update(
+        values, synchronize_session=False
+    )
+
+
+def record_rating_change(
+    db: Session,
+    movie_id: int,
+    old_rating: Optional[int] = None,
+    new_rating: Optional[int] = None,
+):
+    """
+    Apply a review create (new only), delete (old only) or rating change
+    (both) to the movie's aggregate row. Uses column += delta updates so
+    concurrent writers do not lose counts; the caller commits together
+    with the review change.
+    """
+    if old_rating == new_rating:
+        return
+
+    deltas = {}
+    _rating_deltas(deltas, old_rating, new_rating)
+    if old_rating is None:
+        _ensure_row(db, movie_id)
+    _apply_deltas(db, movie_id, deltas)
+
+
+def record_rating_changes(db: Session, changes: Iterable[Tuple[int, Optional[int], Optional[int]]]):
+    """
+    Batched record_rating_change for bulk writes: (movie_id, old_rating,
+    new_rating) triples are merged into one UPDATE per movie.
+    """
+    deltas_by_movie: Dict[int, dict] = {}
+    created = set()
+    for movie_id, old_rating, new_rating in changes:
+        if old_rating == new_rating:
+            continue
+        _rating_deltas(deltas_by_movie.setdefault(movie_id, {}), old_rating, new_rating)
+        if old_rating is None:
+            created.add(movie_id)
+
+    if created:
+        existing = {
+            movie_id
+            for (movie_id,) in db.query(MovieRatingAggregate.movie_id)
+            .filter(MovieRatingAggregate.movie_id.in_(created))
+            .all()
+        }
+        for movie_id in created - existing:
+            _ensure_row(db, movie_id)
+    for movie_id, deltas in deltas_by_movie.items():
+        _apply_deltas(db, movie_id, deltas)
+
+
+def rebuild_rating_stats(db: Session, movie_id: Optional[int] = None) -> int:
+    """
+    Recompute aggregates from the reviews table with one GROUP BY
+    (all movies, or just one). Used for backfill and drift repair.
+    """
+    histogram = [
+        func.sum(case((Review.rating == i, 1), else_=0)).label(f"rating_{i}")
+        for i in RATING_VALUES
+    ]
+    query = db.query(
+        Review.movie_id,
+        func.count(Review.id).label("review_count"),
+        func.coalesce(func.sum(Review.rating), 0).label("rating_sum"),
+        *histogram,
+    ).group_by(Review.movie_id)
+
+    existing = db.query(MovieRatingAggregate)
+    if movie_id is not None:
+        query = query.filter(Review.movie_id == movie_id)
+        existing = existing.filter(MovieRatingAggregate.movie_id == movie_id)
+
+    rows = [dict(row._mapping) for row in query.all()]
+    existing.delete(synchronize_session=False)
+    db.bulk_insert_mappings(MovieRatingAggregate, rows)
+    db.commit()
+    return len(rows)
+
+
+if __name__ == "__main__":
+    # Backfill / repair: python -m app.services.rating_stats [tmdb_id]
+    import sys
+
+    from app.database import SessionLocal
+
+    db = SessionLocal()
+    try:
+        count = rebuild_rating_stats(db, int(sys.argv[1]) if len(sys.argv) > 1 else None)
+        print(f"Rebuilt rating stats for {count} movies")
+    finally:
+        db.close()
@@ -0,0 +1,208 @@
+# app/services/recent_reviews.py
+import os
+import threading
+import uuid
+from collections import deque
+from typing import Deque, List, Optional
+
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.review import Review
+from app.models.user import User
+from app.services.invalidation import InvalidationBackend, load_invalidation_backend
+
+
+def review_record(review: Review, user: User) -> dict:
+    """Denormalized ReviewResponse fields for one review"""
+    return {
+        "id": review.id,
+        "user_id": review.user_id,
+        "user_name": user.display_name,
+        "user_avatar": user.avatar,
+        "tmdb_id": review.movie_id,  # movie_id holds the tmdb_id
+        "rating": review.rating,
+        "comment": review.comment,
+        "created_at": review.created_at,
+        "updated_at": review.updated_at,
+    }
+
+
+class RecentReviewsBuffer:
+    """
+    Bounded, newest-first copy of the latest reviews (ReviewResponse
+    records), primed from the database and kept current by the review
+    write paths. Changes go out through the invalidation backend so every
+    worker applies them; a worker ignores its own messages because it has
+    already applied them. Changes that arrive while a prime is reading the
+    table are replayed onto the new records, and a reset in that window
+    discards the prime.
+    """
+
+    def __init__(self, size: Optional[int] = None, backend: Optional[InvalidationBackend] = None):
+        self.size = size or settings.RECENT_REVIEWS_BUFFER_SIZE
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._records: Deque[dict] = deque(maxlen=self.size)
+        self._lock = threading.Lock()
+        # Held by the one prime allowed to run at a time
+        self._prime_lock = threading.Lock()
+        # Changes seen while a prime is reading the table (None when not priming)
+        self._pending: Optional[List[dict]] = None
+        self._primed = False
+        # True when the buffer holds every review there is (fewer than `size` exist)
+        self._complete = False
+        self.hits = 0
+        self.misses = 0
+        self.backend = backend or load_invalidation_backend(settings.RECENT_REVIEWS_INVALIDATION_BACKEND)
+        self.backend.subscribe(self._on_message)
+
+    @property
+    def primed(self) -> bool:
+        return self._primed
+
+    def prime(self, db: Session) -> bool:
+        """Reload from the database; False if another prime is running or a reset made this one stale"""
+        if not self._prime_lock.acquire(blocking=False):
+            return False
+        try:
+            with self._lock:
+                self._pending = []
+            rows = (
+                db.query(Review, User)
+                .join(User, Review.user_id == User.id)
+                .order_by(Review.created_at.desc(), Review.id.desc())
+                .limit(self.size)
+                .all()
+            )
+            with self._lock:
+                pending, self._pending = self._pending, None
+                if pending is None:
+                    return False
+                self._records = deque((review_record(review, user) for review, user in rows), maxlen=self.size)
+                self._complete = len(rows) < self.size
+                self._primed = True
+                for message in pending:
+                    self._apply_locked(message)
+            return True
+        finally:
+            with self._lock:
+                self._pending = None
+            self._prime_lock.release()
+
+    def latest(self, limit: int) -> Optional[List[dict]]:
+        """
+        Newest `limit + 1` records (the extra one signals another page),
+        or None when the buffer cannot answer and the caller should query.
+        """
+        with self._lock:
+            if not self._primed or (limit + 1 > len(self._records) and not self._complete):
+                self.misses += 1
+                return None
+            self.hits += 1
+            return [self._records[i] for i in range(min(limit + 1, len(self._records)))]
+
+    # Write paths -------------------------------------------------------
+    def upsert(self, record: dict):
+        self._apply({"op": "upsert", "review": record})
+        self._publish({"op": "upsert", "review": record})
+
+    def remove(self, review_id: int):
+        self._apply({"op": "remove", "review_id": review_id})
+        self._publish({"op": "remove", "review_id": review_id})
+
+    def invalidate(self):
+        """Drop the buffer everywhere; each worker re-primes on its next read"""
+        self._apply({"op": "reset"})
+        self._publish({"op": "reset"})
+
+    def metrics(self) -> dict:
+        return {
+            "size": len(self._records),
+            "capacity": self.size,
+            "primed": self._primed,
+            "complete": self._complete,
+            "hits": self.hits,
+            "misses": self.misses,
+        }
+
+    def _publish(self, message: dict):
+        try:
+            self.backend.publish({**message, "origin": self.origin})
+        except Exception as e:
+            print("Recent reviews invalidation publish failed:", e)
+
+    def _on_message(self, message: dict):
+        if message.get("origin") != self.origin:
+            self._apply(message)
+
+    def _apply(self, message: dict):
+        with self._lock:
+            if message.get("op") == "reset":
+                # Rows a running prime already read may predate the reset
+                self._pending = None
+            elif self._pending is not None:
+                self._pending.append(message)
+            self._apply_locked(message)
+
+    def _apply_locked(self, message: dict):
+        op = message.get("op")
+        if op == "reset":
+            self._records.clear()
+            self._primed = False
+            self._complete = False
+            return
+        if not self._primed:
+            return
+        if op == "remove":
+            self._remove(message["review_id"])
+        elif op == "upsert":
+            self._upsert(message["review"])
+
+    def _remove(self, review_id: int):
+        for i, record in enumerate(self._records):
+            if record["id"] == review_id:
+                # The freed slot is not refilled; latest() falls back to the
+                # database if a caller needs more than is left
+                del self._records[i]
+                return
+
+    def _upsert(self, record: dict):
+        for i, existing in enumerate(self._records):
+            if existing["id"] == record["id"]:
+                self._records[i] = record
+                return
+        sort_key = (record["created_at"], record["id"])
+        if self._records and sort_key < (self._records[-1]["created_at"], self._records[-1]["id"]):
+            # Older than everything held; only belongs here if nothing was evicted
+            if self._complete and len(self._records) < self.size:
+                self._records.append(record)
+            return
+        records = list(self._records)
+        position = next(
+            (i for i, existing in enumerate(records) if sort_key > (existing["created_at"], existing["id"])),
+            len(records),
+        )
+        records.insert(position, record)
+        if len(records) > self.size:
+            self._complete = False
+        self._records = deque(records[: self.size], maxlen=self.size)
+
+
+recent_reviews_buffer = RecentReviewsBuffer()
+
+
+def get_recent_reviews_buffer() -> RecentReviewsBuffer:
+    return recent_reviews_buffer
+
+
+def prime_recent_reviews():
+    """Prime with a session of its own (on startup, and in the background after a miss)"""
+    db = SessionLocal()
+    try:
+        get_recent_reviews_buffer().prime(db)
+    except Exception as e:
+        # Served from the database until a later prime succeeds
+        print("Recent reviews buffer priming failed:", e)
+    finally:
+        db.close()
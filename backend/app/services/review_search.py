@@ -0,0 +1,223 @@
+# app/services/review_search.py
+"""
+Full-text search over review comments.
+
+On PostgreSQL this reads the generated `reviews.search_vector` tsvector
+column (GIN indexed, see app.models.review) and ranks with ts_rank_cd.
+Other databases, or a PostgreSQL schema that has not been migrated yet,
+use an in-process inverted index with BM25 ranking that is built on
+first use and kept current by the review write paths.
+"""
+import math
+import re
+import threading
+from collections import defaultdict
+from typing import Dict, List, Optional, Tuple
+
+from sqlalchemy import Float, cast, func, inspect, literal_column, tuple_
+from sqlalchemy.orm import Session
+
+from app.models.review import Review
+from app.models.user import User
+from app.utils.pagination import (
+    apply_keyset,
+    decode_rank_cursor,
+    encode_cursor,
+    encode_rank_cursor,
+)
+
+SORT_RELEVANCE = "relevance"
+SORT_RECENT = "recent"
+
+TOKEN_RE = re.compile(r"[a-z0-9]+")
+STOP_WORDS = frozenset(
+    "a an and are as at be but by for from has have i in is it its of on or so "
+    "that the this to was were will with".split()
+)
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return [t for t in TOKEN_RE.findall((text or "").lower()) if t not in STOP_WORDS]
+
+
+class InvertedIndex:
+    """
+    Term -> {review_id: term frequency} postings for review comments.
+    Queries match reviews containing every term and rank them with BM25.
+    """
+
+    K1 = 1.2
+    B = 0.75
+
+    def __init__(self):
+        self._postings: Dict[str, Dict[int, int]] = defaultdict(dict)
+        self._docs: Dict[int, Tuple[int, List[str]]] = {}  # review_id -> (movie_id, terms)
+        self._total_length = 0
+        self._lock = threading.Lock()
+        self.built = False
+
+    def build(self, db: Session):
+        rows = db.query(Review.id, Review.movie_id, Review.comment).all()
+        with self._lock:
+            self._postings.clear()
+            self._docs.clear()
+            self._total_length = 0
+            for review_id, movie_id, comment in rows:
+                self._add(review_id, movie_id, comment)
+            self.built = True
+
+    def add(self, review_id: int, movie_id: int, comment: Optional[str]):
+        with self._lock:
+            if self.built:
+                self._remove(review_id)
+                self._add(review_id, movie_id, comment)
+
+    def remove(self, review_id: int):
+        with self._lock:
+            if self.built:
+                self._remove(review_id)
+
+    def invalidate(self):
+        """Rebuild from the database on the next search"""
+        with self._lock:
+            self.built = False
+
+    def search(self, query: str, movie_id: Optional[int] = None) -> List[Tuple[float, int]]:
+        """(score, review_id) for every match, best first"""
+        terms = set(tokenize(query))
+        if not terms:
+            return []
+        with self._lock:
+            postings = [self._postings.get(term, {}) for term in terms]
+            if not all(postings):
+                return []
+            postings.sort(key=len)
+            matches = set(postings[0]).intersection(*postings[1:])
+            if movie_id is not None:
+                matches = {rid for rid in matches if self._docs[rid][0] == movie_id}
+
+            doc_count = len(self._docs)
+            avg_length = self._total_length / doc_count if doc_count else 0
+            idf = [math.log(1 + (doc_count - len(p) + 0.5) / (len(p) + 0.5)) for p in postings]
+            results = []
+            for rid in matches:
+                length = len(self._docs[rid][1])
+                norm = self.K1 * (1 - self.B + self.B * length / avg_length) if avg_length else self.K1
+                score = sum(
+                    weight * p[rid] * (self.K1 + 1) / (p[rid] + norm)
+                    for weight, p in zip(idf, postings)
+                )
+                results.append((round(score, 6), rid))
+        results.sort(reverse=True)
+        return results
+
+    def _add(self, review_id: int, movie_id: int, comment: Optional[str]):
+        terms = tokenize(comment)
+        self._docs[review_id] = (movie_id, terms)
+        self._total_length += len(terms)
+        for term in terms:
+            self._postings[term][review_id] = self._postings[term].get(review_id, 0) + 1
+
+    def _remove(self, review_id: int):
+        doc = self._docs.pop(review_id, None)
+        if doc is None:
+            return
+        self._total_length -= len(doc[1])
+        for term in set(doc[1]):
+            postings = self._postings.get(term)
+            if postings is not None:
+                postings.pop(review_id, None)
+                if not postings:
+                    del self._postings[term]
+
+
+review_index = InvertedIndex()
+
+
+def get_review_index() -> InvertedIndex:
+    return review_index
+
+
+_pg_search_available: Optional[bool] = None
+
+
+def pg_search_available(db: Session) -> bool:
+    """PostgreSQL with the search_vector column in place (checked once)"""
+    global _pg_search_available
+    if _pg_search_available is None:
+        bind = db.get_bind()
+        _pg_search_available = bind.dialect.name == "postgresql" and any(
+            col["name"] == "search_vector" for col in inspect(bind).get_columns("reviews")
+        )
+        if bind.dialect.name == "postgresql" and not _pg_search_available:
+            print("reviews.search_vector missing; run migrations. Using the in-process search index.")
+    return _pg_search_available
+
+
+def search_reviews(
+    db: Session,
+    q: str,
+    movie_id: Optional[int] = None,
+    sort: str = SORT_RELEVANCE,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+) -> Tuple[List[Tuple[Review, User, float]], Optional[str]]:
+    """One page of (review, author, rank) matches plus the next cursor"""
+    if pg_search_available(db):
+        rows = _search_postgres(db, q, movie_id, sort, limit, cursor)
+    else:
+        rows = _search_index(db, q, movie_id, sort, limit, cursor)
+
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    review, _, rank = rows[-1]
+    if sort == SORT_RECENT:
+        return rows, encode_cursor(review.created_at, review.id)
+    return rows, encode_rank_cursor(rank, review.id)
+
+
+def _search_postgres(db, q, movie_id, sort, limit, cursor):
+    tsquery = func.websearch_to_tsquery("english", q)
+    vector = literal_column("reviews.search_vector")
+    # float8 so the rank round-trips exactly through the cursor
+    rank = cast(func.ts_rank_cd(vector, tsquery), Float)
+
+    query = (
+        db.query(Review, User, rank)
+        .join(User, Review.user_id == User.id)
+        .filter(vector.op("@@")(tsquery))
+    )
+    if movie_id is not None:
+        query = query.filter(Review.movie_id == movie_id)
+
+    if sort == SORT_RECENT:
+        query = apply_keyset(query, Review.created_at, Review.id, cursor)
+    else:
+        if cursor:
+            after_rank, after_id = decode_rank_cursor(cursor)
+            query = query.filter(tuple_(rank, Review.id) < tuple_(after_rank, after_id))
+        query = query.order_by(rank.desc(), Review.id.desc())
+    return [tuple(row) for row in query.limit(limit + 1).all()]
+
+
+def _search_index(db, q, movie_id, sort, limit, cursor):
+    index = get_review_index()
+    if not index.built:
+        index.build(db)
+    ranks = {rid: score for score, rid in index.search(q, movie_id)}
+    if not ranks:
+        return []
+
+    query = db.query(Review, User).join(User, Review.user_id == User.id)
+    if sort == SORT_RECENT:
+        query = apply_keyset(query.filter(Review.id.in_(list(ranks))), Review.created_at, Review.id, cursor)
+        return [(review, user, ranks[review.id]) for review, user in query.limit(limit + 1).all()]
+
+    ordered = sorted(((score, rid) for rid, score in ranks.items()), reverse=True)
+    if cursor:
+        after = decode_rank_cursor(cursor)
+        ordered = [key for key in ordered if key < after]
+    page_ids = [rid for _, rid in ordered[: limit + 1]]
+    found = {review.id: (review, user) for review, user in query.filter(Review.id.in_(page_ids)).all()}
+    return [(*found[rid], ranks[rid]) for rid in page_ids if rid in found]
@@ -0,0 +1,255 @@
+# app/services/review_transfer.py
+"""
+Bulk review export/import (JSONL or CSV) for moving dumps between
+environments. Both directions work in fixed-size chunks so memory stays
+flat regardless of how many rows are moved.
+"""
+import csv
+import io
+import json
+from datetime import datetime, timezone
+from typing import AsyncIterator, Dict, Iterator, List, Optional, Tuple
+
+from pydantic import BaseModel, Field, ValidationError, conint
+from sqlalchemy import insert, tuple_, update
+from sqlalchemy.dialects import postgresql, sqlite
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.orm import Session
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.review import Review
+from app.models.user import User
+from app.services.rating_stats import record_rating_changes
+
+EXPORT_FIELDS = ["user_id", "tmdb_id", "rating", "comment", "created_at", "updated_at"]
+MAX_REPORTED_ERRORS = 100
+MAX_COMMENT_LENGTH = 2000
+
+ON_CONFLICT_SKIP = "skip"
+ON_CONFLICT_UPDATE = "update"
+
+
+class ReviewImportRow(BaseModel):
+    user_id: int
+    tmdb_id: int
+    rating: conint(ge=1, le=10)
+    comment: Optional[str] = Field(None, max_length=MAX_COMMENT_LENGTH)
+    created_at: Optional[datetime] = None
+
+
+# ------------------------------------------------------
+# Export
+# ------------------------------------------------------
+def iter_export(fmt: str, movie_id: Optional[int] = None, user_id: Optional[int] = None) -> Iterator[bytes]:
+    """
+    Encoded export lines, streamed from a server-side cursor. Opens its own
+    session because the response body outlives the request dependencies.
+    """
+    db = SessionLocal()
+    try:
+        query = db.query(
+            Review.user_id, Review.movie_id, Review.rating, Review.comment,
+            Review.created_at, Review.updated_at,
+        )
+        if movie_id is not None:
+            query = query.filter(Review.movie_id == movie_id)
+        if user_id is not None:
+            query = query.filter(Review.user_id == user_id)
+        rows = query.order_by(Review.id).execution_options(
+            stream_results=True, yield_per=settings.REVIEW_TRANSFER_CHUNK_SIZE
+        )
+
+        buffer = io.StringIO()
+        writer = csv.writer(buffer) if fmt == "csv" else None
+        if writer:
+            writer.writerow(EXPORT_FIELDS)
+        count = 0
+        for row in rows:
+            values = [value.isoformat() if isinstance(value, datetime) else value for value in row]
+            if writer:
+                writer.writerow(values)
+            else:
+                buffer.write(json.dumps(dict(zip(EXPORT_FIELDS, values)), ensure_ascii=False))
+                buffer.write("\n")
+            count += 1
+            if count % settings.REVIEW_TRANSFER_CHUNK_SIZE == 0:
+                yield buffer.getvalue().encode("utf-8")
+                buffer.seek(0)
+                buffer.truncate()
+        if buffer.tell():
+            yield buffer.getvalue().encode("utf-8")
+    finally:
+        db.close()
+
+
+# ------------------------------------------------------
+# Import
+# ------------------------------------------------------
+async def iter_upload_records(stream: AsyncIterator[bytes], fmt: str) -> AsyncIterator[Tuple[int, object]]:
+    """
+    (line number, raw record) pairs from a streamed upload: dicts for
+    JSONL; for CSV, dicts keyed by the header or a ValueError for a
+    malformed line. Quoted CSV fields may span lines.
+    """
+    pending = b""
+    line_no = 0
+    header: Optional[List[str]] = None
+    record_lines: List[str] = []
+    record_start = 0
+
+    async def lines():
+        nonlocal pending
+        async for chunk in stream:
+            pending += chunk
+            *complete, pending = pending.split(b"\n")
+            for line in complete:
+                yield line
+        if pending:
+            yield pending
+
+    async for raw in lines():
+        line_no += 1
+        text = raw.decode("utf-8", errors="replace").rstrip("\r")
+        if fmt != "csv":
+            if not text.strip():
+                continue
+            try:
+                yield line_no, json.loads(text)
+            except ValueError as e:
+                yield line_no, ValueError(f"Invalid JSON: {e}")
+            continue
+
+        if not record_lines:
+            record_start = line_no
+        record_lines.append(text)
+        # An odd number of quotes means a quoted field continues on the next line
+        if sum(part.count('"') for part in record_lines) % 2:
+            continue
+        record_text = "\n".join(record_lines)
+        record_lines = []
+        if not record_text.strip():
+            continue
+        values = next(csv.reader([record_text]))
+        if header is None:
+            header = values
+            continue
+        if len(values) != len(header):
+            yield record_start, ValueError(f"Expected {len(header)} columns, got {len(values)}")
+            continue
+        yield record_start, {key: (value if value != "" else None) for key, value in zip(header, values)}
+
+    if record_lines:
+        yield record_start, ValueError("Unterminated quoted field")
+
+
+def _insert_new(db: Session, values: List[dict]) -> set:
+    """
+    Insert the rows whose (user_id, movie_id) is free and return the keys
+    that were actually written. PostgreSQL and SQLite do it in one
+    INSERT ... ON CONFLICT DO NOTHING RETURNING, so a row another request
+    inserts concurrently is never counted as ours. Other databases insert
+    row by row in savepoints.
+    """
+    dialect = db.get_bind().dialect.name
+    if dialect in ("postgresql", "sqlite"):
+        stmt = postgresql.insert(Review) if dialect == "postgresql" else sqlite.insert(Review)
+        stmt = stmt.on_conflict_do_nothing(index_elements=["user_id", "movie_id"])
+        return {tuple(row) for row in db.execute(stmt.returning(Review.user_id, Review.movie_id), values)}
+
+    inserted = set()
+    for value in values:
+        try:
+            with db.begin_nested():
+                db.execute(insert(Review), [value])
+        except IntegrityError:
+            continue
+        inserted.add((value["user_id"], value["movie_id"]))
+    return inserted
+
+
+def import_chunk(db: Session, records: List[Tuple[int, object]], on_conflict: str = ON_CONFLICT_SKIP) -> dict:
+    """
+    Validate and write one chunk of (line number, raw record) pairs with a
+    single INSERT ... ON CONFLICT (user_id, movie_id) DO NOTHING, then
+    update the conflicting rows when asked to. Counts and rating
+    aggregates come from the rows each statement reports it changed.
+    Commits the chunk.
+    """
+    result = {"inserted": 0, "updated": 0, "skipped": 0, "failed": 0, "errors": []}
+
+    def fail(line: int, message: str):
+        result["failed"] += 1
+        result["errors"].append({"line": line, "error": message})
+
+    rows: Dict[Tuple[int, int], Tuple[int, ReviewImportRow]] = {}
+    for line, record in records:
+        if isinstance(record, Exception):
+            fail(line, str(record))
+            continue
+        try:
+            row = ReviewImportRow.model_validate(record)
+        except ValidationError as e:
+            fail(line, "; ".join(f"{'.'.join(map(str, err['loc']))}: {err['msg']}" for err in e.errors()))
+            continue
+        key = (row.user_id, row.tmdb_id)
+        if key in rows:
+            fail(line, f"Duplicate of line {rows[key][0]}")
+            continue
+        rows[key] = (line, row)
+
+    if rows:
+        user_ids = {user_id for user_id, _ in rows}
+        known_users = {uid for (uid,) in db.query(User.id).filter(User.id.in_(user_ids)).all()}
+        for key in [key for key in rows if key[0] not in known_users]:
+            line, _ = rows.pop(key)
+            fail(line, f"Unknown user_id {key[0]}")
+
+    if rows:
+        now = datetime.now(timezone.utc)
+        inserted = _insert_new(db, [
+            {
+                "user_id": row.user_id,
+                "movie_id": row.tmdb_id,
+                "rating": row.rating,
+                "comment": row.comment,
+                "created_at": row.created_at or now,
+            }
+            for _, row in rows.values()
+        ])
+
+        changes = [(row.tmdb_id, None, row.rating) for key, (_, row) in rows.items() if key in inserted]
+        result["inserted"] = len(changes)
+        conflicts = [key for key in rows if key not in inserted]
+        if conflicts and on_conflict == ON_CONFLICT_UPDATE:
+            # Lock the rows that already exist so the old ratings read here
+            # are the ones being replaced
+            current = (
+                db.query(Review.id, Review.user_id, Review.movie_id, Review.rating)
+                .filter(tuple_(Review.user_id, Review.movie_id).in_(conflicts))
+                .with_for_update()
+                .all()
+            )
+            updates = []
+            for review_id, user_id, movie_id, old_rating in current:
+                row = rows[(user_id, movie_id)][1]
+                updates.append({"id": review_id, "rating": row.rating, "comment": row.comment, "updated_at": now})
+                changes.append((movie_id, old_rating, row.rating))
+            if updates:
+                db.execute(update(Review), updates)
+            result["updated"] = len(updates)
+            result["skipped"] = len(conflicts) - len(updates)
+        else:
+            result["skipped"] = len(conflicts)
+        record_rating_changes(db, changes)
+
+    db.commit()
+    return result
+
+
+def merge_results(total: dict, chunk: dict):
+    for key in ("inserted", "updated", "skipped", "failed"):
+        total[key] += chunk[key]
+    room = MAX_REPORTED_ERRORS - len(total["errors"])
+    if room > 0:
+        total["errors"].extend(chunk["errors"][:room])
@@ -0,0 +1,58 @@
+# app/services/singleflight.py
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key into one in-flight task.
+
+    The first caller (the leader) starts the work as an independent task;
+    every caller, leader included, awaits a shielded view of it. Cancelling
+    or timing out one waiter never cancels the shared task, and its result
+    or exception is handed to everyone waiting on the same key.
+    """
+
+    def __init__(self):
+        self._in_flight: Dict[str, asyncio.Task] = {}
+
+        # Counters
+        self.leaders = 0
+        self.coalesced = 0
+        self.timeouts = 0
+
+    async def do(
+        self,
+        key: str,
+        fn: Callable[[], Awaitable[Any]],
+        timeout: Optional[float] = None,
+    ) -> Any:
+        task = self._in_flight.get(key)
+        if task is None:
+            self.leaders += 1
+            task = asyncio.create_task(fn())
+            self._in_flight[key] = task
+            task.add_done_callback(lambda t, key=key: self._finish(key, t))
+        else:
+            self.coalesced += 1
+
+        try:
+            return await asyncio.wait_for(asyncio.shield(task), timeout)
+        except asyncio.TimeoutError:
+            self.timeouts += 1
+            raise
+
+    def _finish(self, key: str, task: asyncio.Task):
+        if self._in_flight.get(key) is task:
+            del self._in_flight[key]
+        if not task.cancelled():
+            # Mark the exception as retrieved even if every waiter gave up
+            task.exception()
+
+    def metrics(self) -> dict:
+        return {
+            "in_flight": len(self._in_flight),
+            "leaders": self.leaders,
+            "coalesced": self.coalesced,
+            "timeouts": self.timeouts,
+        }
@@ -0,0 +1,245 @@
+# app/services/social_graph.py
+import asyncio
+import os
+import threading
+import time
+import uuid
+from array import array
+from bisect import bisect_left
+from typing import Dict, List, Optional
+
+from sqlalchemy import and_
+from sqlalchemy.orm import Session, aliased
+
+from app.config import settings
+from app.database import SessionLocal
+from app.models.follow import Follow
+from app.services.invalidation import InvalidationBackend, load_invalidation_backend
+
+_EMPTY = array("i")
+
+
+def _contains(ids: array, value: int) -> bool:
+    i = bisect_left(ids, value)
+    return i < len(ids) and ids[i] == value
+
+
+def _insert(ids: array, value: int) -> bool:
+    i = bisect_left(ids, value)
+    if i < len(ids) and ids[i] == value:
+        return False
+    ids.insert(i, value)
+    return True
+
+
+def _delete(ids: array, value: int) -> bool:
+    i = bisect_left(ids, value)
+    if i < len(ids) and ids[i] == value:
+        del ids[i]
+        return True
+    return False
+
+
+def intersect_sorted(a: array, b: array) -> List[int]:
+    """Intersection of two sorted id arrays"""
+    if len(a) > len(b):
+        a, b = b, a
+    if not a:
+        return []
+    if len(b) > 16 * len(a):
+        # Very lopsided (e.g. a celebrity's followers): probe the big side
+        return [x for x in a if _contains(b, x)]
+    result, i, j = [], 0, 0
+    while i < len(a) and j < len(b):
+        if a[i] == b[j]:
+            result.append(a[i])
+            i += 1
+            j += 1
+        elif a[i] < b[j]:
+            i += 1
+        else:
+            j += 1
+    return result
+
+
+class SocialGraph:
+    """
+    Follow graph held as sorted int32 arrays per user in both directions,
+    built from the follows table and kept current by follow/unfollow.
+    Membership is a binary search and mutual/overlap queries are sorted
+    intersections, so graph lookups never touch the database.
+    """
+
+    def __init__(self, backend: Optional[InvalidationBackend] = None):
+        self.origin = f"{os.getpid()}-{uuid.uuid4().hex[:8]}"
+        self._following: Dict[int, array] = {}
+        self._followers: Dict[int, array] = {}
+        self._lock = threading.Lock()
+        self.built = False
+        self.built_at: Optional[float] = None
+        self.edges = 0
+        # Changes seen while a rebuild is reading the table, replayed onto the new arrays
+        self._pending: Optional[List[dict]] = None
+        self.backend = backend or load_invalidation_backend(settings.SOCIAL_GRAPH_INVALIDATION_BACKEND)
+        self.backend.subscribe(self._on_message)
+
+    def build(self, db: Session):
+        """Rebuild from the table; if reading fails the current arrays stay in place"""
+        with self._lock:
+            self._pending = []
+        try:
+            following: Dict[int, array] = {}
+            followers: Dict[int, array] = {}
+            edges = 0
+            rows = (
+                db.query(Follow.follower_id, Follow.following_id)
+                .order_by(Follow.follower_id, Follow.following_id)
+                .execution_options(stream_results=True, yield_per=10000)
+            )
+            for follower_id, following_id in rows:
+                # Rows arrive sorted by (follower, following), so appends keep
+                # the following arrays sorted; followers are sorted below
+                following.setdefault(follower_id, array("i")).append(following_id)
+                followers.setdefault(following_id, array("i")).append(follower_id)
+                edges += 1
+            for user_id, ids in followers.items():
+                followers[user_id] = array("i", sorted(ids))
+            with self._lock:
+                self._following = following
+                self._followers = followers
+                self.edges = edges
+                self.built = True
+                self.built_at = time.time()
+                pending, self._pending = self._pending, None
+                for message in pending:
+                    self._apply_locked(message)
+        finally:
+            # Stop buffering changes even if the rebuild failed; a built graph
+            # has been applying them directly all along
+            with self._lock:
+                self._pending = None
+
+    # Reads -------------------------------------------------------------
+    def is_following(self, follower_id: int, following_id: int) -> bool:
+        return _contains(self._following.get(follower_id, _EMPTY), following_id)
+
+    def following(self, user_id: int) -> List[int]:
+        return list(self._following.get(user_id, _EMPTY))
+
+    def followers(self, user_id: int) -> List[int]:
+        return list(self._followers.get(user_id, _EMPTY))
+
+    def mutuals(self, user_id: int) -> List[int]:
+        """Users who follow `user_id` and are followed back"""
+        with self._lock:
+            return intersect_sorted(self._following.get(user_id, _EMPTY), self._followers.get(user_id, _EMPTY))
+
+    def followed_by_following(self, viewer_id: int, user_id: int) -> List[int]:
+        """People the viewer follows who follow `user_id`"""
+        with self._lock:
+            return intersect_sorted(self._following.get(viewer_id, _EMPTY), self._followers.get(user_id, _EMPTY))
+
+    # Writes ------------------------------------------------------------
+    def add(self, follower_id: int, following_id: int):
+        self._apply({"op": "add", "follower_id": follower_id, "following_id": following_id})
+        self._publish({"op": "add", "follower_id": follower_id, "following_id": following_id})
+
+    def remove(self, follower_id: int, following_id: int):
+        self._apply({"op": "remove", "follower_id": follower_id, "following_id": following_id})
+        self._publish({"op": "remove", "follower_id": follower_id, "following_id": following_id})
+
+    def metrics(self) -> dict:
+        return {
+            "built": self.built,
+            "built_at": self.built_at,
+            "users": len(self._following.keys() | self._followers.keys()),
+            "edges": self.edges,
+        }
+
+    def _publish(self, message: dict):
+        try:
+            self.backend.publish({**message, "origin": self.origin})
+        except Exception as e:
+            print("Social graph invalidation publish failed:", e)
+
+    def _on_message(self, message: dict):
+        if message.get("origin") != self.origin:
+            self._apply(message)
+
+    def _apply(self, message: dict):
+        with self._lock:
+            if self._pending is not None:
+                self._pending.append(message)
+            if self.built:
+                self._apply_locked(message)
+
+    def _apply_locked(self, message: dict):
+        follower_id, following_id = message["follower_id"], message["following_id"]
+        if message["op"] == "add":
+            if _insert(self._following.setdefault(follower_id, array("i")), following_id):
+                _insert(self._followers.setdefault(following_id, array("i")), follower_id)
+                self.edges += 1
+        elif message["op"] == "remove":
+            if _delete(self._following.get(follower_id, _EMPTY), following_id):
+                _delete(self._followers.get(following_id, _EMPTY), follower_id)
+                self.edges -= 1
+
+
+social_graph = SocialGraph()
+
+
+def get_social_graph() -> SocialGraph:
+    return social_graph
+
+
+# ------------------------------------------------------
+# Lookups with a SQL fallback (before the graph is built)
+# ------------------------------------------------------
+def mutual_follow_ids(db: Session, user_id: int) -> List[int]:
+    graph = get_social_graph()
+    if graph.built:
+        return graph.mutuals(user_id)
+    back = aliased(Follow)
+    rows = (
+        db.query(Follow.following_id)
+        .join(back, and_(back.follower_id == Follow.following_id, back.following_id == Follow.follower_id))
+        .filter(Follow.follower_id == user_id)
+        .order_by(Follow.following_id)
+        .all()
+    )
+    return [user_id for (user_id,) in rows]
+
+
+def followed_by_following_ids(db: Session, viewer_id: int, user_id: int) -> List[int]:
+    graph = get_social_graph()
+    if graph.built:
+        return graph.followed_by_following(viewer_id, user_id)
+    theirs = aliased(Follow)
+    rows = (
+        db.query(Follow.following_id)
+        .join(theirs, and_(theirs.follower_id == Follow.following_id, theirs.following_id == user_id))
+        .filter(Follow.follower_id == viewer_id)
+        .order_by(Follow.following_id)
+        .all()
+    )
+    return [user_id for (user_id,) in rows]
+
+
+def build_social_graph():
+    db = SessionLocal()
+    try:
+        get_social_graph().build(db)
+    finally:
+        db.close()
+
+
+async def run_social_graph_loop():
+    """Build the graph on startup and rebuild it on a schedule to absorb drift"""
+    while True:
+        try:
+            await asyncio.to_thread(build_social_graph)
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            print("Social graph build failed:", e)
+        await asyncio.sleep(settings.SOCIAL_GRAPH_REBUILD_INTERVAL_SECONDS)
@@ -0,0 +1,264 @@
+# app/services/tmdb_cache.py
+import asyncio
+import hashlib
+import json
+import os
+import time
+import uuid
+from collections import OrderedDict
+from pathlib import Path
+from typing import Any, List, Optional
+
+from app.config import settings
+
+
+def make_cache_key(path: str, params: Optional[dict] = None) -> str:
+    """
+    Build a cache key from the TMDB path and normalized params.
+    The api_key is never part of the key.
+    """
+    params = params or {}
+    normalized = sorted(
+        (str(k), str(v)) for k, v in params.items() if k != "api_key" and v is not None
+    )
+    query = "&".join(f"{k}={v}" for k, v in normalized)
+    return f"{path}?{query}" if query else path
+
+
+class CacheEntry:
+    __slots__ = ("value", "size", "stored_at", "expires_at")
+
+    def __init__(self, value: Any, size: int, stored_at: float, expires_at: float):
+        self.value = value
+        self.size = size
+        self.stored_at = stored_at
+        self.expires_at = expires_at
+
+    def is_fresh(self, now: float) -> bool:
+        return now < self.expires_at
+
+    def age_past_expiry(self, now: float) -> float:
+        return max(0.0, now - self.expires_at)
+
+
+class TMDBCache:
+    """
+    Two-tier response cache for TMDB data.
+
+    Tier 1 is an in-process LRU bounded by total payload bytes; entries
+    expire after a per-call TTL. Tier 2 is an optional directory of JSON
+    files so a restarted worker does not start cold. Disk reads and writes
+    run in worker threads, and the files' sizes are indexed in write order
+    so pruning never rescans the directory.
+
+    Expired entries are retained for `stale_ttl` seconds so callers can
+    serve them while revalidating or when upstream is failing.
+    """
+
+    def __init__(
+        self,
+        max_bytes: Optional[int] = None,
+        disk_dir: Optional[str] = None,
+        disk_max_bytes: Optional[int] = None,
+        stale_ttl: Optional[float] = None,
+    ):
+        self.max_bytes = max_bytes or settings.TMDB_CACHE_MAX_BYTES
+        if stale_ttl is None:
+            stale_ttl = max(settings.TMDB_CACHE_STALE_WHILE_REVALIDATE, settings.TMDB_CACHE_STALE_IF_ERROR)
+        self.stale_ttl = stale_ttl
+        self.disk_max_bytes = disk_max_bytes or settings.TMDB_CACHE_DISK_MAX_BYTES
+        disk_dir = disk_dir if disk_dir is not None else settings.TMDB_CACHE_DISK_DIR
+        self.disk_dir = Path(disk_dir) if disk_dir else None
+
+        self._entries: "OrderedDict[str, CacheEntry]" = OrderedDict()
+        self.current_bytes = 0
+        # file name -> size, oldest write first
+        self._disk_files: "OrderedDict[str, int]" = OrderedDict()
+        self.disk_bytes = 0
+
+        # Counters
+        self.hits = 0
+        self.misses = 0
+        self.stale_hits = 0
+        self.disk_hits = 0
+        self.evictions = 0
+        self.expirations = 0
+
+        if self.disk_dir:
+            # The only directory scan; runs once at startup
+            self.disk_dir.mkdir(parents=True, exist_ok=True)
+            stats = sorted(((f.name, f.stat()) for f in self.disk_dir.glob("*.json")), key=lambda item: item[1].st_mtime)
+            self._disk_files = OrderedDict((name, stat.st_size) for name, stat in stats)
+            self.disk_bytes = sum(self._disk_files.values())
+
+    # -------------------------
+    # Public API
+    # -------------------------
+
+    async def lookup(self, key: str) -> Optional[CacheEntry]:
+        """
+        Return the entry while it is still servable: fresh, or expired
+        but within the stale retention window. Callers decide whether a
+        stale entry may be used.
+        """
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is None and self.disk_dir:
+            entry = await asyncio.to_thread(self._load_from_disk, key)
+            if entry is not None:
+                self.disk_hits += 1
+                self._store_in_memory(key, entry)
+
+        if entry is None:
+            self.misses += 1
+            return None
+
+        if not entry.is_fresh(now) and entry.age_past_expiry(now) >= self.stale_ttl:
+            self.expirations += 1
+            self.misses += 1
+            self._remove(key)
+            return None
+
+        self._entries.move_to_end(key)
+        if entry.is_fresh(now):
+            self.hits += 1
+        else:
+            self.stale_hits += 1
+        return entry
+
+    async def get(self, key: str) -> Optional[Any]:
+        """Return a fresh cached value, or None on miss/expiry"""
+        entry = await self.lookup(key)
+        if entry is None or not entry.is_fresh(time.time()):
+            return None
+        return entry.value
+
+    async def set(self, key: str, value: Any, ttl: float):
+        """Store a value in memory (and on disk when enabled)"""
+        payload = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        now = time.time()
+        entry = CacheEntry(value, len(payload), now, now + ttl)
+        if entry.size > self.max_bytes:
+            # Never let a single oversized payload flush the whole cache
+            return
+        self._store_in_memory(key, entry)
+        if self.disk_dir:
+            await self._write_to_disk(key, entry, payload)
+
+    def clear(self):
+        self._entries.clear()
+        self.current_bytes = 0
+        if self.disk_dir:
+            for f in self.disk_dir.glob("*.json"):
+                f.unlink(missing_ok=True)
+            self._disk_files.clear()
+            self.disk_bytes = 0
+
+    def metrics(self) -> dict:
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "bytes": self.current_bytes,
+            "max_bytes": self.max_bytes,
+            "disk_enabled": self.disk_dir is not None,
+            "disk_bytes": self.disk_bytes,
+            "hits": self.hits,
+            "misses": self.misses,
+            "stale_hits": self.stale_hits,
+            "disk_hits": self.disk_hits,
+            "evictions": self.evictions,
+            "expirations": self.expirations,
+            "hit_ratio": round(self.hits / lookups, 3) if lookups else 0,
+        }
+
+    # -------------------------
+    # Memory tier
+    # -------------------------
+
+    def _store_in_memory(self, key: str, entry: CacheEntry):
+        old = self._entries.pop(key, None)
+        if old is not None:
+            self.current_bytes -= old.size
+        self._entries[key] = entry
+        self.current_bytes += entry.size
+        while self.current_bytes > self.max_bytes and self._entries:
+            _, evicted = self._entries.popitem(last=False)
+            self.current_bytes -= evicted.size
+            self.evictions += 1
+
+    def _remove(self, key: str):
+        entry = self._entries.pop(key, None)
+        if entry is not None:
+            self.current_bytes -= entry.size
+
+    # -------------------------
+    # Disk tier
+    # -------------------------
+
+    def _disk_path(self, key: str) -> Path:
+        digest = hashlib.sha256(key.encode("utf-8")).hexdigest()
+        return self.disk_dir / f"{digest}.json"
+
+    def _load_from_disk(self, key: str) -> Optional[CacheEntry]:
+        """Runs in a worker thread; only reads the file"""
+        path = self._disk_path(key)
+        try:
+            with open(path, "rb") as f:
+                raw = f.read()
+            record = json.loads(raw)
+        except (OSError, ValueError):
+            return None
+        if record.get("key") != key:
+            return None
+        return CacheEntry(record["value"], len(raw), record["stored_at"], record["expires_at"])
+
+    async def _write_to_disk(self, key: str, entry: CacheEntry, payload: bytes):
+        path = self._disk_path(key)
+        record = (
+            b'{"key":' + json.dumps(key).encode("utf-8")
+            + b',"stored_at":' + repr(entry.stored_at).encode("ascii")
+            + b',"expires_at":' + repr(entry.expires_at).encode("ascii")
+            + b',"value":' + payload + b"}"
+        )
+        if not await asyncio.to_thread(_write_file, path, record):
+            return
+        # Bookkeeping stays on the event loop, so no lock is needed
+        self.disk_bytes += len(record) - self._disk_files.pop(path.name, 0)
+        self._disk_files[path.name] = len(record)
+        if self.disk_bytes > self.disk_max_bytes:
+            await self._prune_disk()
+
+    async def _prune_disk(self):
+        """Drop the oldest files until the disk tier fits its byte budget"""
+        victims = []
+        while self.disk_bytes > self.disk_max_bytes and self._disk_files:
+            name, size = self._disk_files.popitem(last=False)
+            self.disk_bytes -= size
+            self.evictions += 1
+            victims.append(self.disk_dir / name)
+        await asyncio.to_thread(_unlink_files, victims)
+
+
+def _write_file(path: Path, record: bytes) -> bool:
+    """Atomically replace `path`; the temp name is unique so concurrent writes never share it"""
+    tmp_path = path.with_name(f"{path.stem}.{uuid.uuid4().hex}.tmp")
+    try:
+        with open(tmp_path, "wb") as f:
+            f.write(record)
+        os.replace(tmp_path, path)
+    except OSError:
+        tmp_path.unlink(missing_ok=True)
+        return False
+    return True
+
+
+def _unlink_files(paths: List[Path]):
+    for path in paths:
+        path.unlink(missing_ok=True)
+
+
+tmdb_cache = TMDBCache()
+
+
+def get_tmdb_cache() -> TMDBCache:
+    return tmdb_cache
@@ -0,0 +1,140 @@
+# app/services/tmdb_client.py
+from typing import Optional
+
+import httpx
+
+from app.config import settings
+
+
+class TMDBClient:
+    """
+    Application-lifetime HTTP client for TMDB.
+
+    Wraps a single pooled httpx.AsyncClient so every proxy call reuses
+    warm connections instead of paying DNS/TCP/TLS setup each time.
+    """
+
+    def __init__(
+        self,
+        base_url: Optional[str] = None,
+        max_connections: Optional[int] = None,
+        max_keepalive_connections: Optional[int] = None,
+        keepalive_expiry: Optional[float] = None,
+        http2: Optional[bool] = None,
+        timeout: Optional[float] = None,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = base_url or settings.TMDB_BASE_URL
+        self.max_connections = max_connections or settings.TMDB_MAX_CONNECTIONS
+        self.max_keepalive_connections = max_keepalive_connections or settings.TMDB_MAX_KEEPALIVE_CONNECTIONS
+        self.keepalive_expiry = keepalive_expiry or settings.TMDB_KEEPALIVE_EXPIRY
+        self.http2 = settings.TMDB_HTTP2 if http2 is None else http2
+        self.timeout = timeout or settings.TMDB_TIMEOUT
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+        # Pool metrics
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.total_requests = 0
+        self.saturated_requests = 0
+        self.failed_requests = 0
+
+    @property
+    def is_started(self) -> bool:
+        return self._client is not None
+
+    async def start(self):
+        """Open the underlying pooled client (called on app startup)"""
+        if self._client is not None:
+            return
+        http2 = self.http2
+        if http2:
+            # HTTP/2 needs the optional `h2` package; fall back to HTTP/1.1 without it
+            try:
+                import h2  # noqa: F401
+            except ImportError:
+                http2 = False
+        limits = httpx.Limits(
+            max_connections=self.max_connections,
+            max_keepalive_connections=self.max_keepalive_connections,
+            keepalive_expiry=self.keepalive_expiry,
+        )
+        transport = self._transport
+        if transport is None and settings.TMDB_FIXTURE_MODE:
+            transport = self._fixture_transport(http2, limits)
+        self._client = httpx.AsyncClient(
+            base_url=self.base_url,
+            http2=http2,
+            timeout=self.timeout,
+            limits=limits,
+            transport=transport,
+        )
+
+    def _fixture_transport(self, http2: bool, limits: httpx.Limits) -> httpx.AsyncBaseTransport:
+        """Record real TMDB traffic to, or replay it from, TMDB_FIXTURE_DIR"""
+        from app.services.tmdb_fixtures import FixtureStore, RecordingTransport, ReplayTransport
+
+        store = FixtureStore(settings.TMDB_FIXTURE_DIR)
+        if settings.TMDB_FIXTURE_MODE == "record":
+            return RecordingTransport(store, httpx.AsyncHTTPTransport(http2=http2, limits=limits))
+        if settings.TMDB_FIXTURE_MODE == "replay":
+            return ReplayTransport(
+                store,
+                latency_ms=settings.TMDB_REPLAY_LATENCY_MS,
+                jitter_ms=settings.TMDB_REPLAY_JITTER_MS,
+                error_rate=settings.TMDB_REPLAY_ERROR_RATE,
+                error_status=settings.TMDB_REPLAY_ERROR_STATUS,
+            )
+        raise ValueError(f"Unknown TMDB_FIXTURE_MODE: {settings.TMDB_FIXTURE_MODE}")
+
+    async def close(self):
+        """Close the pooled client (called on app shutdown)"""
+        if self._client is not None:
+            await self._client.aclose()
+            self._client = None
+
+    async def get(self, path: str, params: Optional[dict] = None, timeout: Optional[float] = None) -> httpx.Response:
+        """Issue a GET against TMDB through the shared pool"""
+        if self._client is None:
+            # Lazily start when used outside of the app lifespan (scripts, tests)
+            await self.start()
+
+        self.total_requests += 1
+        if self.in_flight >= self.max_connections:
+            self.saturated_requests += 1
+        self.in_flight += 1
+        self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return await self._client.get(
+                path,
+                params=params,
+                timeout=timeout if timeout is not None else self.timeout,
+            )
+        except httpx.RequestError:
+            self.failed_requests += 1
+            raise
+        finally:
+            self.in_flight -= 1
+
+    def metrics(self) -> dict:
+        """Connection pool usage counters"""
+        return {
+            "started": self.is_started,
+            "http2": self.http2,
+            "max_connections": self.max_connections,
+            "max_keepalive_connections": self.max_keepalive_connections,
+            "in_flight": self.in_flight,
+            "peak_in_flight": self.peak_in_flight,
+            "pool_utilization": round(self.in_flight / self.max_connections, 3) if self.max_connections else 0,
+            "total_requests": self.total_requests,
+            "saturated_requests": self.saturated_requests,
+            "failed_requests": self.failed_requests,
+        }
+
+
+tmdb_client = TMDBClient()
+
+
+def get_tmdb_client() -> TMDBClient:
+    return tmdb_client
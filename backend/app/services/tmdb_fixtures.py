@@ -0,0 +1,128 @@
+# app/services/tmdb_fixtures.py
+import asyncio
+import hashlib
+import json
+import os
+import random
+from pathlib import Path
+from typing import Optional
+
+import httpx
+
+from app.services.tmdb_cache import make_cache_key
+
+
+def fixture_key(url: httpx.URL) -> str:
+    """Identify a TMDB request by path and params, never by api_key"""
+    return make_cache_key(url.path, dict(url.params))
+
+
+class FixtureStore:
+    """
+    Directory of recorded TMDB responses, one JSON file per request key.
+    """
+
+    def __init__(self, directory: str):
+        self.directory = Path(directory)
+        self.directory.mkdir(parents=True, exist_ok=True)
+
+    def _path(self, key: str) -> Path:
+        return self.directory / (hashlib.sha256(key.encode("utf-8")).hexdigest() + ".json")
+
+    def load(self, key: str) -> Optional[dict]:
+        try:
+            with open(self._path(key), "r", encoding="utf-8") as f:
+                record = json.load(f)
+        except (OSError, ValueError):
+            return None
+        return record if record.get("key") == key else None
+
+    def save(self, key: str, status_code: int, body: str):
+        path = self._path(key)
+        tmp_path = path.with_suffix(".tmp")
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"key": key, "status_code": status_code, "body": body}, f)
+        os.replace(tmp_path, path)
+
+    def find_by_path(self, path: str, params: Optional[dict] = None) -> Optional[dict]:
+        return self.load(make_cache_key(path, params))
+
+
+class RecordingTransport(httpx.AsyncBaseTransport):
+    """
+    Pass requests through to TMDB and write every non-throttled,
+    non-5xx response to the fixture store.
+    """
+
+    def __init__(self, store: FixtureStore, inner: httpx.AsyncBaseTransport):
+        self.store = store
+        self.inner = inner
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        response = await self.inner.handle_async_request(request)
+        body = await response.aread()
+        if response.status_code != 429 and response.status_code < 500:
+            await asyncio.to_thread(
+                self.store.save, fixture_key(request.url), response.status_code, body.decode("utf-8")
+            )
+        # aread() decoded the body, so its original encoding and length no longer apply
+        headers = [
+            (name, value) for name, value in response.headers.items()
+            if name.lower() not in ("content-encoding", "content-length")
+        ]
+        return httpx.Response(
+            response.status_code,
+            headers=headers,
+            content=body,
+            request=request,
+        )
+
+    async def aclose(self):
+        await self.inner.aclose()
+
+
+class ReplayTransport(httpx.AsyncBaseTransport):
+    """
+    Serve recorded responses without touching the network, with optional
+    latency and error injection for load testing.
+    """
+
+    def __init__(
+        self,
+        store: FixtureStore,
+        latency_ms: float = 0.0,
+        jitter_ms: float = 0.0,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+    ):
+        self.store = store
+        self.latency_ms = latency_ms
+        self.jitter_ms = jitter_ms
+        self.error_rate = error_rate
+        self.error_status = error_status
+
+    async def handle_async_request(self, request: httpx.Request) -> httpx.Response:
+        delay_ms = self.latency_ms + random.uniform(0, self.jitter_ms)
+        if delay_ms > 0:
+            await asyncio.sleep(delay_ms / 1000)
+
+        if self.error_rate and random.random() < self.error_rate:
+            return httpx.Response(
+                self.error_status,
+                json={"status_message": "Injected error"},
+                request=request,
+            )
+
+        record = self.store.load(fixture_key(request.url))
+        if record is None:
+            return httpx.Response(
+                404,
+                json={"status_message": f"No recorded fixture for {request.url.path}"},
+                request=request,
+            )
+        return httpx.Response(
+            record["status_code"],
+            headers={"content-type": "application/json"},
+            content=record["body"].encode("utf-8"),
+            request=request,
+        )
@@ -0,0 +1,117 @@
+# app/services/tmdb_standin.py
+"""
+Local stand-in for the api.themoviedb.org/3 routes used by the proxy.
+
+Run it next to the API and point TMDB_BASE_URL at it:
+
+    uvicorn app.services.tmdb_standin:app --port 8001
+    TMDB_BASE_URL=http://localhost:8001/3 uvicorn app.main:app
+
+Responses recorded into TMDB_FIXTURE_DIR (TMDB_FIXTURE_MODE=record) are
+served when present; anything else gets deterministic synthetic data so
+every id and page resolves. TMDB_REPLAY_* settings add latency and errors.
+"""
+import asyncio
+import os
+import random
+import zlib
+from typing import Optional
+
+from fastapi import APIRouter, FastAPI, Request, Response
+
+from app.config import settings
+from app.services.tmdb_fixtures import FixtureStore
+
+GENRES = ["Action", "Adventure", "Comedy", "Drama", "Horror", "Romance", "Science Fiction", "Thriller"]
+PAGE_SIZE = 20
+TOTAL_PAGES = 500
+
+
+def synthetic_movie(movie_id: int) -> dict:
+    rng = random.Random(movie_id)
+    return {
+        "id": movie_id,
+        "title": f"Stand-in Movie {movie_id}",
+        "original_title": f"Stand-in Movie {movie_id}",
+        "overview": "Synthetic movie served by the local TMDB stand-in.",
+        "release_date": f"{rng.randint(1970, 2025)}-{rng.randint(1, 12):02d}-{rng.randint(1, 28):02d}",
+        "genres": [{"id": i, "name": GENRES[i]} for i in sorted(rng.sample(range(len(GENRES)), 2))],
+        "runtime": rng.randint(80, 180),
+        "poster_path": f"/standin-{movie_id}.jpg",
+        "backdrop_path": f"/standin-{movie_id}-backdrop.jpg",
+        "popularity": round(rng.uniform(1, 500), 3),
+        "vote_average": round(rng.uniform(3, 9), 1),
+        "vote_count": rng.randint(0, 20000),
+    }
+
+
+def synthetic_page(seed: int, page: int) -> dict:
+    start = seed + (page - 1) * PAGE_SIZE
+    return {
+        "page": page,
+        "results": [synthetic_movie(movie_id) for movie_id in range(start, start + PAGE_SIZE)],
+        "total_pages": TOTAL_PAGES,
+        "total_results": TOTAL_PAGES * PAGE_SIZE,
+    }
+
+
+def create_standin_app(
+    fixture_dir: Optional[str] = None,
+    latency_ms: float = 0.0,
+    error_rate: float = 0.0,
+    error_status: int = 503,
+) -> FastAPI:
+    store = FixtureStore(fixture_dir) if fixture_dir else None
+    router = APIRouter(prefix="/3")
+
+    async def respond(request: Request, fallback):
+        if latency_ms:
+            await asyncio.sleep(latency_ms / 1000)
+        if error_rate and random.random() < error_rate:
+            return Response(status_code=error_status, content='{"status_message":"Injected error"}',
+                            media_type="application/json")
+        if store is not None:
+            record = store.find_by_path(request.url.path, dict(request.query_params))
+            if record is not None:
+                return Response(status_code=record["status_code"], content=record["body"],
+                                media_type="application/json")
+        return fallback()
+
+    @router.get("/movie/popular")
+    async def popular(request: Request, page: int = 1):
+        return await respond(request, lambda: synthetic_page(1, page))
+
+    @router.get("/trending/movie/week")
+    async def trending(request: Request, page: int = 1):
+        return await respond(request, lambda: synthetic_page(100_000, page))
+
+    @router.get("/search/movie")
+    async def search(request: Request, query: str, page: int = 1):
+        def results():
+            data = synthetic_page(zlib.crc32(query.encode('utf-8')) % 1_000_000 + 200_000, page)
+            for movie in data["results"]:
+                movie["title"] = f"{query.title()} {movie['id']}"
+            return data
+        return await respond(request, results)
+
+    @router.get("/movie/{movie_id}")
+    async def details(request: Request, movie_id: int):
+        def movie():
+            data = synthetic_movie(movie_id)
+            data["videos"] = {"results": []}
+            data["credits"] = {"cast": [], "crew": []}
+            data["recommendations"] = synthetic_page(movie_id + 1, 1)
+            return data
+        return await respond(request, movie)
+
+    standin = FastAPI(title="TMDB stand-in")
+    standin.include_router(router)
+    return standin
+
+
+app = create_standin_app(
+    fixture_dir=settings.TMDB_FIXTURE_DIR if os.path.isdir(settings.TMDB_FIXTURE_DIR) else None,
+    latency_ms=settings.TMDB_REPLAY_LATENCY_MS,
+    error_rate=settings.TMDB_REPLAY_ERROR_RATE,
+    error_status=settings.TMDB_REPLAY_ERROR_STATUS,
+)
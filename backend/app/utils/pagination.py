@@ -0,0 +1,82 @@
+# app/utils/pagination.py
+import base64
+import json
+from datetime import datetime
+from typing import Callable, List, Optional, Tuple
+
+from fastapi import HTTPException
+from sqlalchemy import tuple_
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode(values: list) -> str:
+    raw = json.dumps(values, separators=(",", ":"))
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def _decode(cursor: str) -> list:
+    padded = cursor + "=" * (-len(cursor) % 4)
+    return json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+
+
+def encode_cursor(created_at: datetime, row_id: int) -> str:
+    """Opaque keyset cursor for a (created_at, id) position"""
+    return _encode([created_at.isoformat(), row_id])
+
+
+def decode_cursor(cursor: str) -> Tuple[datetime, int]:
+    try:
+        created_at, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_rank_cursor(rank: float, row_id: int) -> str:
+    """Opaque keyset cursor for a (rank, id) position in ranked results"""
+    return _encode([rank, row_id])
+
+
+def decode_rank_cursor(cursor: str) -> Tuple[float, int]:
+    try:
+        rank, row_id = _decode(cursor)
+        return float(rank), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def encode_timeline_cursor(created_at: datetime, source: int, row_id: int) -> str:
+    """Opaque keyset cursor for a (created_at, source, id) position in a merged timeline"""
+    return _encode([created_at.isoformat(), source, row_id])
+
+
+def decode_timeline_cursor(cursor: str) -> Tuple[datetime, int, int]:
+    try:
+        created_at, source, row_id = _decode(cursor)
+        return datetime.fromisoformat(created_at), int(source), int(row_id)
+    except (ValueError, TypeError):
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+
+
+def apply_keyset(query, created_col, id_col, cursor: Optional[str]):
+    """
+    Order newest first by (created_at, id) and, when a cursor is given,
+    continue strictly after it. Matches a (…, created_at, id) index so
+    every page costs the same as the first.
+    """
+    if cursor:
+        created_at, row_id = decode_cursor(cursor)
+        query = query.filter(tuple_(created_col, id_col) < tuple_(created_at, row_id))
+    return query.order_by(created_col.desc(), id_col.desc())
+
+
+def split_page(rows: List, limit: int, key: Callable) -> Tuple[List, Optional[str]]:
+    """
+    Trim a `limit + 1` fetch to `limit` rows and build the next cursor
+    from the last row kept (`key(row)` returns its (created_at, id)).
+    """
+    if len(rows) <= limit:
+        return rows, None
+    rows = rows[:limit]
+    return rows, encode_cursor(*key(rows[-1]))
@@ -0,0 +1,60 @@
+import os
+
+# The app's engine is created at import time; point it at SQLite before that
+os.environ.setdefault("DATABASE_URL", "sqlite://")
+
+import pytest
+from fastapi import FastAPI
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+from sqlalchemy.pool import StaticPool
+
+from app.database import Base, get_db
+
+
+@pytest.fixture
+def engine():
+    engine = create_engine("sqlite://", connect_args={"check_same_thread": False}, poolclass=StaticPool)
+    Base.metadata.create_all(engine)
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def session_factory(engine):
+    return sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+
+@pytest.fixture
+def statements(engine):
+    """Every SQL statement executed on the engine, in order"""
+    executed = []
+
+    def record(conn, cursor, statement, parameters, context, executemany):
+        executed.append(statement)
+
+    event.listen(engine, "before_cursor_execute", record)
+    yield executed
+    event.remove(engine, "before_cursor_execute", record)
+
+
+@pytest.fixture
+def make_app(session_factory):
+    """A bare app with the given routers mounted on the test database"""
+
+    def build(*routers) -> FastAPI:
+        app = FastAPI()
+        for router in routers:
+            app.include_router(router, prefix="/api")
+
+        def override_get_db():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+
+        app.dependency_overrides[get_db] = override_get_db
+        return app
+
+    return build
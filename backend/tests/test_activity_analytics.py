@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+from app.services.activity_analytics import (
+    ActivityArrays,
+    day_of_week_histogram,
+    gap_stats,
+    hour_of_day_histogram,
+    rolling_daily_activity,
+    streaks,
+)
+
+NOW = datetime(2026, 10, 17, 12, tzinfo=timezone.utc)  # a Saturday
+
+
+def activity(*ages):
+    """Watchlist additions made `age` (timedelta) before NOW, in any order"""
+    timestamps = sorted((NOW - age).timestamp() for age in ages)
+    return ActivityArrays(["watchlist", "favorites"], [0] * len(timestamps), timestamps)
+
+
+def test_gaps_are_whole_days():
+    # Gaps of 1.5 and 10.9 days count as 1 and 10, as timedelta.days did
+    stats = gap_stats(activity(timedelta(days=12.4), timedelta(days=10.9), timedelta(0)))
+    assert stats == {"mean_days": 5.5, "median_days": 5.5, "max_days": 10.0}
+
+
+def test_streaks():
+    days = [timedelta(days=d) for d in (0, 1, 2, 5, 6, 7, 8, 20)]
+    assert streaks(activity(*days), now=NOW) == {
+        "active_days": 8,
+        "longest_streak_days": 4,
+        "current_streak_days": 3,
+    }
+    # A run ending yesterday is still current; one ending earlier is not
+    assert streaks(activity(timedelta(days=1)), now=NOW)["current_streak_days"] == 1
+    assert streaks(activity(timedelta(days=2)), now=NOW)["current_streak_days"] == 0
+
+
+def test_histograms():
+    sample = activity(timedelta(0), timedelta(hours=1), timedelta(days=1))
+    hours = hour_of_day_histogram(sample)
+    assert hours[12] == 2 and hours[11] == 1 and sum(hours) == 3
+    # Saturday twice, Friday once (Monday first)
+    assert day_of_week_histogram(sample) == [0, 0, 0, 0, 1, 2, 0]
+
+
+def test_rolling_daily_activity():
+    sample = activity(timedelta(0), timedelta(days=3), timedelta(days=9))
+    assert rolling_daily_activity(sample, days=10, window=7, now=NOW) == [1, 1, 1, 1, 1, 1, 2, 1, 1, 2]
+
+
+def test_empty_activity():
+    empty = activity()
+    assert gap_stats(empty)["mean_days"] == 0.0
+    assert streaks(empty, now=NOW)["active_days"] == 0
+    assert hour_of_day_histogram(empty) == [0] * 24
+    assert rolling_daily_activity(empty, days=3, now=NOW) == [0, 0, 0]
@@ -0,0 +1,107 @@
+from typing import Dict, List, Tuple
+
+import pytest
+from fastapi.testclient import TestClient
+
+import app.routers.follows as follows_module
+from app.models.follow import Follow
+from app.models.user import User
+from app.routers.follows import router as follows_router
+from app.services.follow_counts import reconcile_follow_counts
+from app.services.invalidation import LocalInvalidationBackend
+from app.services.social_graph import SocialGraph
+from app.utils.security import create_access_token
+
+PATHS = ["followers", "following", "users"]
+
+
+@pytest.fixture
+def client(make_app):
+    return TestClient(make_app(follows_router))
+
+
+@pytest.fixture(params=[False, True], ids=["sql", "graph"])
+def graph(request, monkeypatch):
+    """is_following comes from an EXISTS subquery, or from a built social graph"""
+    graph = SocialGraph(backend=LocalInvalidationBackend())
+    monkeypatch.setattr(follows_module, "get_social_graph", lambda: graph)
+    return graph if request.param else None
+
+
+def seed(session_factory, size: int) -> Tuple[Dict[str, int], List[Tuple[int, int]]]:
+    """
+    A target followed by `size` users, a viewer following every other one
+    of them, and follows among them so every user has different counts.
+    Counters are set with reconcile_follow_counts, as the repair job does.
+    """
+    db = session_factory()
+    try:
+        users = [
+            User(display_name=f"user{size}-{i}", email=f"user{size}-{i}@example.com", hashed_password="x")
+            for i in range(size + 2)
+        ]
+        db.add_all(users)
+        db.flush()
+        target, viewer, others = users[0], users[1], users[2:]
+        edges = []
+        for i, user in enumerate(others):
+            edges.append((user.id, target.id))
+            if i % 2:
+                edges.append((viewer.id, user.id))
+            edges.extend((user.id, other.id) for other in others[i + 1:i + 1 + i % 3])
+        db.add_all(Follow(follower_id=a, following_id=b) for a, b in edges)
+        db.commit()
+        reconcile_follow_counts(db)
+        return {"target": target.id, "viewer": viewer.id}, edges
+    finally:
+        db.close()
+
+
+def expected_counts(edges):
+    followers, following = {}, {}
+    for follower_id, following_id in edges:
+        following[follower_id] = following.get(follower_id, 0) + 1
+        followers[following_id] = followers.get(following_id, 0) + 1
+    return followers, following
+
+
+@pytest.mark.parametrize("path", PATHS)
+def test_follow_listing_query_count_is_fixed(client, session_factory, statements, graph, path):
+    counts, all_edges = [], []
+    for size in (2, 25):
+        ids, edges = seed(session_factory, size)
+        all_edges.extend(edges)
+        if graph is not None:
+            db = session_factory()
+            graph.build(db)
+            db.close()
+        viewer = ids["viewer"]
+        # "following" is read from the viewer's side: they follow every other follower
+        url = {
+            "followers": f"/api/follows/followers/{ids['target']}",
+            "following": f"/api/follows/following/{viewer}",
+            "users": "/api/follows/users",
+        }[path]
+
+        statements.clear()
+        response = client.get(url, headers={"Authorization": f"Bearer {create_access_token(viewer)}"})
+        assert response.status_code == 200
+        counts.append(len(statements))
+
+        body = response.json()
+        listed = {info["id"] for info in body}
+        if path == "followers":
+            assert listed == {a for a, b in edges if b == ids["target"]}
+        elif path == "following":
+            assert listed == {b for a, b in edges if a == viewer}
+        else:
+            assert len(body) == len({uid for edge in all_edges for uid in edge})
+
+        followers, following = expected_counts(all_edges)
+        viewer_follows = {b for a, b in all_edges if a == viewer}
+        for info in body:
+            assert info["followers_count"] == followers.get(info["id"], 0), info
+            assert info["following_count"] == following.get(info["id"], 0), info
+            assert info["is_following"] == (info["id"] in viewer_follows), info
+
+    assert counts[0] == counts[1]
@@ -0,0 +1,29 @@
+import sys
+import types
+
+import pytest
+
+from app.services.invalidation import InvalidationBackend, LocalInvalidationBackend, load_invalidation_backend
+
+
+class PublishOnlyBackend(InvalidationBackend):
+    def publish(self, message: dict):
+        pass
+
+
+def test_incomplete_backend_fails_when_loaded(monkeypatch):
+    module = types.ModuleType("incomplete_backend")
+    module.PublishOnlyBackend = PublishOnlyBackend
+    monkeypatch.setitem(sys.modules, "incomplete_backend", module)
+    with pytest.raises(TypeError):
+        load_invalidation_backend("incomplete_backend:PublishOnlyBackend")
+
+
+def test_local_backend_delivers_to_every_subscriber():
+    backend = load_invalidation_backend("local")
+    assert isinstance(backend, LocalInvalidationBackend)
+    received = []
+    backend.subscribe(received.append)
+    backend.subscribe(received.append)
+    backend.publish({"op": "reset"})
+    assert received == [{"op": "reset"}, {"op": "reset"}]
@@ -0,0 +1,41 @@
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.review import Review
+from app.models.user import User
+from app.routers.reviews import router as reviews_router
+
+
+@pytest.fixture
+def client(make_app, session_factory):
+    db = session_factory()
+    try:
+        db.add(User(display_name="reviewer", email="reviewer@example.com", hashed_password="x"))
+        db.flush()
+        db.add(Review(user_id=1, movie_id=7, rating=8, comment="good"))
+        db.commit()
+    finally:
+        db.close()
+    return TestClient(make_app(reviews_router))
+
+
+PAGED = ["/api/reviews/user/1", "/api/reviews/recent", "/api/reviews/movie/7"]
+OUT_OF_RANGE = [
+    *[(path, query) for path in PAGED for query in ("limit=0", "limit=-1", "limit=101")],
+    # /recent has no offset
+    ("/api/reviews/user/1", "skip=-1"),
+    ("/api/reviews/movie/7", "skip=-1"),
+]
+
+
+@pytest.mark.parametrize("path,query", OUT_OF_RANGE)
+def test_out_of_range_paging_is_rejected(client, path, query):
+    # limit=0 used to reach split_page and fail reading the last row of an empty page
+    assert client.get(f"{path}?{query}").status_code == 422
+
+
+@pytest.mark.parametrize("path", PAGED)
+def test_smallest_page(client, path):
+    response = client.get(f"{path}?limit=1")
+    assert response.status_code == 200
+    assert [review["id"] for review in response.json()] == [1]
@@ -0,0 +1,57 @@
+from datetime import datetime, timedelta, timezone
+
+import pytest
+from fastapi.testclient import TestClient
+
+from app.models.list_item import ListItem
+from app.models.user import User
+from app.routers.user_insights import router as insights_router
+from app.utils.security import create_access_token
+
+
+@pytest.fixture
+def client(make_app):
+    return TestClient(make_app(insights_router))
+
+
+@pytest.fixture
+def user_id(session_factory):
+    """A user who added one movie a day, reaching back past any first bucket"""
+    db = session_factory()
+    try:
+        user = User(display_name="trends", email="trends@example.com", hashed_password="x")
+        db.add(user)
+        db.flush()
+        now = datetime.now(timezone.utc).replace(hour=12, minute=0, second=0, microsecond=0)
+        db.add_all([
+            ListItem(user_id=user.id, movie_id=i + 1, kind="watchlist", created_at=now - timedelta(days=i))
+            for i in range(70)
+        ])
+        db.commit()
+        return user.id
+    finally:
+        db.close()
+
+
+def get_summary(client, user_id, bucket):
+    headers = {"Authorization": f"Bearer {create_access_token(user_id)}"}
+    response = client.get(f"/api/user-insights/{user_id}/trends?days=14&bucket={bucket}", headers=headers)
+    assert response.status_code == 200
+    return response.json()["summary"]
+
+
+def test_daily_summary(client, user_id):
+    summary = get_summary(client, user_id, "day")
+    assert summary["average_daily_activity"] == 1
+    assert "most_active_day" in summary
+    assert "most_active_bucket" not in summary
+
+
+@pytest.mark.parametrize("bucket", ["week", "month"])
+def test_bucketed_summary_stays_per_day(client, user_id, bucket):
+    summary = get_summary(client, user_id, bucket)
+    # One addition a day, whatever the bucket size
+    assert summary["average_daily_activity"] == pytest.approx(1)
+    assert summary["average_per_bucket"] > 1
+    assert "most_active_bucket" in summary
+    assert "most_active_day" not in summary
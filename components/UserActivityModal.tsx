@@ -9,6 +9,21 @@ interface UserActivityModalProps {
   onClose: () => void;
 }
 
+type ActivitySection = "watchlist" | "favorites" | "followers" | "following";
+
+interface MovieActivityItem {
+  movie_id: number;
+  title: string;
+  added_at: string;
+}
+
+interface FollowActivityItem {
+  user_id: number;
+  display_name: string;
+  avatar?: string;
+  followed_at: string;
+}
+
 interface UserActivity {
   user: {
     id: number;
@@ -20,35 +35,18 @@ interface UserActivity {
     is_active: boolean;
   };
   movie_activity: {
-    watchlist: Array<{
-      movie_id: number;
-      title: string;
-      added_at: string;
-    }>;
-    favorites: Array<{
-      movie_id: number;
-      title: string;
-      added_at: string;
-    }>;
+    watchlist: MovieActivityItem[];
+    favorites: MovieActivityItem[];
     total_watchlist: number;
     total_favorites: number;
   };
   follow_activity: {
-    followers: Array<{
-      user_id: number;
-      display_name: string;
-      email: string;
-      followed_at: string;
-    }>;
-    following: Array<{
-      user_id: number;
-      display_name: string;
-      email: string;
-      followed_at: string;
-    }>;
+    followers: FollowActivityItem[];
+    following: FollowActivityItem[];
     total_followers: number;
     total_following: number;
   };
+  next_cursors: Partial<Record<ActivitySection, string>>;
   summary: {
     total_movies: number;
     total_connections: number;
@@ -75,14 +73,62 @@ const fetcher = async (url: string) => {
 export default function UserActivityModal({ userId, isOpen, onClose }: UserActivityModalProps) {
   const [activeTab, setActiveTab] = useState<"overview" | "movies" | "follows">("overview");
 
+  // Pages fetched with "load more", appended after each section's first page
+  const [moreItems, setMoreItems] = useState<Partial<Record<ActivitySection, Array<MovieActivityItem | FollowActivityItem>>>>({});
+  const [moreCursors, setMoreCursors] = useState<Partial<Record<ActivitySection, string | null>>>({});
+  const [loadingSection, setLoadingSection] = useState<ActivitySection | null>(null);
+
   const { data: activity, error, isLoading } = useSWR<UserActivity>(
     userId && isOpen ? `${API_BASE}/user-activity/${userId}` : null,
     fetcher,
     { revalidateOnFocus: false }
   );
 
+  useEffect(() => {
+    setMoreItems({});
+    setMoreCursors({});
+  }, [activity]);
+
   if (!isOpen) return null;
 
+  const nextCursor = (section: ActivitySection) =>
+    section in moreCursors ? moreCursors[section] : activity?.next_cursors?.[section];
+
+  const sectionItems = <T extends MovieActivityItem | FollowActivityItem>(section: ActivitySection, firstPage: T[]) =>
+    [...firstPage, ...((moreItems[section] ?? []) as T[])];
+
+  const loadMore = async (section: ActivitySection) => {
+    const cursor = nextCursor(section);
+    if (!userId || !cursor) return;
+    setLoadingSection(section);
+    try {
+      const page: UserActivity = await fetcher(
+        `${API_BASE}/user-activity/${userId}?include=${section}&cursor=${encodeURIComponent(cursor)}`
+      );
+      const items =
+        section === "watchlist" || section === "favorites"
+          ? page.movie_activity[section]
+          : page.follow_activity[section];
+      setMoreItems((prev) => ({ ...prev, [section]: [...(prev[section] ?? []), ...(items ?? [])] }));
+      setMoreCursors((prev) => ({ ...prev, [section]: page.next_cursors?.[section] ?? null }));
+    } catch (err) {
+      console.error("Failed to load more activity:", err);
+    } finally {
+      setLoadingSection(null);
+    }
+  };
+
+  const renderLoadMore = (section: ActivitySection) =>
+    nextCursor(section) ? (
+      <button
+        onClick={() => loadMore(section)}
+        disabled={loadingSection === section}
+        className="mt-3 px-4 py-2 text-sm font-medium text-indigo-600 hover:text-indigo-800 disabled:opacity-50"
+      >
+        {loadingSection === section ? "Loading..." : "Load more"}
+      </button>
+    ) : null;
+
   const formatDate = (dateString: string) => {
     return new Date(dateString).toLocaleDateString("en-US", {
       year: "numeric",
@@ -245,7 +291,7 @@ export default function UserActivityModal({ userId, isOpen, onClose }: UserActiv
                       <p className="text-gray-500 italic">No movies in watchlist</p>
                     ) : (
                       <div className="grid grid-cols-1 md:grid-cols-2 gap-3">
-                        {activity.movie_activity.watchlist.map((movie, index) => (
+                        {sectionItems("watchlist", activity.movie_activity.watchlist).map((movie, index) => (
                           <div key={index} className="bg-blue-50 rounded-lg p-3">
                             <h5 className="font-medium text-blue-900">{movie.title}</h5>
                             <p className="text-sm text-blue-700">Added: {formatDate(movie.added_at)}</p>
@@ -253,6 +299,7 @@ export default function UserActivityModal({ userId, isOpen, onClose }: UserActiv
                         ))}
                       </div>
                     )}
+                    {renderLoadMore("watchlist")}
                   </div>
 
                   {/* Favorites */}
@@ -264,7 +311,7 @@ export default function UserActivityModal({ userId, isOpen, onClose }: UserActiv
                       <p className="text-gray-500 italic">No favorite movies</p>
                     ) : (
                       <div className="grid grid-cols-1 md:grid-cols-2 gap-3">
-                        {activity.movie_activity.favorites.map((movie, index) => (
+                        {sectionItems("favorites", activity.movie_activity.favorites).map((movie, index) => (
                           <div key={index} className="bg-red-50 rounded-lg p-3">
                             <h5 className="font-medium text-red-900">{movie.title}</h5>
                             <p className="text-sm text-red-700">Added: {formatDate(movie.added_at)}</p>
@@ -272,6 +319,7 @@ export default function UserActivityModal({ userId, isOpen, onClose }: UserActiv
                         ))}
                       </div>
                     )}
+                    {renderLoadMore("favorites")}
                   </div>
                 </div>
               )}
@@ -288,15 +336,15 @@ export default function UserActivityModal({ userId, isOpen, onClose }: UserActiv
                       <p className="text-gray-500 italic">No followers</p>
                     ) : (
                       <div className="grid grid-cols-1 md:grid-cols-2 gap-3">
-                        {activity.follow_activity.followers.map((follower, index) => (
+                        {sectionItems("followers", activity.follow_activity.followers).map((follower, index) => (
                           <div key={index} className="bg-green-50 rounded-lg p-3">
                             <h5 className="font-medium text-green-900">{follower.display_name}</h5>
-                            <p className="text-sm text-green-700">{follower.email}</p>
                             <p className="text-xs text-green-600">Followed: {formatDate(follower.followed_at)}</p>
                           </div>
                         ))}
                       </div>
                     )}
+                    {renderLoadMore("followers")}
                   </div>
 
                   {/* Following */}
@@ -308,15 +356,15 @@ export default function UserActivityModal({ userId, isOpen, onClose }: UserActiv
                       <p className="text-gray-500 italic">Not following anyone</p>
                     ) : (
                       <div className="grid grid-cols-1 md:grid-cols-2 gap-3">
-                        {activity.follow_activity.following.map((following, index) => (
+                        {sectionItems("following", activity.follow_activity.following).map((following, index) => (
                           <div key={index} className="bg-purple-50 rounded-lg p-3">
                             <h5 className="font-medium text-purple-900">{following.display_name}</h5>
-                            <p className="text-sm text-purple-700">{following.email}</p>
                             <p className="text-xs text-purple-600">Followed: {formatDate(following.followed_at)}</p>
                           </div>
                         ))}
                       </div>
                     )}
+                    {renderLoadMore("following")}
                   </div>
                 </div>
               )}